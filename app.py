@@ -1,149 +1,600 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from pydantic import BaseModel
+import numpy as np
 import pandas as pd
+from scipy import sparse
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import itertools
 import pickle
+import json
 import os
-from typing import List
-import logging
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
 from datetime import datetime
 
+# Settings, logging, per-request profiling and the similarity store format are shared with the API package
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.core.profiling import run_profiled, select_profile_id
+from app.services.item_similarity import load_similarity_store
+
 # Initialize FastAPI app
 app = FastAPI(title="Travel Recommendation API")
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filename=f'api_logs_{datetime.now().strftime("%Y%m%d")}.log'
-)
+# Setup logging (queued writes to settings.LOG_DIR, one file per worker process)
+logger = setup_logging()
+
+
+def default_similarities_path() -> str:
+    """
+    Item similarities served by default: the top-k store written by
+    scripts/build_item_similarities.py (settings.SIMILARITY_STORE_DIR) once it
+    has been built, otherwise the settings.SIMILARITIES_PATH pickle
+    """
+    if os.path.isfile(os.path.join(settings.SIMILARITY_STORE_DIR, 'manifest.json')):
+        return settings.SIMILARITY_STORE_DIR
+    return settings.SIMILARITIES_PATH
+
+
+# Data files loaded at startup and by `python app.py precompute` (override with the
+# MODEL_PATH / PREPROCESSED_PATH / SIMILARITY_STORE_DIR / SIMILARITIES_PATH /
+# RECOMMENDATION_STORE_PATH settings or the precompute options)
+MODEL_PATH = settings.MODEL_PATH
+DATA_PATH = settings.PREPROCESSED_PATH
+SIMILARITIES_PATH = default_similarities_path()
+RECOMMENDATION_STORE_PATH = settings.RECOMMENDATION_STORE_PATH
 
 
 class RecommendationResponse(BaseModel):
     user_id: str
     recommendations: List[dict]
     timestamp: str
+    source: str = "live"
+    data_version: Optional[str] = None
+    computed_at: Optional[str] = None
 
 
 class ModelService:
+    # Number of top-rated candidates considered by diversity reranking
+    DIVERSITY_POOL_SIZE = 300
+    # MMR trade-off between predicted rating and diversity
+    RELEVANCE_WEIGHT = 0.7
+    # Store item similarities densely (float32) up to this many items, CSR above
+    DENSE_SIMILARITY_MAX_ITEMS = 2000
+
     def __init__(self):
         self.model = None
+        self.factors = None
         self.df_original = None
         self.item_similarities = None
+        self.similarity_arrays = None
+        # (size, SHA-1) of the loaded model/data/similarity files, see data_version
+        self.source_fingerprints = {}
+
+        # Lookup tables built in load_data
+        self.user_index = {}
+        self.item_ids = None
+        self.sido_names = None
+        self.user_offsets = None
+        self.user_item_codes = None
+        self.user_sido_distribution = None
+        self.item_sido_codes = None
+        self.item_inner_ids = None
+        self.similarity_matrix = None
 
     def load_model(self, model_path: str):
         """Load the trained model"""
         try:
             with open(model_path, 'rb') as f:
                 self.model = pickle.load(f)
-            logging.info("Model loaded successfully")
+            self.source_fingerprints['model'] = self._fingerprint(model_path)
+            self.factors = self._unpack_factors(self.model)
+            if self.factors is None:
+                logger.info("Model has no latent factors, using per-item predict")
+            self._align_item_inner_ids()
+            logger.info("Model loaded successfully")
         except Exception as e:
-            logging.error(f"Error loading model: {str(e)}")
+            logger.error(f"Error loading model: {str(e)}")
             raise
 
     def load_data(self, data_path: str):
         """Load the original dataset"""
         try:
             self.df_original = pd.read_csv(data_path)
-            logging.info("Data loaded successfully")
+            self.source_fingerprints['data'] = self._fingerprint(data_path)
+            self._build_lookup_tables()
+            self._align_item_inner_ids()
+            self._build_similarity_matrix()
+            logger.info("Data loaded successfully")
         except Exception as e:
-            logging.error(f"Error loading data: {str(e)}")
+            logger.error(f"Error loading data: {str(e)}")
             raise
 
     def load_similarities(self, similarities_path: str):
-        """Load pre-computed item similarities"""
+        """
+        Load pre-computed item similarities, either a pickled dict-of-dicts or a
+        directory written by scripts/build_item_similarities.py (top-k CSR arrays, mmap'd)
+        """
         try:
-            with open(similarities_path, 'rb') as f:
-                self.item_similarities = pickle.load(f)
-            logging.info("Similarities loaded successfully")
+            if os.path.isdir(similarities_path):
+                self.similarity_arrays = load_similarity_store(similarities_path)
+                self.item_similarities = None
+            else:
+                with open(similarities_path, 'rb') as f:
+                    self.item_similarities = pickle.load(f)
+                self.similarity_arrays = None
+            self.source_fingerprints['similarities'] = self._fingerprint(similarities_path)
+            self._build_similarity_matrix()
+            logger.info("Similarities loaded successfully")
         except Exception as e:
-            logging.error(f"Error loading similarities: {str(e)}")
+            logger.error(f"Error loading similarities: {str(e)}")
             raise
 
+    @staticmethod
+    def _fingerprint(path: str) -> list:
+        """
+        Size and SHA-1 of a file's contents (of the array files for similarity directories).
+        Content-based, so copying or redeploying unchanged files keeps the same data version
+        """
+        paths = [path]
+        if os.path.isdir(path):
+            with open(os.path.join(path, 'manifest.json'), 'r', encoding='utf-8') as f:
+                paths = [os.path.join(path, f'{name}.npy') for name in sorted(json.load(f)['arrays'])]
+
+        digest = hashlib.sha1()
+        size = 0
+        for file_path in paths:
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+                    size += len(block)
+        return [size, digest.hexdigest()]
+
+    @property
+    def data_version(self) -> str:
+        """Stamp of the loaded model/data/similarity file contents; changes whenever any of them changes"""
+        payload = json.dumps(self.source_fingerprints, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+    def _build_lookup_tables(self):
+        """
+        Build per-user history and item metadata tables once, so requests do
+        hash lookups and array masks instead of scanning df_original:
+        - user_index: userID -> user code
+        - user_offsets / user_item_codes: visited item codes per user (CSR)
+        - user_sido_distribution: normalized SIDO histogram per user
+        - item_sido_codes: SIDO of each item (first occurrence)
+        """
+        df = self.df_original
+        user_codes, user_ids = pd.factorize(df['userID'])
+        item_codes, self.item_ids = pd.factorize(df['itemID'])
+        sido_codes, self.sido_names = pd.factorize(df['SIDO'])
+        n_users = len(user_ids)
+
+        self.user_index = {user_id: code for code, user_id in enumerate(user_ids)}
+
+        order = np.argsort(user_codes, kind='stable')
+        self.user_offsets = np.zeros(n_users + 1, dtype=np.int64)
+        np.cumsum(np.bincount(user_codes, minlength=n_users), out=self.user_offsets[1:])
+        self.user_item_codes = item_codes[order]
+
+        has_sido = sido_codes >= 0
+        sido_counts = np.zeros((n_users, len(self.sido_names)))
+        np.add.at(sido_counts, (user_codes[has_sido], sido_codes[has_sido]), 1)
+        totals = sido_counts.sum(axis=1, keepdims=True)
+        self.user_sido_distribution = np.divide(
+            sido_counts, totals, out=np.zeros_like(sido_counts), where=totals > 0
+        )
+
+        _, first_rows = np.unique(item_codes, return_index=True)
+        self.item_sido_codes = sido_codes[first_rows]
+
+    def _align_item_inner_ids(self):
+        """Map item codes to the model's inner item ids (-1 if unknown to the model)"""
+        if self.factors is None or self.item_ids is None:
+            self.item_inner_ids = None
+            return
+        inner_ids = self.factors['item_inner_ids']
+        self.item_inner_ids = np.array([inner_ids.get(item, -1) for item in self.item_ids], dtype=np.int64)
+
+    def _similarity_triples(self) -> tuple:
+        """(item code, neighbour code, |sim|) arrays for every known non-zero similarity"""
+        item_codes = {item: code for code, item in enumerate(self.item_ids)}
+
+        if self.similarity_arrays is not None:
+            arrays = self.similarity_arrays
+            code_map = np.array([item_codes.get(str(item), -1) for item in arrays['item_ids']], dtype=np.int64)
+            items = np.repeat(code_map, np.diff(arrays['indptr']))
+            neighbours = code_map[arrays['indices']]
+            values = np.abs(np.asarray(arrays['data'], dtype=np.float32))
+            valid = (items >= 0) & (neighbours >= 0) & (values != 0)
+            return items[valid], neighbours[valid], values[valid]
+
+        items, neighbours, values = [], [], []
+        for item, item_neighbours in self.item_similarities.items():
+            item_code = item_codes.get(item)
+            if item_code is None:
+                continue
+            for neighbour, sim in item_neighbours.items():
+                neighbour_code = item_codes.get(neighbour)
+                if neighbour_code is not None and sim != 0:
+                    items.append(item_code)
+                    neighbours.append(neighbour_code)
+                    values.append(abs(sim))
+        return (
+            np.array(items, dtype=np.int64),
+            np.array(neighbours, dtype=np.int64),
+            np.array(values, dtype=np.float32)
+        )
+
+    def _build_similarity_matrix(self):
+        """
+        Convert the loaded item similarities into a matrix indexed by item code.
+        Row j holds |sim(i, j)| for every item i, so picking item j during
+        reranking needs a single row slice. Dense float32 for small catalogues, CSR otherwise.
+        """
+        if self.item_ids is None or (self.item_similarities is None and self.similarity_arrays is None):
+            self.similarity_matrix = None
+            return
+
+        items, neighbours, values = self._similarity_triples()
+        n_items = len(self.item_ids)
+        matrix = sparse.csr_matrix((values, (neighbours, items)), shape=(n_items, n_items))
+        if n_items <= self.DENSE_SIMILARITY_MAX_ITEMS:
+            matrix = matrix.toarray()
+        self.similarity_matrix = matrix
+
+    def _similarity_row(self, item_code: int, pool_positions: np.ndarray, pool_size: int) -> np.ndarray:
+        """|sim(candidate, item)| for every candidate in the pool"""
+        if isinstance(self.similarity_matrix, np.ndarray):
+            row = self.similarity_matrix[item_code]
+            values = np.zeros(pool_size)
+            in_pool = pool_positions >= 0
+            values[pool_positions[in_pool]] = row[in_pool]
+            return values
+
+        start, end = self.similarity_matrix.indptr[item_code:item_code + 2]
+        neighbours = self.similarity_matrix.indices[start:end]
+        positions = pool_positions[neighbours]
+        in_pool = positions >= 0
+        values = np.zeros(pool_size)
+        values[positions[in_pool]] = self.similarity_matrix.data[start:end][in_pool]
+        return values
+
+    def rerank_with_diversity(
+            self,
+            item_codes: np.ndarray,
+            scores: np.ndarray,
+            n_recommendations: int
+    ) -> List[tuple]:
+        """
+        Maximal marginal relevance selection over the top-rated candidates.
+        Each step picks the candidate maximizing
+            RELEVANCE_WEIGHT * score + (1 - RELEVANCE_WEIGHT) * diversity,
+        where diversity = 1 - mean |sim| to the items picked so far. The per-candidate
+        similarity sum is updated with one similarity row per pick.
+        Returns (item_code, score, diversity_score) in pick order.
+        """
+        # Top candidates by score (ties keep the lower item code)
+        pool_size = min(self.DIVERSITY_POOL_SIZE, len(item_codes))
+        if pool_size == 0 or n_recommendations <= 0:
+            return []
+        if pool_size < len(item_codes):
+            pool = np.argpartition(-scores, pool_size - 1)[:pool_size]
+        else:
+            pool = np.arange(len(item_codes))
+        pool = pool[np.lexsort((item_codes[pool], -scores[pool]))]
+        pool_items = item_codes[pool]
+        pool_scores = scores[pool]
+
+        # Item code -> position in the pool
+        pool_positions = np.full(len(self.item_ids), -1, dtype=np.int64)
+        pool_positions[pool_items] = np.arange(pool_size)
+
+        similarity_sums = np.zeros(pool_size)
+        available = np.ones(pool_size, dtype=bool)
+        selected = []
+        for step in range(min(n_recommendations, pool_size)):
+            diversity = 1 - similarity_sums / step if step else np.ones(pool_size)
+            objective = self.RELEVANCE_WEIGHT * pool_scores + (1 - self.RELEVANCE_WEIGHT) * diversity
+            objective[~available] = -np.inf
+            best = int(np.argmax(objective))
+
+            available[best] = False
+            selected.append((int(pool_items[best]), float(pool_scores[best]), float(diversity[best])))
+            if self.similarity_matrix is not None:
+                similarity_sums += self._similarity_row(pool_items[best], pool_positions, pool_size)
+
+        return selected
+
+    @staticmethod
+    def _unpack_factors(model) -> Optional[dict]:
+        """
+        Unpack matrix-factorization parameters (Surprise SVD/NMF) into NumPy arrays.
+        Returns None for models whose estimate is not bias + dot product (e.g. SVD++, KNN).
+        """
+        required = ('pu', 'qi', 'bu', 'bi', 'trainset')
+        if not all(hasattr(model, attr) for attr in required) or hasattr(model, 'yj'):
+            return None
+
+        trainset = model.trainset
+        return {
+            'pu': np.asarray(model.pu, dtype=np.float64),
+            'qi': np.asarray(model.qi, dtype=np.float64),
+            'bu': np.asarray(model.bu, dtype=np.float64),
+            'bi': np.asarray(model.bi, dtype=np.float64),
+            'global_mean': float(trainset.global_mean),
+            'biased': bool(getattr(model, 'biased', True)),
+            'rating_scale': trainset.rating_scale,
+            'user_inner_ids': dict(trainset._raw2inner_id_users),
+            'item_inner_ids': dict(trainset._raw2inner_id_items)
+        }
+
+    def predict_items(self, user_id: str, items: List[str]) -> np.ndarray:
+        """
+        Predict ratings of many items for one user.
+        Matches self.model.predict(user_id, item).est (up to floating-point rounding
+        of the dot product), including the fallbacks for unknown users/items and
+        clipping to the rating scale.
+        """
+        if self.factors is None:
+            return np.array([self.model.predict(user_id, item).est for item in items], dtype=np.float64)
+
+        item_inner_ids = self.factors['item_inner_ids']
+        inner_items = np.array([item_inner_ids.get(item, -1) for item in items], dtype=np.int64)
+        return self._estimate(user_id, inner_items)
+
+    def predict_item_codes(self, user_id: str, item_codes: np.ndarray) -> np.ndarray:
+        """predict_items for item codes from the lookup tables"""
+        if self.factors is None:
+            return self.predict_items(user_id, self.item_ids[item_codes])
+        return self._estimate(user_id, self.item_inner_ids[item_codes])
+
+    def _estimate(self, user_id: str, inner_items: np.ndarray) -> np.ndarray:
+        """Bias + latent factor estimates for model inner item ids (-1 = unknown item)"""
+        factors = self.factors
+        global_mean = factors['global_mean']
+        inner_user = factors['user_inner_ids'].get(user_id)
+        known_items = inner_items >= 0
+        safe_items = np.where(known_items, inner_items, 0)
+
+        if factors['biased']:
+            estimates = np.full(len(inner_items), global_mean)
+            if inner_user is not None:
+                estimates = estimates + factors['bu'][inner_user]
+            estimates = np.where(known_items, estimates + factors['bi'][safe_items], estimates)
+            if inner_user is not None:
+                dots = factors['qi'][safe_items] @ factors['pu'][inner_user]
+                estimates = np.where(known_items, estimates + dots, estimates)
+        elif inner_user is not None:
+            dots = factors['qi'][safe_items] @ factors['pu'][inner_user]
+            # Unknown items fall back to the default prediction (global mean)
+            estimates = np.where(known_items, dots, global_mean)
+        else:
+            estimates = np.full(len(inner_items), global_mean)
+
+        lower_bound, higher_bound = factors['rating_scale']
+        return np.maximum(lower_bound, np.minimum(higher_bound, estimates))
+
     def get_recommendations(self, user_id: str, n_recommendations: int = 5) -> List[dict]:
         """Generate recommendations for a user"""
         try:
             # Check if user exists in the dataset
-            if user_id not in self.df_original['userID'].unique():
+            user_code = self.user_index.get(user_id)
+            if user_code is None:
                 raise HTTPException(status_code=404, detail=f"User {user_id} not found")
 
             # Get user's visited places
-            visited_items = set(
-                self.df_original[self.df_original['userID'] == user_id]['itemID']
-            )
+            visited_items = self.user_item_codes[
+                self.user_offsets[user_code]:self.user_offsets[user_code + 1]
+            ]
 
             # Get user's SIDO distribution
-            user_sidos = (
-                self.df_original[self.df_original['userID'] == user_id]['SIDO']
-                .value_counts(normalize=True)
-                .to_dict()
-            )
-
-            # Get all items
-            all_items = set(self.df_original['itemID'].unique())
+            user_sidos = self.user_sido_distribution[user_code]
 
             # Get candidate items (not visited by user)
-            candidate_items = list(all_items - visited_items)
+            candidate_mask = np.ones(len(self.item_ids), dtype=bool)
+            candidate_mask[visited_items] = False
+            candidate_items = np.flatnonzero(candidate_mask)
 
             # Generate predictions for candidate items
-            predictions = []
-            for item in candidate_items:
-                pred = self.model.predict(user_id, item)
-                predictions.append((item, pred.est))
+            estimates = self.predict_item_codes(user_id, candidate_items)
 
-            # Sort by predicted rating
-            predictions.sort(key=lambda x: x[1], reverse=True)
-
-            # Get top N recommendations considering diversity
+            # Select top N recommendations considering diversity (MMR)
             recommendations = []
-            selected_items = []
-
-            for item, score in predictions:
-                if len(selected_items) >= n_recommendations:
-                    break
-
-                # Calculate diversity score
-                diversity_score = 1.0
-                if selected_items:
-                    sim_scores = []
-                    for selected_item in selected_items:
-                        sim = self.item_similarities.get(item, {}).get(selected_item, 0)
-                        sim_scores.append(abs(sim))
-                    diversity_score = 1 - (sum(sim_scores) / len(sim_scores))
-
-                # Get item SIDO
-                item_sido = self.df_original[
-                    self.df_original['itemID'] == item
-                    ]['SIDO'].iloc[0]
-
-                # Get SIDO score
-                sido_score = user_sidos.get(item_sido, 0.1)
+            for item_code, score, diversity_score in self.rerank_with_diversity(
+                    candidate_items, estimates, n_recommendations
+            ):
+                # Get item SIDO and SIDO score (items without SIDO get NaN and the default score)
+                sido_code = self.item_sido_codes[item_code]
+                if sido_code < 0:
+                    item_sido = np.nan
+                    sido_score = 0.1
+                else:
+                    item_sido = self.sido_names[sido_code]
+                    sido_score = user_sidos[sido_code] if user_sidos[sido_code] > 0 else 0.1
 
                 # Calculate final score
                 final_score = score * 0.7 + diversity_score * 0.3
                 final_score *= sido_score
 
-                if len(recommendations) < n_recommendations:
-                    recommendations.append({
-                        'item_id': item,
-                        'sido': item_sido,
-                        'predicted_rating': float(score),
-                        'diversity_score': float(diversity_score),
-                        'confidence_score': float(final_score)
-                    })
-                    selected_items.append(item)
+                recommendations.append({
+                    'item_id': self.item_ids[item_code],
+                    'sido': item_sido,
+                    'predicted_rating': float(score),
+                    'diversity_score': float(diversity_score),
+                    'confidence_score': float(final_score)
+                })
 
             return recommendations
 
+        except HTTPException:
+            raise
         except Exception as e:
-            logging.error(f"Error generating recommendations: {str(e)}")
+            logger.error(f"Error generating recommendations: {str(e)}")
             raise HTTPException(
                 status_code=500,
                 detail=f"Error generating recommendations: {str(e)}"
             )
 
 
+class RecommendationStore:
+    """
+    SQLite key-value store of precomputed recommendations (userID -> ranked list as JSON).
+    The store records the ModelService.data_version it was computed from and the
+    number of recommendations per user; reads for another version or a larger n miss.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.metadata = {}
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def open(self) -> bool:
+        """Open the store read-only; False if it does not exist"""
+        if not os.path.exists(self.path):
+            return False
+        self.close()
+        connection = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, check_same_thread=False)
+        self.metadata = dict(connection.execute('SELECT key, value FROM metadata'))
+        self._connection = connection
+        return True
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @property
+    def data_version(self) -> Optional[str]:
+        return self.metadata.get('data_version')
+
+    @property
+    def computed_at(self) -> Optional[str]:
+        return self.metadata.get('computed_at')
+
+    def get(self, user_id: str, n_recommendations: int, data_version: str) -> Optional[List[dict]]:
+        """Top n_recommendations for a user, or None if missing, stale or too short"""
+        if self._connection is None or self.data_version != data_version:
+            return None
+        if n_recommendations > int(self.metadata.get('n_recommendations', 0)):
+            return None
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT recommendations FROM recommendations WHERE user_id = ?', (user_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])[:n_recommendations]
+
+    @staticmethod
+    def write(path: str, rows: Iterable[Tuple[str, str]], metadata: dict, batch_size: int = 1000) -> int:
+        """
+        Write (user_id, recommendations JSON) rows to a new store and atomically
+        replace the file at path. Returns the number of rows written.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f'{path}.tmp-{os.getpid()}'
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        connection = sqlite3.connect(temp_path)
+        try:
+            connection.execute('CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT)')
+            connection.execute('CREATE TABLE recommendations (user_id TEXT PRIMARY KEY, recommendations TEXT)')
+            count = 0
+            rows = iter(rows)
+            while True:
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch:
+                    break
+                connection.executemany('INSERT INTO recommendations VALUES (?, ?)', batch)
+                count += len(batch)
+            connection.executemany(
+                'INSERT INTO metadata VALUES (?, ?)',
+                [(key, str(value)) for key, value in metadata.items()]
+            )
+            connection.commit()
+        finally:
+            connection.close()
+
+        os.replace(temp_path, path)
+        return count
+
+
+# Worker-process service used by precompute_recommendations
+_precompute_service = None
+
+
+def _load_service(model_path: str, data_path: str, similarities_path: str) -> ModelService:
+    """Load the same files as startup_event; similarities are required there too"""
+    service = ModelService()
+    service.load_model(model_path)
+    service.load_data(data_path)
+    service.load_similarities(similarities_path)
+    return service
+
+
+def _init_precompute_worker(model_path: str, data_path: str, similarities_path: str):
+    """Load the model and data once per worker process"""
+    global _precompute_service
+    _precompute_service = _load_service(model_path, data_path, similarities_path)
+
+
+def _precompute_chunk(user_ids: List[str], n_recommendations: int) -> List[Tuple[str, str]]:
+    """(user_id, recommendations JSON) for a chunk of users"""
+    return [
+        (user_id, json.dumps(_precompute_service.get_recommendations(user_id, n_recommendations), ensure_ascii=False))
+        for user_id in user_ids
+    ]
+
+
+def precompute_recommendations(
+        store_path: str = RECOMMENDATION_STORE_PATH,
+        model_path: str = MODEL_PATH,
+        data_path: str = DATA_PATH,
+        similarities_path: str = SIMILARITIES_PATH,
+        n_recommendations: int = 20,
+        workers: Optional[int] = None,
+        chunk_size: int = 128
+) -> dict:
+    """
+    Score every userID in the data with the ModelService pipeline across a
+    process pool and write the ranked results to a RecommendationStore.
+    Since diversity reranking is greedy, the first k of the stored n
+    recommendations equal a live request for k, so one run serves any k <= n.
+    """
+    start = time.perf_counter()
+    service = _load_service(model_path, data_path, similarities_path)
+    user_ids = list(service.user_index)
+    chunks = [user_ids[i:i + chunk_size] for i in range(0, len(user_ids), chunk_size)]
+    metadata = {
+        'data_version': service.data_version,
+        'n_recommendations': n_recommendations,
+        'computed_at': datetime.now().isoformat()
+    }
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_precompute_worker,
+            initargs=(model_path, data_path, similarities_path)
+    ) as pool:
+        results = pool.map(_precompute_chunk, chunks, itertools.repeat(n_recommendations))
+        count = RecommendationStore.write(store_path, itertools.chain.from_iterable(results), metadata)
+
+    stats = {**metadata, 'users': count, 'workers': workers, 'seconds': time.perf_counter() - start}
+    logger.info(f"Precomputed recommendations: {stats}")
+    return stats
+
+
 # Initialize model service
 model_service = ModelService()
+recommendation_store = RecommendationStore(RECOMMENDATION_STORE_PATH)
 
 
 @app.on_event("startup")
@@ -151,17 +602,27 @@ async def startup_event():
     """Load model and data on startup"""
     try:
         # Load best model
-        model_service.load_model('./experiments/best_model/model.pkl')
+        model_service.load_model(MODEL_PATH)
 
         # Load original data
-        model_service.load_data('./preprocessed/dfE.csv')
+        model_service.load_data(DATA_PATH)
 
         # Load pre-computed similarities
-        model_service.load_similarities('./data/item_similarities.pkl')
-
-        logging.info("Startup completed successfully")
+        model_service.load_similarities(SIMILARITIES_PATH)
+
+        # Open precomputed recommendations (used only if computed from the same files)
+        if recommendation_store.open():
+            if recommendation_store.data_version != model_service.data_version:
+                logger.warning(
+                    f"Precomputed recommendations are stale (store {recommendation_store.data_version}, "
+                    f"loaded {model_service.data_version}); serving live scores"
+                )
+        else:
+            logger.info("No precomputed recommendations found; serving live scores")
+
+        logger.info("Startup completed successfully")
     except Exception as e:
-        logging.error(f"Startup error: {str(e)}")
+        logger.error(f"Startup error: {str(e)}")
         raise
 
 
@@ -172,24 +633,38 @@ async def root():
 
 
 @app.get("/recommend/{user_id}", response_model=RecommendationResponse)
-async def get_recommendations(user_id: str, n_recommendations: int = 5):
+async def get_recommendations(user_id: str, request: Request, response: Response, n_recommendations: int = 5):
     """Get recommendations for a user"""
+    profile_id = select_profile_id(request.headers)
     try:
-        recommendations = model_service.get_recommendations(
-            user_id,
-            n_recommendations
-        )
+        data_version = model_service.data_version
+        recommendations = recommendation_store.get(user_id, n_recommendations, data_version)
+        if recommendations is not None:
+            source, computed_at = "precomputed", recommendation_store.computed_at
+        else:
+            recommendations = run_profiled(
+                profile_id,
+                model_service.get_recommendations,
+                user_id,
+                n_recommendations
+            )
+            source, computed_at = "live", None
+            if profile_id is not None:
+                response.headers['X-Profile-Id'] = profile_id
 
         return {
             "user_id": user_id,
             "recommendations": recommendations,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            "source": source,
+            "data_version": data_version,
+            "computed_at": computed_at
         }
 
     except HTTPException as e:
         raise e
     except Exception as e:
-        logging.error(f"Error in recommendation endpoint: {str(e)}")
+        logger.error(f"Error in recommendation endpoint: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail="Internal server error"
@@ -203,11 +678,43 @@ async def health_check():
         "status": "healthy",
         "model_loaded": model_service.model is not None,
         "data_loaded": model_service.df_original is not None,
-        "similarities_loaded": model_service.item_similarities is not None
+        "similarities_loaded": (
+            model_service.item_similarities is not None or model_service.similarity_arrays is not None
+        ),
+        "precomputed_fresh": (
+            recommendation_store.data_version is not None
+            and recommendation_store.data_version == model_service.data_version
+        )
     }
 
 
 if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:2] == ["precompute"]:
+        import argparse
+
+        # python app.py precompute [n_recommendations] [workers] [--model ...] [--data ...] [--similarities ...]
+        parser = argparse.ArgumentParser(prog='app.py precompute', description='Precompute recommendations for every user')
+        parser.add_argument('n_recommendations', nargs='?', type=int, default=20)
+        parser.add_argument('workers', nargs='?', type=int, default=None)
+        parser.add_argument('--model', default=MODEL_PATH, help='model pickle (default: %(default)s)')
+        parser.add_argument('--data', default=DATA_PATH, help='preprocessed visit CSV (default: %(default)s)')
+        parser.add_argument('--similarities', default=SIMILARITIES_PATH,
+                            help='similarity pickle or store directory (default: %(default)s)')
+        parser.add_argument('--store', default=RECOMMENDATION_STORE_PATH, help='output store (default: %(default)s)')
+        args = parser.parse_args(sys.argv[2:])
+        # The server only serves the store when it loads the same files (data_version must match)
+        print(json.dumps(precompute_recommendations(
+            store_path=args.store,
+            model_path=args.model,
+            data_path=args.data,
+            similarities_path=args.similarities,
+            n_recommendations=args.n_recommendations,
+            workers=args.workers
+        ), indent=2))
+        sys.exit(0)
+
     import uvicorn
 
     uvicorn.run(
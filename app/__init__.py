@@ -1,5 +1,8 @@
 from .core.config import settings
+from .core.logging import setup_logging
+from .api import router
+from .services import RecommendationService, recommendation_executor, data_reloader, service_warmup
 
 __version__ = '1.0.0'
 
-__all__ = ['settings']
\ No newline at end of file
+__all__ = ['settings', 'setup_logging', 'router', 'RecommendationService', 'recommendation_executor', 'data_reloader', 'service_warmup']
\ No newline at end of file
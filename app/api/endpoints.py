@@ -1,25 +1,204 @@
-from fastapi import APIRouter, HTTPException
-from ..models.schemas import TravelRequest, RecommendationResponse
-from ..services.recommender import RecommendationService
+from fastapi import APIRouter, HTTPException, Request, Response
+from typing import Callable, Dict, List, Optional
+from ..models.schemas import TravelRequest, RecommendationResponse, IngestRequest
+from ..services.executor import recommendation_executor, ExecutorSaturatedError
+from ..services.reloader import data_reloader
+from ..services.warmup import service_warmup
+from ..core.config import settings
+from ..core import metrics
+from ..core.profiling import select_profile_id
+from .responses import encode_recommendations, make_response
+import hmac
 import logging
+import time
 from datetime import datetime
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+LOCAL_HOSTS = frozenset({"127.0.0.1", "::1", "localhost"})
 
-@router.post("/recommend")
-async def get_recommendations(request: TravelRequest):
+
+def _require_admin(http_request: Request):
+    """
+    관리자 API 접근 확인 (서버의 파일 경로를 받아 데이터를 바꾸므로)
+    ADMIN_TOKEN이 설정되어 있으면 X-Admin-Token 헤더가 일치해야 하고, 없으면 로컬 요청만 허용
+    (리버스 프록시 뒤에서는 모든 요청이 프록시 주소로 보이므로 ADMIN_TOKEN을 설정할 것)
+    """
+    if settings.ADMIN_TOKEN:
+        token = http_request.headers.get(ADMIN_TOKEN_HEADER, "")
+        if not hmac.compare_digest(token.encode(), settings.ADMIN_TOKEN.encode()):
+            raise HTTPException(status_code=403, detail="Invalid admin token")
+        return
+    host = http_request.client.host if http_request.client else None
+    if host not in LOCAL_HOSTS:
+        raise HTTPException(status_code=403, detail="Admin API is only available from localhost")
+
+
+def _require_ready():
+    """데이터 로드 전이면 바로 503 (Retry-After)"""
+    if not service_warmup.ready:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Recommendation service is warming up ({service_warmup.status})",
+            headers={"Retry-After": str(settings.WARMUP_RETRY_AFTER_SECONDS)}
+        )
+
+
+def _encode_result(result: Dict, timestamp: str) -> Dict:
+    """서비스 결과 -> 응답 형식 (유사도 점수 튜플을 객체로 변환, 타임스탬프 추가)"""
+    return {
+        **result,
+        "recommendations": encode_recommendations(result["recommendations"]),
+        "timestamp": timestamp
+    }
+
+
+def _serialize(
+        destinations: List[str],
+        build_content: Callable[[], Dict],
+        http_request: Request,
+        profile_id: Optional[str] = None
+) -> Response:
+    """
+    응답 내용 생성 및 직렬화 (orjson JSON, Accept가 application/x-msgpack이면 msgpack)
+    직렬화 시간을 목적지별로 기록하고, 프로파일링한 요청은 X-Profile-Id 헤더로 요청 ID 반환
+    """
+    start_time = time.perf_counter()
+    response = make_response(build_content(), http_request.headers.get('accept'))
+    if profile_id is not None:
+        response.headers['X-Profile-Id'] = profile_id
+    metrics.observe_stage('serialization', destinations, time.perf_counter() - start_time)
+    return response
+
+
+def _log_served(endpoint: str, destination: Optional[str], count: int, seconds: float, stage_timings: dict):
+    """요청 처리 로그 (JSON 로그에서는 단계별 시간을 필드로 기록, process 모드는 워커 단계 시간 제외)"""
+    stages_ms = {stage: round(value * 1000, 3) for stage, value in stage_timings.items()}
+    logger.info(
+        f"Served {endpoint} in {seconds * 1000:.1f} ms "
+        f"(requests={count}, destination={destination}, stages_ms={stages_ms})",
+        extra={
+            'endpoint': endpoint,
+            'destination': destination,
+            'requests': count,
+            'duration_ms': round(seconds * 1000, 3),
+            'stages_ms': stages_ms
+        }
+    )
+
+
+@router.post("/recommend", response_model=RecommendationResponse)
+async def get_recommendations(request: TravelRequest, http_request: Request):
     """추천 생성 엔드포인트"""
+    _require_ready()
+    start_time = time.perf_counter()
+    stage_timings = metrics.collect_stage_timings()
+    profile_id = select_profile_id(http_request.headers)
     try:
-        service = RecommendationService.get_instance()
-        recommendations = service.get_recommendations(request)
+        recommendations = await recommendation_executor.run('get_recommendations', request, profile_id=profile_id)
 
-        return {
-            **recommendations,
-            "timestamp": datetime.now().isoformat()
-        }
+        response = _serialize(
+            [request.destination],
+            lambda: _encode_result(recommendations, datetime.now().isoformat()),
+            http_request,
+            profile_id
+        )
+        elapsed = time.perf_counter() - start_time
+        metrics.observe_request('recommend', [request.destination], elapsed)
+        _log_served('recommend', request.destination, 1, elapsed, stage_timings)
+        return response
 
+    except ExecutorSaturatedError as e:
+        logger.warning(f"Rejecting recommendation request: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"Error generating recommendations: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/recommend/batch")
+async def get_batch_recommendations(requests: List[TravelRequest], http_request: Request):
+    """여러 요청을 한 번에 처리하는 배치 추천 엔드포인트"""
+    _require_ready()
+    if len(requests) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch size {len(requests)} exceeds limit {settings.MAX_BATCH_SIZE}"
+        )
+
+    start_time = time.perf_counter()
+    stage_timings = metrics.collect_stage_timings()
+    destinations = [request.destination for request in requests]
+    profile_id = select_profile_id(http_request.headers)
+    try:
+        results = await recommendation_executor.run('get_recommendations_batch', requests, profile_id=profile_id)
+
+        timestamp = datetime.now().isoformat()
+        response = _serialize(
+            destinations,
+            lambda: {
+                "results": [_encode_result(recommendations, timestamp) for recommendations in results],
+                "count": len(results),
+                "timestamp": timestamp
+            },
+            http_request,
+            profile_id
+        )
+        elapsed = time.perf_counter() - start_time
+        metrics.observe_request('recommend_batch', destinations, elapsed)
+        _log_served('recommend_batch', None, len(requests), elapsed, stage_timings)
+        return response
+
+    except ExecutorSaturatedError as e:
+        logger.warning(f"Rejecting batch recommendation request: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        logger.error(f"Error generating batch recommendations: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/admin/reload", status_code=202)
+async def reload_data(http_request: Request):
+    """
+    데이터 무중단 재로드 시작 (백그라운드에서 로드 후 교체)
+    uvicorn 워커가 여러 개이면 요청을 받은 워커만 재로드됨 (다른 워커는 RELOAD_WATCH_INTERVAL 감시로 반영)
+    """
+    _require_admin(http_request)
+    _require_ready()
+    if not data_reloader.trigger():
+        raise HTTPException(status_code=409, detail="Reload already in progress")
+    return data_reloader.state()
+
+
+@router.get("/admin/reload")
+async def get_reload_status(http_request: Request):
+    """데이터 재로드 상태 (요청을 받은 워커 기준)"""
+    _require_admin(http_request)
+    return data_reloader.state()
+
+
+@router.post("/admin/ingest", status_code=202)
+async def ingest_data(request: IngestRequest, http_request: Request):
+    """
+    추가분 파일 병합 시작 (CSV 재처리 없이 백그라운드에서 반영)
+    uvicorn 워커가 여러 개이면 요청을 받은 워커만 반영됨
+    """
+    _require_admin(http_request)
+    _require_ready()
+    if request.visit_path and not (request.travel_path and request.traveller_path):
+        raise HTTPException(
+            status_code=422,
+            detail="visit_path requires travel_path and traveller_path of the same batch"
+        )
+    if not data_reloader.trigger_ingest(request.visit_path, request.travel_path, request.traveller_path):
+        raise HTTPException(status_code=409, detail="Reload or ingest already in progress")
+    return data_reloader.state()
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Prometheus 지표 (단계별 지연 시간, 후보/집계 수, 캐시, 데이터 버전, 메모리)"""
+    content, content_type = metrics.render()
+    return Response(content=content, media_type=content_type)
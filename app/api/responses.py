@@ -0,0 +1,94 @@
+from typing import Any, Dict, List, Optional
+
+import pydantic_core
+from fastapi.responses import JSONResponse, Response
+
+from ..models.schemas import SIMILARITY_SCORE_FIELDS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = 'application/x-msgpack'
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson으로 직렬화하는 JSON 응답 (orjson이 없으면 pydantic-core의 Rust 직렬화)
+    내용은 이미 기본 타입(dict/list/str/float/int/None)이어야 함 (jsonable_encoder를 거치지 않음)
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return pydantic_core.to_json(content)
+
+
+class MsgpackResponse(Response):
+    """내부 클라이언트용 msgpack 응답 (Accept: application/x-msgpack)"""
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, use_bin_type=True)
+
+
+def encode_recommendations(recommendations: List[Dict]) -> List[Dict]:
+    """
+    추천 목록의 유사도 상세 점수(float 튜플)를 응답 형식(SimilarityScores 객체)으로 변환
+    캐시된 결과를 공유하므로 원본을 수정하지 않고 새 dict 생성
+    """
+    return [
+        {**item, 'similarity_scores': dict(zip(SIMILARITY_SCORE_FIELDS, item['similarity_scores']))}
+        for item in recommendations
+    ]
+
+
+def _parse_accept(accept: str) -> Dict[str, float]:
+    """Accept 헤더 -> {미디어 타입: q 값} (q가 없거나 잘못되면 1)"""
+    qualities = {}
+    for part in accept.split(','):
+        media_type, *params = [value.strip() for value in part.split(';')]
+        if not media_type:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    pass
+        qualities[media_type.lower()] = quality
+    return qualities
+
+
+def _quality(qualities: Dict[str, float], media_type: str) -> float:
+    """가장 구체적으로 일치하는 항목의 q 값 (type/subtype > type/* > */*, 없으면 0)"""
+    major = media_type.split('/', 1)[0]
+    for candidate in (media_type, f'{major}/*', '*/*'):
+        if candidate in qualities:
+            return qualities[candidate]
+    return 0.0
+
+
+def accepts_msgpack(accept: Optional[str]) -> bool:
+    """msgpack을 JSON보다 선호하는 경우만 참 (q 값 비교, 같으면 JSON)"""
+    if msgpack is None or not accept:
+        return False
+    qualities = _parse_accept(accept)
+    msgpack_quality = _quality(qualities, MSGPACK_MEDIA_TYPE)
+    return msgpack_quality > 0 and msgpack_quality > _quality(qualities, 'application/json')
+
+
+def make_response(content: Any, accept: Optional[str] = None) -> Response:
+    """Accept 헤더가 msgpack을 JSON보다 선호하면 msgpack, 아니면 JSON 응답"""
+    if accepts_msgpack(accept):
+        return MsgpackResponse(content)
+    return FastJSONResponse(content)
@@ -1,4 +1,4 @@
 from .config import settings
-from .logging import setup_logging
+from .logging import setup_logging, RequestIdMiddleware
 
-__all__ = ['settings', 'setup_logging']
\ No newline at end of file
+__all__ = ['settings', 'setup_logging', 'RequestIdMiddleware']
\ No newline at end of file
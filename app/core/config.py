@@ -15,18 +15,69 @@ class Settings(BaseSettings):
     # 서버 설정
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    # uvicorn 워커 프로세스 수 (2 이상이면 워커들이 mmap 스냅샷을 공유)
+    # 관리자 재로드/병합 요청은 요청을 받은 워커 하나에만 반영되므로,
+    # 2 이상이면 RELOAD_WATCH_INTERVAL을 설정하여 다른 워커도 원본 변경을 감지해 재로드하도록 함
+    WORKERS: int = 1
+    # 관리자 API(/admin/*) 토큰 (X-Admin-Token 헤더), 비어 있으면 로컬(127.0.0.1/::1) 요청만 허용
+    ADMIN_TOKEN: str = ""
 
     # 데이터 파일 경로
     VISIT_DATA_PATH: str = os.path.join(DATA_DIR, "Training/label/csv/tn_visit_area_info_E.csv")
     USER_DATA_PATH: str = os.path.join(DATA_DIR, "Training/label/csv/tn_traveller_master_E.csv")
+    TRAVEL_DATA_PATH: str = os.path.join(DATA_DIR, "Training/label/csv/tn_travel_E.csv")
     PREPROCESSED_PATH: str = os.path.join(DATA_DIR, "preprocessed/dfE.csv")
     MODEL_PATH: str = os.path.join(BASE_DIR, "experiments/best_model/model.pkl")
+    # 아이템 유사도 (dict pickle), SIMILARITY_STORE_DIR가 아직 생성되지 않았을 때 app.py가 읽음
     SIMILARITIES_PATH: str = os.path.join(DATA_DIR, "similarities/item_similarities.pkl")
+    # 아이템 유사도 빌더 출력 (top-k CSR 배열, mmap으로 읽음), 생성되어 있으면 app.py가 SIMILARITIES_PATH 대신 읽음
+    SIMILARITY_STORE_DIR: str = os.path.join(DATA_DIR, "similarities/item_similarities")
+    # 사용자별 추천 사전 계산 결과 (python app.py precompute 출력, SQLite)
+    RECOMMENDATION_STORE_PATH: str = os.path.join(DATA_DIR, "precomputed/recommendations.sqlite3")
+
+    # 바이너리 스냅샷 설정 (원본 CSV가 바뀌면 자동으로 다시 생성)
+    USE_SNAPSHOT: bool = True
+    SNAPSHOT_DIR: str = os.path.join(DATA_DIR, "snapshots")
+    # 원본 파일 변경 감시 주기(초), 0이면 감시하지 않음 (변경 시 무중단 재로드)
+    RELOAD_WATCH_INTERVAL: float = 0.0
+
+    # 시작 시 데이터 로드를 백그라운드에서 수행 (준비 전 추천 요청은 503 + Retry-After)
+    WARMUP_IN_BACKGROUND: bool = True
+    WARMUP_RETRY_AFTER_SECONDS: int = 5
+
+    # 추천 설정
+    # 목적지(SIDO)에 방문 기록이 있는 사용자만 유사도 계산 대상으로 사용
+    PRUNE_BY_DESTINATION: bool = False
+
+    # 추천 결과 캐시 설정 (CACHE_MAX_SIZE가 0이면 캐시 사용 안 함)
+    CACHE_MAX_SIZE: int = 1024
+    CACHE_TTL_SECONDS: float = 300.0
+
+    # 배치 추천 요청당 최대 요청 수
+    MAX_BATCH_SIZE: int = 5000
+    # 배치 유사도 계산에 쓸 (요청 x 사용자) 행렬 메모리 한도(바이트), 요청을 이 한도에 맞게 나누어 계산
+    BATCH_MEMORY_BYTES: int = 256 * 1024 * 1024
+
+    # 추천 계산 실행 방식: inline(이벤트 루프), thread(스레드 풀), process(프로세스 풀)
+    EXECUTION_MODE: str = "inline"
+    EXECUTOR_WORKERS: int = 4
+    # 대기 중인 추천 작업 한도 (초과 시 503 응답)
+    EXECUTOR_MAX_PENDING: int = 64
 
     # 로깅 설정
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     LOG_DIR: str = os.path.join(BASE_DIR, "logs")
+    # JSON 로그 (structlog, 요청 ID와 단계별 시간 등 extra 필드 포함), False면 LOG_FORMAT 텍스트
+    LOG_JSON: bool = False
+
+    # 요청별 프로파일링 (cProfile 결과를 LOG_DIR/profiles/에 요청 ID별 .prof 파일로 저장)
+    # 샘플링 비율(0이면 사용 안 함), 요청 헤더(값이 1/true/yes이면 해당 요청 프로파일링, 빈 문자열이면 헤더 무시)
+    # 헤더는 누구나 보낼 수 있으므로 기본값은 사용 안 함, 켜려면 추측하기 어려운 이름으로 설정
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_HEADER: str = ""
+    # 보관할 최대 프로파일 파일 수 (넘으면 오래된 파일부터 삭제)
+    PROFILE_MAX_FILES: int = 200
 
     class Config:
         env_file = ".env"
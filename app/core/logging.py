@@ -1,27 +1,130 @@
+import atexit
+import contextvars
 import logging
+import multiprocessing
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import re
+import threading
+import uuid
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
+from typing import List, Optional
 from .config import settings
 
+# 로그 핸들러를 붙이는 로거 (서버 로거와 app 패키지 모듈 로거)
+LOGGER_NAMES = ("recommendation-api", "app")
 
-def setup_logging():
-    """로깅 설정"""
-    # 로그 디렉토리 생성
-    os.makedirs(settings.LOG_DIR, exist_ok=True)
+# 현재 요청 ID (RequestIdMiddleware가 요청마다 설정, 로그 레코드에 request_id로 추가)
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('request_id', default=None)
+# 요청 ID 헤더 값은 허용 문자만 남기고 길이 제한 (로그/파일 이름에 그대로 쓰임)
+_UNSAFE_ID_CHARS = re.compile(r'[^A-Za-z0-9_.-]')
 
-    # 로거 생성
-    logger = logging.getLogger("recommendation-api")
-    logger.setLevel(settings.LOG_LEVEL)
+_setup_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """로그를 남긴 시점의 요청 ID를 레코드에 추가 (큐에 넣기 전, 요청을 처리하는 쪽에서 실행)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+def get_request_id() -> Optional[str]:
+    return request_id_var.get()
+
+
+def make_request_id(header_value: Optional[str] = None) -> str:
+    """헤더로 받은 요청 ID 정리, 없으면 새로 생성"""
+    request_id = _UNSAFE_ID_CHARS.sub('', header_value or '')[:64].lstrip('.')
+    return request_id or uuid.uuid4().hex
+
+
+class RequestIdMiddleware:
+    """
+    요청마다 X-Request-ID(없으면 새로 생성)를 request_id_var에 설정하고 응답 헤더로 반환하는 ASGI 미들웨어
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        header_value = None
+        for name, value in scope.get('headers', []):
+            if name == b'x-request-id':
+                header_value = value.decode('latin-1')
+                break
+        request_id = make_request_id(header_value)
+        encoded_id = request_id.encode('latin-1')
+
+        async def send_with_request_id(message):
+            if message['type'] == 'http.response.start':
+                headers = list(message.get('headers', []))
+                headers.append((b'x-request-id', encoded_id))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+def _drop_message(logger, method_name, event_dict):
+    """QueueHandler가 남긴 message 속성은 event와 같으므로 제외"""
+    event_dict.pop('message', None)
+    return event_dict
 
-    # 포맷터 생성
-    formatter = logging.Formatter(settings.LOG_FORMAT)
+
+def _build_formatter() -> logging.Formatter:
+    """LOG_JSON이면 structlog JSON 포맷 (extra 필드 포함), 아니면 LOG_FORMAT 텍스트 포맷"""
+    if settings.LOG_JSON:
+        try:
+            import structlog
+        except ImportError:
+            logging.getLogger(__name__).warning("structlog is not installed; falling back to text logs")
+        else:
+            return structlog.stdlib.ProcessorFormatter(
+                foreign_pre_chain=[
+                    structlog.stdlib.add_log_level,
+                    structlog.stdlib.add_logger_name,
+                    structlog.processors.TimeStamper(fmt='iso'),
+                    structlog.stdlib.ExtraAdder(),
+                    _drop_message
+                ],
+                processors=[
+                    structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                    structlog.processors.JSONRenderer(ensure_ascii=False)
+                ]
+            )
+    return logging.Formatter(settings.LOG_FORMAT)
+
+
+def _log_file_path(child: bool = False) -> str:
+    """
+    로그 파일 경로 (LOG_DIR/api_YYYYMMDD.log)
+    자식 프로세스(uvicorn 워커, process 모드 워커 등)는 파일 이름에 PID를 붙여
+    여러 프로세스가 같은 파일에 쓰고 회전시키지 않도록 함
+    """
+    name = f'api_{datetime.now().strftime("%Y%m%d")}'
+    if child or multiprocessing.parent_process() is not None:
+        name += f'_{os.getpid()}'
+    return os.path.join(settings.LOG_DIR, f'{name}.log')
+
+
+def _build_handlers(log_file: str) -> List[logging.Handler]:
+    """출력 핸들러 (파일, 콘솔)"""
+    formatter = _build_formatter()
 
     # 파일 핸들러
-    log_file = os.path.join(
-        settings.LOG_DIR,
-        f'api_{datetime.now().strftime("%Y%m%d")}.log'
-    )
     file_handler = RotatingFileHandler(
         log_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
@@ -32,9 +135,73 @@ def setup_logging():
     # 스트림 핸들러
     stream_handler = logging.StreamHandler()
     stream_handler.setFormatter(formatter)
+    return [file_handler, stream_handler]
+
+
+def setup_logging() -> logging.Logger:
+    """
+    로깅 설정 (여러 번 호출해도 한 번만 설정)
+    로거에는 QueueHandler만 붙이고, 파일/콘솔 출력은 QueueListener의 백그라운드 스레드에서 수행
+    (요청 처리 스레드와 이벤트 루프에서는 디스크 I/O 없이 큐에 넣기만 함)
+    """
+    global _listener, _queue_handler
+    logger = logging.getLogger("recommendation-api")
+    with _setup_lock:
+        if _listener is not None:
+            return logger
+
+        # 로그 디렉토리 생성
+        os.makedirs(settings.LOG_DIR, exist_ok=True)
+        handlers = _build_handlers(_log_file_path())
+
+        # 큐 핸들러 (로거 쪽)와 리스너 (출력 쪽)
+        log_queue = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.addFilter(RequestIdFilter())
+        for name in LOGGER_NAMES:
+            named_logger = logging.getLogger(name)
+            named_logger.setLevel(settings.LOG_LEVEL)
+            named_logger.addHandler(queue_handler)
+            # 루트 로거에 다른 핸들러가 있어도 중복 출력하지 않음
+            named_logger.propagate = False
+
+        _queue_handler = queue_handler
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        # 종료 시 큐에 남은 로그까지 출력
+        atexit.register(stop_logging)
+
+    return logger
+
+
+def _restart_listener_in_child():
+    """
+    fork된 자식 프로세스(process 모드 워커 등)에는 리스너 스레드가 없으므로
+    새 큐와 리스너를 만들고, 파일은 부모와 같은 파일을 회전시키지 않도록 PID를 붙인 파일로 출력
+    """
+    global _listener, _setup_lock
+    # fork 시점에 다른 스레드가 잡고 있던 잠금은 자식에서 풀리지 않으므로 새로 생성
+    _setup_lock = threading.Lock()
+    if _listener is None:
+        return
+    log_queue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_build_handlers(_log_file_path(child=True)), respect_handler_level=True)
+    _listener.start()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
 
-    # 핸들러 추가
-    logger.addHandler(file_handler)
-    logger.addHandler(stream_handler)
 
-    return logger
\ No newline at end of file
+def stop_logging():
+    """큐 핸들러 제거 후 리스너 종료 (큐에 남은 로그 출력 후 스레드 종료)"""
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is None:
+            return
+        for name in LOGGER_NAMES:
+            logging.getLogger(name).removeHandler(_queue_handler)
+        _listener.stop()
+        _listener = None
+        _queue_handler = None
@@ -0,0 +1,23 @@
+import os
+import resource
+
+
+def get_rss_bytes() -> int:
+    """현재 프로세스의 상주 메모리(RSS) 크기 (바이트)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # /proc이 없는 환경에서는 최대 RSS로 대체 (Linux: KB, macOS: bytes)
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if os.uname().sysname == 'Darwin' else max_rss * 1024
+
+
+def get_peak_rss_bytes(include_children: bool = False) -> int:
+    """프로세스 최대 RSS 크기 (바이트, include_children이면 종료된 자식 프로세스 중 최대값과 비교)"""
+    scale = 1 if os.uname().sysname == 'Darwin' else 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if include_children:
+        peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak * scale
@@ -0,0 +1,238 @@
+import contextvars
+import os
+from collections import Counter as CountBy
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client import multiprocess
+
+from .memory import get_rss_bytes
+
+# 단계별 지연 시간 버킷 (초), 밀리초 이하 단계부터 전체 요청까지
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# stage: scoring(유사 사용자 점수 계산), top_k(상위 k명 선택), aggregation(방문 집계), serialization(응답 직렬화)
+STAGE_SECONDS = Histogram(
+    'recommendation_stage_seconds',
+    'Time spent in each recommendation stage per request',
+    ['stage', 'destination'],
+    buckets=LATENCY_BUCKETS
+)
+REQUEST_SECONDS = Histogram(
+    'recommendation_request_seconds',
+    'Total recommendation request time per request',
+    ['endpoint', 'destination'],
+    buckets=LATENCY_BUCKETS
+)
+CANDIDATE_USERS = Counter(
+    'recommendation_candidate_users',
+    'Candidate users scored against requests',
+    ['destination']
+)
+VISITS_AGGREGATED = Counter(
+    'recommendation_visits_aggregated',
+    'Visit records aggregated into place scores',
+    ['destination']
+)
+CACHE_LOOKUPS = Counter(
+    'recommendation_cache_lookups',
+    'Recommendation cache lookups',
+    ['result']
+)
+DATA_LOADS = Counter(
+    'recommendation_data_loads',
+    'Data loads and delta ingests',
+    ['source']
+)
+DATA_VERSION = Gauge(
+    'recommendation_data_version_info',
+    'Data version currently serving requests (1 while serving, 0 once replaced in multiprocess mode)',
+    ['data_version'],
+    multiprocess_mode='livemax'
+)
+LOADED_ROWS = Gauge(
+    'recommendation_loaded_rows',
+    'Rows loaded into the recommendation service',
+    ['table'],
+    multiprocess_mode='livemax'
+)
+PROCESS_RSS = Gauge(
+    'recommendation_process_rss_bytes',
+    'Resident memory of the serving process',
+    multiprocess_mode='livesum'
+)
+
+# 현재 요청의 단계별 시간(초) 기록용 (collect_stage_timings()로 시작, 요청 로그에 사용)
+_stage_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    'stage_timings', default=None
+)
+
+# 목적지 라벨 값은 데이터에 있는 SIDO로 제한 (임의 입력으로 시계열이 늘어나지 않도록)
+OTHER_DESTINATION = 'other'
+_known_destinations = frozenset()
+
+# 현재 기록 중인 데이터 버전 (버전이 바뀌면 이전 라벨을 정리)
+_data_version: Optional[str] = None
+
+# process 모드 워커에서는 지표를 직접 기록하지 않고 호출을 모아 두었다가 API 프로세스에서 다시 실행 (replay)
+# 워커 프로세스는 작업을 하나씩 실행하므로 모듈 변수로 충분
+_worker_events: Optional[List[Tuple[str, tuple]]] = None
+_DESTINATION_COUNTERS = {
+    'candidate_users': CANDIDATE_USERS,
+    'visits_aggregated': VISITS_AGGREGATED
+}
+
+
+def _multiprocess_enabled() -> bool:
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+
+def collect_in_worker():
+    """현재 프로세스(process 모드 워커)의 지표 기록을 drain_worker_events()로 넘기도록 전환"""
+    global _worker_events
+    _worker_events = []
+
+
+def drain_worker_events() -> List[Tuple[str, tuple]]:
+    """워커에서 모아 둔 지표 호출 반환 후 비움"""
+    global _worker_events
+    if _worker_events is None:
+        return []
+    events, _worker_events = _worker_events, []
+    return events
+
+
+def _defer(name: str, args: tuple) -> bool:
+    """워커이면 호출을 모아 두고 True 반환"""
+    if _worker_events is None:
+        return False
+    _worker_events.append((name, args))
+    return True
+
+
+def replay(events: Iterable[Tuple[str, tuple]]):
+    """워커에서 모아 온 지표 호출을 이 프로세스에서 실행 (목적지 라벨은 이 프로세스의 목록 기준)"""
+    for name, args in events:
+        _REPLAY_FUNCTIONS[name](*args)
+
+
+def set_known_destinations(destinations: Iterable[str]):
+    """라벨로 사용할 목적지(SIDO) 목록 갱신"""
+    global _known_destinations
+    _known_destinations = frozenset(str(destination) for destination in destinations)
+
+
+def destination_label(destination: str) -> str:
+    return destination if destination in _known_destinations else OTHER_DESTINATION
+
+
+def _observe_per_request(histogram: Histogram, label: str, destinations: Iterable[str], seconds: float):
+    """
+    여러 요청을 한 번에 처리한 시간을 요청당 시간으로 나누어 목적지별로 기록
+    (단건 요청은 그대로 기록)
+    """
+    counts = CountBy(destination_label(destination) for destination in destinations)
+    total = sum(counts.values())
+    if not total:
+        return
+    per_request = seconds / total
+    for destination, count in counts.items():
+        labelled = histogram.labels(label, destination)
+        for _ in range(count):
+            labelled.observe(per_request)
+
+
+def collect_stage_timings() -> Dict[str, float]:
+    """현재 컨텍스트에서 이후 기록되는 단계 시간을 모을 dict 반환 (같은 컨텍스트/복사된 컨텍스트에서만 모임)"""
+    timings = {}
+    _stage_timings.set(timings)
+    return timings
+
+
+def observe_stage(stage: str, destinations: Iterable[str], seconds: float):
+    destinations = list(destinations)
+    if _defer('observe_stage', (stage, destinations, seconds)):
+        return
+    _observe_per_request(STAGE_SECONDS, stage, destinations, seconds)
+    timings = _stage_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def observe_request(endpoint: str, destinations: Iterable[str], seconds: float):
+    _observe_per_request(REQUEST_SECONDS, endpoint, destinations, seconds)
+
+
+def count_by_destination(counter: Counter, destinations: Iterable[str], amounts: Iterable[int]):
+    """목적지별 수량 누적 (counter는 CANDIDATE_USERS 또는 VISITS_AGGREGATED)"""
+    if _worker_events is not None:
+        name = next(name for name, known in _DESTINATION_COUNTERS.items() if known is counter)
+        _defer('count_by_destination', (name, list(destinations), [int(amount) for amount in amounts]))
+        return
+    totals = CountBy()
+    for destination, amount in zip(destinations, amounts):
+        totals[destination_label(destination)] += int(amount)
+    for label, amount in totals.items():
+        counter.labels(label).inc(amount)
+
+
+def _replay_count_by_destination(name: str, destinations: List[str], amounts: List[int]):
+    count_by_destination(_DESTINATION_COUNTERS[name], destinations, amounts)
+
+
+def count_cache_lookups(hits: int, misses: int):
+    if _defer('count_cache_lookups', (hits, misses)):
+        return
+    CACHE_LOOKUPS.labels('hit').inc(hits)
+    CACHE_LOOKUPS.labels('miss').inc(misses)
+
+
+def record_data(data_version: str, user_rows: int, visit_rows: int, source: str):
+    """데이터 로드/병합 후 데이터 버전과 적재 행 수 갱신"""
+    global _data_version
+    if _worker_events is not None:
+        # 워커의 데이터 지표는 API 프로세스가 워커 풀 교체 때 기록 (RecommendationExecutor._set_worker_state)
+        return
+    DATA_LOADS.labels(source).inc()
+    data_version = str(data_version)
+    if _data_version is not None and _data_version != data_version:
+        if _multiprocess_enabled():
+            # 멀티프로세스 모드의 값은 프로세스별 파일에 남아 remove/clear로 지워지지 않으므로 0으로 기록
+            DATA_VERSION.labels(_data_version).set(0)
+        else:
+            DATA_VERSION.remove(_data_version)
+    DATA_VERSION.labels(data_version).set(1)
+    _data_version = data_version
+    LOADED_ROWS.labels('users').set(user_rows)
+    LOADED_ROWS.labels('visits').set(visit_rows)
+
+
+def mark_processes_dead(pids: Iterable[int]):
+    """종료한 워커 프로세스의 live 게이지 파일 정리 (PROMETHEUS_MULTIPROC_DIR 사용 시)"""
+    if not _multiprocess_enabled():
+        return
+    for pid in pids:
+        multiprocess.mark_process_dead(pid)
+
+
+_REPLAY_FUNCTIONS = {
+    'observe_stage': observe_stage,
+    'count_by_destination': _replay_count_by_destination,
+    'count_cache_lookups': count_cache_lookups
+}
+
+
+def render() -> Tuple[bytes, str]:
+    """
+    Prometheus 텍스트 형식으로 지표 출력
+    process 모드 워커의 지표는 API 프로세스가 돌려받아 기록하므로 워커 수와 관계없이 이 프로세스에 있음
+    PROMETHEUS_MULTIPROC_DIR이 설정되어 있으면 모든 uvicorn 워커의 지표를 합산
+    """
+    PROCESS_RSS.set(get_rss_bytes())
+    if _multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,77 @@
+import cProfile
+import logging
+import os
+import random
+from datetime import datetime
+from typing import Any, Callable, Mapping, Optional
+
+from .config import settings
+from .logging import get_request_id, make_request_id
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SUBDIR = 'profiles'
+REQUEST_ID_HEADER = 'X-Request-ID'
+_ENABLED_VALUES = {'1', 'true', 'yes', 'on'}
+
+
+def select_profile_id(headers: Mapping[str, str]) -> Optional[str]:
+    """
+    요청을 프로파일링할지 결정하고, 프로파일링하면 요청 ID 반환 (아니면 None)
+    PROFILE_HEADER 헤더가 켜져 있거나 PROFILE_SAMPLE_RATE 확률로 선택 (기본값은 둘 다 사용 안 함)
+    요청 ID는 로그와 같은 요청 ID (미들웨어 밖에서는 X-Request-ID 헤더 값, 없으면 새로 생성)
+    """
+    requested = bool(settings.PROFILE_HEADER) and (
+        headers.get(settings.PROFILE_HEADER, '').strip().lower() in _ENABLED_VALUES
+    )
+    sampled = settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+    if not (requested or sampled):
+        return None
+
+    return get_request_id() or make_request_id(headers.get(REQUEST_ID_HEADER))
+
+
+def run_profiled(profile_id: Optional[str], func: Callable, *args, **kwargs) -> Any:
+    """
+    profile_id가 있으면 func 실행을 cProfile로 측정하여 LOG_DIR/profiles/<시각>_<요청 ID>.prof로 저장
+    (pstats 형식, `python -m pstats` 또는 snakeviz 등으로 확인), 없으면 그대로 실행
+    파일은 PROFILE_MAX_FILES개까지만 보관
+    실행 중인 스레드만 측정하므로 func를 실제로 실행하는 프로세스/스레드에서 호출해야 함
+    """
+    if profile_id is None:
+        return func(*args, **kwargs)
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Python 3.12부터는 프로파일러를 동시에 하나만 켤 수 있음 (다른 요청 측정 중이면 측정 없이 실행)
+        logger.warning(f"Skipping profile for request {profile_id}: {e}")
+        return func(*args, **kwargs)
+
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        try:
+            directory = os.path.join(settings.LOG_DIR, PROFILE_SUBDIR)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f'{datetime.now().strftime("%Y%m%d_%H%M%S_%f")}_{profile_id}.prof')
+            profiler.dump_stats(path)
+            logger.info(f"Saved profile for request {profile_id} to {path}")
+            _prune_profiles(directory, settings.PROFILE_MAX_FILES)
+        except OSError as e:
+            logger.warning(f"Failed to save profile for request {profile_id}: {e}")
+
+
+def _prune_profiles(directory: str, max_files: int):
+    """오래된 프로파일 파일 삭제 (파일 이름이 저장 시각으로 시작하므로 이름순이 오래된 순)"""
+    if max_files <= 0:
+        return
+    names = sorted(name for name in os.listdir(directory) if name.endswith('.prof'))
+    for name in names[:-max_files]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            # 다른 워커 프로세스가 먼저 삭제함
+            pass
@@ -2,12 +2,14 @@ from .schemas import (
     TravelRequest,
     RecommendationResponse,
     RecommendationItem,
-    SimilarityScores
+    SimilarityScores,
+    SIMILARITY_SCORE_FIELDS
 )
 
 __all__ = [
     'TravelRequest',
     'RecommendationResponse',
     'RecommendationItem',
-    'SimilarityScores'
+    'SimilarityScores',
+    'SIMILARITY_SCORE_FIELDS'
 ]
\ No newline at end of file
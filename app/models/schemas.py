@@ -22,6 +22,9 @@ class SimilarityScores(BaseModel):
     style: float
     final: float
 
+# 서비스 내부에서는 유사도 상세 점수를 이 순서의 float 튜플로 보관하고 응답 직렬화 때 객체로 변환
+SIMILARITY_SCORE_FIELDS = tuple(SimilarityScores.model_fields)
+
 class RecommendationItem(BaseModel):
     item_id: str = Field(..., description="장소 ID")
     sido: str = Field(..., description="지역")
@@ -32,4 +35,10 @@ class RecommendationItem(BaseModel):
 class RecommendationResponse(BaseModel):
     recommendations: List[RecommendationItem]
     similar_users_count: int = Field(..., description="유사 사용자 수")
-    timestamp: datetime = Field(default_factory=datetime.now)
\ No newline at end of file
+    data_version: Optional[str] = Field(None, description="추천에 사용된 데이터 버전")
+    timestamp: datetime = Field(default_factory=datetime.now)
+
+class IngestRequest(BaseModel):
+    visit_path: Optional[str] = Field(None, description="방문지 추가분 CSV (tn_visit_area_info 형식)")
+    travel_path: Optional[str] = Field(None, description="여행 추가분 CSV (tn_travel 형식)")
+    traveller_path: Optional[str] = Field(None, description="여행자 추가분 CSV (tn_traveller_master 형식)")
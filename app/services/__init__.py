@@ -1,3 +1,15 @@
 from .recommender import RecommendationService
+from .executor import RecommendationExecutor, ExecutorSaturatedError, recommendation_executor
+from .reloader import DataReloader, data_reloader
+from .warmup import ServiceWarmup, service_warmup
 
-__all__ = ['RecommendationService']
\ No newline at end of file
+__all__ = [
+    'RecommendationService',
+    'RecommendationExecutor',
+    'ExecutorSaturatedError',
+    'recommendation_executor',
+    'DataReloader',
+    'data_reloader',
+    'ServiceWarmup',
+    'service_warmup'
+]
\ No newline at end of file
@@ -0,0 +1,89 @@
+from typing import Any, Dict, Hashable, Optional
+from collections import OrderedDict
+import threading
+import time
+import hashlib
+import json
+
+from ..models.schemas import TravelRequest
+
+
+class RecommendationCache:
+    """
+    요청 결과 LRU 캐시
+    크기(max_size)와 유효 시간(ttl_seconds) 제한, 적중/실패/제거 횟수 집계
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(request: TravelRequest, **options) -> str:
+        """
+        점수 계산에 영향을 주는 필드만으로 순서 무관한 캐시 키 생성
+        startAt/endAt, theme, disabilities는 점수에 쓰이지 않으므로 제외
+        age는 포함 여부만 쓰이므로 집합으로, purpose/visit은 길이도 쓰이므로 정렬만 적용
+        """
+        canonical = {
+            'people': request.people,
+            'destination': request.destination,
+            'age': sorted(set(request.age)),
+            'purpose': sorted(request.purpose),
+            'visit': sorted(request.visit),
+            'environment': request.environment,
+            'options': sorted(options.items())
+        }
+        payload = json.dumps(canonical, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """캐시 저장 (크기 초과 시 가장 오래 사용하지 않은 항목 제거)"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """전체 무효화"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 통계"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
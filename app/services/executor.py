@@ -0,0 +1,220 @@
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import contextvars
+import functools
+import logging
+
+from ..core.config import settings
+from ..core import metrics
+from ..core.profiling import run_profiled
+from .recommender import RecommendationService
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """대기 중인 작업 수가 한도를 넘었을 때 발생"""
+
+
+def _init_worker():
+    """프로세스 풀 워커 초기화: 워커당 한 번 데이터 로드 (지표는 API 프로세스로 돌려보내도록 전환)"""
+    metrics.collect_in_worker()
+    RecommendationService.get_instance()
+
+
+def _warmup() -> Dict:
+    """워커 준비 확인 (워커가 로드한 데이터/원본 버전, 목적지 목록, 행 수 반환)"""
+    service = RecommendationService.get_instance()
+    return {
+        'data_version': service.data_version,
+        'source_version': service.source_version,
+        'destinations': list(service.destination_user_rows),
+        'visit_records': len(service.visit_index),
+        'user_records': service.user_count
+    }
+
+
+def _call_service(method: str, profile_id: Optional[str], *args, **kwargs) -> Any:
+    """워커 프로세스의 RecommendationService 메서드 호출 (profile_id가 있으면 프로파일링)"""
+    return run_profiled(profile_id, getattr(RecommendationService.get_instance(), method), *args, **kwargs)
+
+
+def _call_worker_service(method: str, profile_id: Optional[str], *args, **kwargs) -> Tuple[Any, List]:
+    """process 모드 워커에서 _call_service 실행 후 결과와 그동안 모은 지표 호출 반환"""
+    result = _call_service(method, profile_id, *args, **kwargs)
+    return result, metrics.drain_worker_events()
+
+
+class RecommendationExecutor:
+    """
+    추천 계산 실행기
+    - inline: 이벤트 루프에서 직접 실행
+    - thread: 스레드 풀에서 실행
+    - process: 프로세스 풀에서 실행 (워커 프로세스마다 데이터를 한 번 로드)
+    대기 작업 수가 max_pending을 넘으면 ExecutorSaturatedError 발생
+    """
+
+    MODES = ('inline', 'thread', 'process')
+
+    def __init__(self, mode: str = 'inline', max_workers: int = 4, max_pending: int = 64):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown execution mode: {mode} (expected one of {self.MODES})")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._pool: Optional[Executor] = None
+        self._worker_data_version: Optional[str] = None
+        self._worker_state: Optional[Dict] = None
+
+    @classmethod
+    def from_settings(cls) -> 'RecommendationExecutor':
+        return cls(
+            mode=settings.EXECUTION_MODE,
+            max_workers=settings.EXECUTOR_WORKERS,
+            max_pending=settings.EXECUTOR_MAX_PENDING
+        )
+
+    def start(self):
+        """풀 생성 (process 모드는 워커 데이터 로드까지 완료)"""
+        if self.mode == 'thread':
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='recommendation'
+            )
+        elif self.mode == 'process':
+            self._pool, worker_state = self._start_process_pool()
+            self._set_worker_state(worker_state)
+        logger.info(f"Recommendation executor started (mode={self.mode}, workers={self.max_workers})")
+
+    def _start_process_pool(self) -> Tuple[ProcessPoolExecutor, Dict]:
+        """프로세스 풀 생성 후 모든 워커가 데이터를 로드할 때까지 대기 (풀과 워커 상태 반환)"""
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker
+        )
+        futures = [pool.submit(_warmup) for _ in range(self.max_workers)]
+        worker_states = [future.result() for future in futures]
+        return pool, worker_states[-1]
+
+    def _set_worker_state(self, worker_state: Dict):
+        """요청을 처리하는 풀이 바뀐 뒤 호출 (그 전에는 기존 풀의 데이터 버전을 보고)"""
+        self._worker_state = worker_state
+        self._worker_data_version = worker_state['data_version']
+        # 요청 지표는 워커에서 돌려받아 이 프로세스에서 기록하므로 목적지 라벨과 데이터 지표도 이 프로세스에 둠
+        metrics.set_known_destinations(worker_state['destinations'])
+        metrics.record_data(
+            worker_state['data_version'], worker_state['user_records'], worker_state['visit_records'], 'worker_pool'
+        )
+
+    @staticmethod
+    def _shutdown_pool(pool: Executor, wait: bool):
+        """풀 종료 후 워커 프로세스의 지표 파일 정리 (PROMETHEUS_MULTIPROC_DIR 사용 시)"""
+        worker_pids = list(getattr(pool, '_processes', None) or ())
+        pool.shutdown(wait=wait)
+        metrics.mark_processes_dead(worker_pids)
+
+    @property
+    def data_version(self) -> Optional[str]:
+        """현재 요청을 처리하는 데이터 버전"""
+        if self.mode == 'process':
+            return self._worker_data_version
+        if RecommendationService.has_instance():
+            return RecommendationService.get_instance().data_version
+        return None
+
+    @property
+    def source_version(self) -> Optional[str]:
+        """현재 요청을 처리하는 데이터의 원본 파일 버전 (원본 변경 감시에서 비교)"""
+        if self.mode == 'process':
+            return (self._worker_state or {}).get('source_version')
+        if RecommendationService.has_instance():
+            return RecommendationService.get_instance().source_version
+        return None
+
+    def loaded_rows(self) -> Dict[str, Optional[int]]:
+        """현재 요청을 처리하는 데이터의 행 수 (로드 전이면 None)"""
+        if self.mode == 'process':
+            state = self._worker_state or {}
+            return {'visit_records': state.get('visit_records'), 'user_records': state.get('user_records')}
+        if RecommendationService.has_instance():
+            service = RecommendationService.get_instance()
+            return {'visit_records': len(service.visit_index), 'user_records': service.user_count}
+        return {'visit_records': None, 'user_records': None}
+
+    def reload_data(self):
+        """
+        데이터 무중단 재로드
+        inline/thread 모드는 서비스 인스턴스를, process 모드는 새 데이터를 로드한 워커 풀을 통째로 교체
+        기존 풀은 진행 중인 작업을 마친 뒤 종료됨
+        """
+        if self.mode != 'process' or self._pool is None:
+            RecommendationService.reload()
+            return
+
+        pool, worker_state = self._start_process_pool()
+        previous_pool, self._pool = self._pool, pool
+        self._set_worker_state(worker_state)
+        self._shutdown_pool(previous_pool, wait=False)
+        logger.info(f"Swapped recommendation worker pool (data version {self._worker_data_version})")
+
+    def ingest_files(
+            self,
+            visit_path: Optional[str] = None,
+            travel_path: Optional[str] = None,
+            traveller_path: Optional[str] = None
+    ) -> Dict:
+        """
+        추가분 파일 반영 (CSV 재처리 없이 병합)
+        inline/thread 모드는 병합한 서비스 인스턴스로 싱글톤을 교체
+        process 모드는 이 프로세스에서 스냅샷을 열어 병합/저장한 뒤 워커 풀을 교체
+        (워커는 새 스냅샷을 mmap으로 다시 로드하므로 비용은 스냅샷 재로드와 같음)
+        """
+        if self.mode != 'process' or self._pool is None:
+            return RecommendationService.ingest_files(visit_path, travel_path, traveller_path)
+
+        service = RecommendationService()
+        visits, travellers = service.read_delta_files(visit_path, travel_path, traveller_path)
+        _, stats = service.merge_delta(visits, travellers, background_snapshot=False)
+        self.reload_data()
+        return stats
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._shutdown_pool(self._pool, wait=True)
+            self._pool = None
+
+    async def run(self, method: str, *args, profile_id: Optional[str] = None, **kwargs) -> Any:
+        """
+        RecommendationService의 메서드를 설정된 모드로 실행
+        profile_id가 있으면 실제로 실행하는 스레드/워커 프로세스에서 프로파일링
+        """
+        if self.pending >= self.max_pending:
+            raise ExecutorSaturatedError(
+                f"Too many pending recommendation requests ({self.pending}/{self.max_pending})"
+            )
+
+        self.pending += 1
+        try:
+            if self.mode == 'inline' or self._pool is None:
+                return _call_service(method, profile_id, *args, **kwargs)
+
+            loop = asyncio.get_running_loop()
+            if self.mode == 'thread':
+                # 요청 컨텍스트(요청 ID, 단계 시간 기록)를 스레드에서도 사용
+                call = functools.partial(_call_service, method, profile_id, *args, **kwargs)
+                return await loop.run_in_executor(self._pool, functools.partial(contextvars.copy_context().run, call))
+
+            # 워커에서 돌려받은 지표는 이 코루틴(요청 컨텍스트)에서 기록하므로 단계 시간도 요청 로그에 모임
+            result, metric_events = await loop.run_in_executor(
+                self._pool,
+                functools.partial(_call_worker_service, method, profile_id, *args, **kwargs)
+            )
+            metrics.replay(metric_events)
+            return result
+        finally:
+            self.pending -= 1
+
+
+recommendation_executor = RecommendationExecutor.from_settings()
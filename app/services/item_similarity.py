@@ -0,0 +1,205 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from ..core.memory import get_peak_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 풀 워커가 공유하는 행렬 (워커 초기화 시 한 번 전달)
+_block_state: Dict = {}
+
+
+def _init_block_worker(normalized: sparse.csr_matrix, binary: Optional[sparse.csr_matrix],
+                       top_k: int, min_support: int):
+    """블록 계산 워커 초기화: 정규화된 평점 행렬과 전치 행렬 보관"""
+    _block_state['normalized'] = normalized
+    _block_state['normalized_t'] = normalized.T.tocsr()
+    _block_state['binary'] = binary
+    _block_state['binary_t'] = binary.T.tocsr() if binary is not None else None
+    _block_state['top_k'] = top_k
+    _block_state['min_support'] = min_support
+
+
+def _top_k_block(start: int, end: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    아이템 행 블록 [start, end)의 유사도 계산 후 행별 상위 k개만 반환
+    반환값: (행별 이웃 수, 이웃 아이템 코드, 유사도)
+    """
+    normalized = _block_state['normalized']
+    sims = (normalized[start:end] @ _block_state['normalized_t']).tocoo()
+    rows, cols, values = sims.row, sims.col, sims.data
+
+    # 자기 자신과 0 유사도 제외
+    keep = (cols != rows + start) & (values != 0)
+    if _block_state['min_support'] > 1:
+        # 함께 평가한 사용자 수가 min_support 미만인 쌍 제외
+        support = (_block_state['binary'][start:end] @ _block_state['binary_t']).tocsr()
+        keep &= np.asarray(support[rows, cols]).ravel() >= _block_state['min_support']
+    rows, cols, values = rows[keep], cols[keep], values[keep]
+
+    # 행별로 유사도 내림차순(동점은 아이템 코드 순) 정렬 후 상위 k개
+    order = np.lexsort((cols, -values, rows))
+    rows, cols, values = rows[order], cols[order], values[order]
+    counts = np.bincount(rows, minlength=end - start)
+    row_starts = np.repeat(np.cumsum(counts) - counts, counts)
+    keep = np.arange(len(rows)) - row_starts < _block_state['top_k']
+
+    kept_counts = np.bincount(rows[keep], minlength=end - start)
+    return kept_counts.astype(np.int64), cols[keep].astype(np.int64), values[keep].astype(np.float32)
+
+
+class ItemSimilarityBuilder:
+    """
+    사용자 x 아이템 평점 행렬에서 아이템 간 코사인 유사도 계산
+    아이템 행을 블록으로 나누어 프로세스 풀에서 희소 행렬 곱으로 계산하고
+    아이템별 상위 top_k 이웃만 CSR 배열(indptr, indices, data)로 보관
+    """
+
+    def __init__(
+            self,
+            top_k: int = 50,
+            min_support: int = 1,
+            centered: bool = False,
+            block_size: int = 256,
+            n_jobs: Optional[int] = None
+    ):
+        self.top_k = top_k
+        self.min_support = min_support
+        self.centered = centered
+        self.block_size = block_size
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.stats: Dict = {}
+
+    def rating_matrices(self, df: pd.DataFrame) -> Tuple[np.ndarray, sparse.csr_matrix, sparse.csr_matrix]:
+        """
+        방문 데이터(userID, itemID, rating) -> (아이템 ID 배열, 행 정규화된 아이템 x 사용자 평점 행렬, 평가 여부 행렬)
+        centered이면 사용자 평균을 뺀 평점(조정 코사인) 사용
+        같은 (사용자, 아이템) 쌍은 평균 평점으로 합침
+        """
+        user_codes, user_ids = pd.factorize(df['userID'])
+        item_codes, item_ids = pd.factorize(df['itemID'])
+        ratings = df['rating'].to_numpy(dtype=np.float64)
+
+        pairs = pd.DataFrame({'item': item_codes, 'user': user_codes, 'rating': ratings})
+        pairs = pairs.groupby(['item', 'user'], sort=False)['rating'].mean().reset_index()
+        values = pairs['rating'].to_numpy()
+        if self.centered:
+            user_means = pairs.groupby('user')['rating'].transform('mean').to_numpy()
+            values = values - user_means
+
+        coordinates = (pairs['item'].to_numpy(), pairs['user'].to_numpy())
+        shape = (len(item_ids), len(user_ids))
+        matrix = sparse.csr_matrix((values, coordinates), shape=shape)
+        binary = sparse.csr_matrix((np.ones(len(values)), coordinates), shape=shape)
+
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        return np.asarray(item_ids, dtype=str), (sparse.diags(inverse) @ matrix).tocsr(), binary
+
+    def build(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """유사도 계산 후 CSR 배열 반환 (item_ids, indptr, indices, data)"""
+        start_time = time.perf_counter()
+        item_ids, normalized, binary = self.rating_matrices(df)
+        if self.min_support <= 1:
+            binary = None
+
+        n_items = len(item_ids)
+        blocks = [(start, min(start + self.block_size, n_items)) for start in range(0, n_items, self.block_size)]
+        n_jobs = min(self.n_jobs, len(blocks)) if blocks else 1
+        init_args = (normalized, binary, self.top_k, self.min_support)
+
+        if n_jobs <= 1:
+            _init_block_worker(*init_args)
+            results = [_top_k_block(start, end) for start, end in blocks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_block_worker, initargs=init_args) as pool:
+                results = list(pool.map(_top_k_block, *zip(*blocks)))
+
+        counts = np.concatenate([r[0] for r in results]) if results else np.zeros(0, dtype=np.int64)
+        indptr = np.zeros(n_items + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        arrays = {
+            'item_ids': item_ids,
+            'indptr': indptr,
+            'indices': np.concatenate([r[1] for r in results]) if results else np.zeros(0, dtype=np.int64),
+            'data': np.concatenate([r[2] for r in results]) if results else np.zeros(0, dtype=np.float32)
+        }
+
+        self.stats = {
+            'items': n_items,
+            'users': normalized.shape[1],
+            'ratings': int(normalized.nnz),
+            'neighbours': int(indptr[-1]),
+            'blocks': len(blocks),
+            'workers': n_jobs,
+            'build_seconds': time.perf_counter() - start_time,
+            'peak_rss_bytes': get_peak_rss_bytes(),
+            'peak_worker_rss_bytes': get_peak_rss_bytes(include_children=True) if n_jobs > 1 else None
+        }
+        logger.info(f"Built item similarities: {self.stats}")
+        return arrays
+
+    def metadata(self) -> Dict:
+        """저장용 빌드 설정과 통계"""
+        return {
+            'top_k': self.top_k,
+            'min_support': self.min_support,
+            'centered': self.centered,
+            'block_size': self.block_size,
+            **self.stats
+        }
+
+
+def to_similarity_dict(arrays: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+    """CSR 배열 -> 기존 item_similarities.pkl 형식 (아이템 -> {이웃 아이템: 유사도})"""
+    item_ids = arrays['item_ids']
+    indptr, indices, data = arrays['indptr'], arrays['indices'], arrays['data']
+    return {
+        str(item): {
+            str(item_ids[neighbour]): float(sim)
+            for neighbour, sim in zip(indices[indptr[code]:indptr[code + 1]], data[indptr[code]:indptr[code + 1]])
+        }
+        for code, item in enumerate(item_ids)
+    }
+
+
+def save_similarity_store(directory: str, arrays: Dict[str, np.ndarray], metadata: Optional[Dict] = None) -> str:
+    """
+    CSR 배열을 디렉토리에 .npy로 저장 (mmap으로 읽을 수 있음)
+    임시 디렉토리에 쓴 뒤 기존 디렉토리와 교체
+    """
+    directory = os.path.abspath(directory)
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    temp_directory = os.path.join(parent, f'.{os.path.basename(directory)}.tmp-{os.getpid()}')
+    shutil.rmtree(temp_directory, ignore_errors=True)
+    os.makedirs(temp_directory)
+
+    for name, array in arrays.items():
+        np.save(os.path.join(temp_directory, f'{name}.npy'), np.asarray(array), allow_pickle=False)
+    with open(os.path.join(temp_directory, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({'arrays': sorted(arrays), **(metadata or {})}, f, ensure_ascii=False, indent=2)
+
+    previous_directory = None
+    if os.path.exists(directory):
+        previous_directory = f'{temp_directory}.old'
+        os.rename(directory, previous_directory)
+    os.rename(temp_directory, directory)
+    if previous_directory:
+        shutil.rmtree(previous_directory, ignore_errors=True)
+    return directory
+
+
+def load_similarity_store(directory: str, mmap_mode: Optional[str] = 'r') -> Dict[str, np.ndarray]:
+    """save_similarity_store로 저장한 CSR 배열 로드"""
+    with open(os.path.join(directory, 'manifest.json'), 'r', encoding='utf-8') as f:
+        names: List[str] = json.load(f)['arrays']
+    return {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode) for name in names}
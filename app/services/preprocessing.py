@@ -0,0 +1,205 @@
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Optional
+import logging
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from ..core.memory import get_peak_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class VisitPreprocessor:
+    """
+    원본 Training CSV(방문지, 여행, 여행자) -> 전처리된 방문 테이블(dfE.csv) 변환
+    방문지 파일은 청크 단위로 두 번 읽음 (1차: 장소별 방문 수 집계, 2차: 필터링 후 바로 출력)
+    여행/여행자 테이블은 여행자당 한 행이므로 정수 키 배열로 메모리에 보관하고
+    방문 청크는 TRAVEL_ID -> 여행자 코드로 변환한 뒤 배열 인덱싱으로 조인
+    메모리 사용량은 청크 크기, 여행자 수, 장소 수에만 비례
+    """
+
+    # 관광지 방문 유형 (VISIT_AREA_TYPE_CD 1~8: 자연/문화/체험/쇼핑 등, 9 이상은 식당/숙소/집 등)
+    TOURIST_AREA_TYPES = range(1, 9)
+    # 추천 대상 장소의 최소 방문 기록 수
+    MIN_ITEM_VISITS = 2
+    RATING_COLUMNS = ['DGSTFN', 'REVISIT_INTENTION', 'RCMDTN_INTENTION']
+
+    GENDER_CODES = {'남': 1, '여': 0}
+    AGE_GROUP_CODES = {20: 0, 30: 1, 40: 2, 50: 3, 60: 4}
+    STYLE_COLUMNS = [f'TRAVEL_STYL_{i}' for i in range(1, 9)]
+
+    OUTPUT_COLUMNS = [
+        'userID', 'itemID', 'rating', 'SIDO',
+        'GENDER_encoded', 'AGE_GRP_encoded', 'MARR_STTS_encoded', 'INCOME', 'TRAVEL_NUM',
+        'TRAVEL_TERM_encoded', 'region_1', 'region_2', 'region_3',
+        *[f'{column}_encoded' for column in STYLE_COLUMNS]
+    ]
+
+    VISIT_DTYPES = {
+        'TRAVEL_ID': 'string',
+        'VISIT_AREA_NM': 'string',
+        'LOTNO_ADDR': 'string',
+        'VISIT_AREA_TYPE_CD': 'float32',
+        'DGSTFN': 'float64',
+        'REVISIT_INTENTION': 'float64',
+        'RCMDTN_INTENTION': 'float64'
+    }
+    TRAVEL_DTYPES = {'TRAVEL_ID': 'string', 'TRAVELER_ID': 'string'}
+    TRAVELLER_DTYPES = {
+        'TRAVELER_ID': 'string',
+        'GENDER': 'string',
+        'AGE_GRP': 'float32',
+        'MARR_STTS': 'float32',
+        'INCOME': 'float32',
+        'TRAVEL_NUM': 'float32',
+        'TRAVEL_TERM': 'float32',
+        **{f'TRAVEL_LIKE_SIDO_{i}': 'string' for i in range(1, 4)},
+        **{f'TRAVEL_LIKE_SGG_{i}': 'string' for i in range(1, 4)},
+        **{column: 'float32' for column in STYLE_COLUMNS}
+    }
+
+    def __init__(self, chunk_size: int = 100_000):
+        self.chunk_size = chunk_size
+        self.stats: Dict = {}
+        self._travel_index: Optional[pd.Index] = None
+        self._travel_user_codes: Optional[np.ndarray] = None
+        self._user_features: Optional[pd.DataFrame] = None
+
+    def _read_chunks(self, path: str, dtypes: Dict[str, str]) -> Iterator[pd.DataFrame]:
+        return pd.read_csv(
+            path,
+            usecols=list(dtypes),
+            dtype=dtypes,
+            encoding='utf-8-sig',
+            chunksize=self.chunk_size
+        )
+
+    def load_travellers(self, traveller_path: str, travel_path: str):
+        """
+        여행자 특성 테이블(정수 코드 순)과 TRAVEL_ID -> 여행자 코드 매핑 생성
+        여행자 정보가 없는 여행은 코드 -1
+        """
+        features = pd.concat(
+            [self._encode_travellers(chunk) for chunk in self._read_chunks(traveller_path, self.TRAVELLER_DTYPES)],
+            ignore_index=True
+        ).drop_duplicates('userID')
+        user_index = pd.Index(features['userID'])
+
+        travel_ids, user_codes = [], []
+        for chunk in self._read_chunks(travel_path, self.TRAVEL_DTYPES):
+            travel_ids.append(chunk['TRAVEL_ID'].to_numpy(dtype=object))
+            user_codes.append(user_index.get_indexer(chunk['TRAVELER_ID']))
+
+        self._user_features = features.reset_index(drop=True)
+        self._travel_index = pd.Index(np.concatenate(travel_ids) if travel_ids else [])
+        # 마지막 원소 -1: 없는 여행(get_indexer 결과 -1)도 같은 인덱싱으로 처리
+        self._travel_user_codes = np.append(np.concatenate(user_codes) if user_codes else [], -1).astype(np.int64)
+
+    def _encode_travellers(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """여행자 원본 컬럼 -> 출력용 인코딩 컬럼"""
+        encoded = pd.DataFrame({
+            'userID': chunk['TRAVELER_ID'].to_numpy(dtype=object),
+            'GENDER_encoded': chunk['GENDER'].map(self.GENDER_CODES).astype('Int64').to_numpy(),
+            'AGE_GRP_encoded': chunk['AGE_GRP'].map(self.AGE_GROUP_CODES).astype('Int64').to_numpy(),
+            # 코드값(1부터)을 0부터 시작하도록 변환
+            'MARR_STTS_encoded': (chunk['MARR_STTS'] - 1).astype('float64').to_numpy(),
+            'INCOME': chunk['INCOME'].astype('Int64').to_numpy(),
+            'TRAVEL_NUM': chunk['TRAVEL_NUM'].astype('Int64').to_numpy(),
+            'TRAVEL_TERM_encoded': (chunk['TRAVEL_TERM'] - 1).astype('float64').to_numpy()
+        })
+        for i in range(1, 4):
+            # 선호 지역: "시도코드_시군구코드"
+            encoded[f'region_{i}'] = (
+                chunk[f'TRAVEL_LIKE_SIDO_{i}'] + '_' + chunk[f'TRAVEL_LIKE_SGG_{i}']
+            ).to_numpy(dtype=object)
+        for column in self.STYLE_COLUMNS:
+            encoded[f'{column}_encoded'] = chunk[column].astype('Int64').to_numpy()
+        return encoded
+
+    def _filter_visits(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """관광지 유형이고 평점과 여행자 정보가 있는 방문만 남기고 여행자 코드 추가"""
+        chunk = chunk[chunk['VISIT_AREA_TYPE_CD'].isin(self.TOURIST_AREA_TYPES)]
+        chunk = chunk[chunk[self.RATING_COLUMNS].notna().any(axis=1) & chunk['VISIT_AREA_NM'].notna()]
+
+        user_codes = self._travel_user_codes[self._travel_index.get_indexer(chunk['TRAVEL_ID'])]
+        return chunk.assign(user_code=user_codes)[user_codes >= 0]
+
+    def count_items(self, visit_path: str) -> Counter:
+        """1차 패스: 필터를 통과한 방문의 장소별 기록 수"""
+        counts = Counter()
+        for chunk in self._read_chunks(visit_path, self.VISIT_DTYPES):
+            counts.update(self._filter_visits(chunk)['VISIT_AREA_NM'].value_counts().to_dict())
+        return counts
+
+    def _transform(self, chunk: pd.DataFrame, eligible_items: set) -> pd.DataFrame:
+        """2차 패스: 방문 기록이 충분한 장소만 남기고 평점/시도/여행자 특성 결합"""
+        chunk = chunk[chunk['VISIT_AREA_NM'].isin(eligible_items)]
+        features = self._user_features.iloc[chunk['user_code'].to_numpy()].reset_index(drop=True)
+
+        visits = pd.DataFrame({
+            'itemID': chunk['VISIT_AREA_NM'].to_numpy(dtype=object),
+            # 만족도, 재방문 의향, 추천 의향의 평균
+            'rating': chunk[self.RATING_COLUMNS].mean(axis=1).to_numpy(),
+            # 지번 주소의 첫 단어 (예: "경기 수원시 ..." -> "경기")
+            'SIDO': chunk['LOTNO_ADDR'].str.split(n=1).str[0].to_numpy(dtype=object)
+        })
+        return pd.concat([features[['userID']], visits, features.drop(columns='userID')], axis=1)[self.OUTPUT_COLUMNS]
+
+    def transform_delta(
+            self,
+            visit_path: str,
+            travel_path: str,
+            traveller_path: str,
+            known_items: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """
+        새로 들어온 원본 파일(방문지/여행/여행자 추가분)만 전처리
+        방문 수 기준은 추가분 안에서 세되, 이미 추천 대상인 장소(known_items)는 그대로 포함
+        추가분에 없는 여행의 방문은 제외
+        """
+        self.load_travellers(traveller_path, travel_path)
+        item_counts = self.count_items(visit_path)
+        eligible_items = {item for item, count in item_counts.items() if count >= self.MIN_ITEM_VISITS}
+        known_items = set(known_items) if known_items is not None else set()
+        eligible_items.update(item for item in item_counts if item in known_items)
+
+        chunks = [
+            self._transform(self._filter_visits(chunk), eligible_items)
+            for chunk in self._read_chunks(visit_path, self.VISIT_DTYPES)
+        ]
+        if not chunks:
+            return pd.DataFrame(columns=self.OUTPUT_COLUMNS)
+        return pd.concat(chunks, ignore_index=True)
+
+    def run(self, visit_path: str, travel_path: str, traveller_path: str, output_path: str) -> Dict:
+        """전체 파이프라인 실행, 출력은 임시 파일에 청크 단위로 쓴 뒤 교체"""
+        start_time = time.perf_counter()
+        self.load_travellers(traveller_path, travel_path)
+        item_counts = self.count_items(visit_path)
+        eligible_items = {item for item, count in item_counts.items() if count >= self.MIN_ITEM_VISITS}
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        temp_path = f'{output_path}.tmp-{os.getpid()}'
+        rows = 0
+        users = set()
+        with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(','.join(self.OUTPUT_COLUMNS) + '\n')
+            for chunk in self._read_chunks(visit_path, self.VISIT_DTYPES):
+                output = self._transform(self._filter_visits(chunk), eligible_items)
+                output.to_csv(f, header=False, index=False)
+                rows += len(output)
+                users.update(output['userID'])
+        os.replace(temp_path, output_path)
+
+        self.stats = {
+            'rows': rows,
+            'users': len(users),
+            'items': len(eligible_items),
+            'travellers': len(self._user_features),
+            'seconds': time.perf_counter() - start_time,
+            'peak_rss_bytes': get_peak_rss_bytes()
+        }
+        logger.info(f"Preprocessed visit data: {self.stats}")
+        return self.stats
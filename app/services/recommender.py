@@ -1,72 +1,579 @@
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Tuple, Optional
+import numpy as np
 import pandas as pd
+import copy
 import logging
+import time
+import threading
 from collections import defaultdict
-from ..models.schemas import TravelRequest, SimilarityScores
+from ..models.schemas import TravelRequest, SIMILARITY_SCORE_FIELDS
 from ..core.config import settings
 from .similarity_calculator import UserSimilarityCalculator
+from .visit_index import VisitIndex
+from .preprocessing import VisitPreprocessor
+from .cache import RecommendationCache
+from .snapshot import SnapshotStore
+from ..core.memory import get_rss_bytes
+from ..core import metrics
 
 logger = logging.getLogger(__name__)
 
 
 class RecommendationService:
     _instance = None
+    _reload_lock = threading.Lock()
+
+    # calculate_similarity_matrix의 (요청 x 사용자) 셀당 최대 메모리 (중간 배열 포함, 측정값)
+    SIMILARITY_BYTES_PER_CELL = 104
+
+    # 필요한 컬럼 (여행 동기 1~3, 여행 스타일 1~8 포함)
+    VISIT_COLUMNS = ['userID', 'itemID', 'rating', 'SIDO']
+    USER_COLUMNS = [
+        'TRAVELER_ID', 'GENDER', 'AGE_GRP', 'TRAVEL_STATUS_DESTINATION',
+        'TRAVEL_STATUS_ACCOMPANY', 'TRAVEL_COMPANIONS_NUM',
+        *[f'TRAVEL_MOTIVE_{i}' for i in range(1, 4)],
+        *[f'TRAVEL_STYL_{i}' for i in range(1, 9)]
+    ]
 
     @classmethod
-    def get_instance(cls):
+    def get_instance(cls, progress: Optional[Callable[[str], None]] = None):
+        """싱글톤 인스턴스 (처음 생성할 때 progress로 로드 단계 이름을 전달받을 수 있음)"""
         if cls._instance is None:
-            cls._instance = cls()
+            cls._instance = cls(progress=progress)
         return cls._instance
 
-    def __init__(self):
+    @classmethod
+    def prepare_snapshot(cls):
+        """
+        스냅샷이 최신인지 확인하고 없으면 생성
+        멀티 워커 서버 시작 전에 부모 프로세스에서 호출하여 워커들이 같은 mmap 파일을 공유하도록 함
+        """
+        if not settings.USE_SNAPSHOT:
+            raise ValueError("USE_SNAPSHOT must be enabled to share data across workers")
+        cls()
+
+    @classmethod
+    def reload(cls) -> 'RecommendationService':
+        """
+        무중단 재로드: 새 인스턴스에 데이터를 모두 로드한 뒤 싱글톤을 한 번에 교체
+        교체 전에 시작된 요청은 기존 인스턴스(이전 데이터 버전)로 끝까지 처리됨
+        """
+        with cls._reload_lock:
+            previous_version = cls._instance.data_version if cls._instance is not None else None
+            instance = cls()
+            cls._instance = instance
+            logger.info(f"Swapped recommendation data {previous_version} -> {instance.data_version}")
+            return instance
+
+    @staticmethod
+    def source_paths() -> List[str]:
+        """데이터 원본 파일 경로"""
+        return [settings.PREPROCESSED_PATH, settings.USER_DATA_PATH]
+
+    @classmethod
+    def current_source_version(cls) -> str:
+        """현재 원본 파일 기준 데이터 버전 (원본이 바뀌면 달라짐)"""
+        return SnapshotStore(settings.SNAPSHOT_DIR).version_for(cls.source_paths())
+
+    @classmethod
+    def has_instance(cls) -> bool:
+        """현재 프로세스에 서비스가 생성되어 있는지 여부"""
+        return cls._instance is not None
+
+    def __init__(self, progress: Optional[Callable[[str], None]] = None):
+        self.data_version = None
+        # 원본 파일 기준 버전 (persist 없이 병합하면 data_version만 바뀌고 이 값은 유지)
+        self.source_version = None
+        self._progress = progress
+        self._ingest_count = 0
+        self._user_index = None
+        self._df = None
+        self._user_data = None
+        self.cache = RecommendationCache(
+            max_size=settings.CACHE_MAX_SIZE,
+            ttl_seconds=settings.CACHE_TTL_SECONDS
+        )
         self.load_resources()
 
+    @property
+    def df(self) -> pd.DataFrame:
+        """방문 데이터 원본 (스냅샷에서 로드한 경우 처음 접근할 때 CSV를 읽음)"""
+        if self._df is None:
+            self._df = pd.read_csv(settings.PREPROCESSED_PATH)
+        return self._df
+
+    @property
+    def user_data(self) -> pd.DataFrame:
+        """사용자 마스터 원본 (스냅샷에서 로드한 경우 처음 접근할 때 CSV를 읽음)"""
+        if self._user_data is None:
+            self._user_data = pd.read_csv(settings.USER_DATA_PATH)
+        return self._user_data
+
     def load_resources(self):
-        """데이터 로드"""
+        """
+        데이터 로드 (스냅샷이 최신이면 mmap으로, 아니면 CSV에서 읽고 스냅샷 재생성)
+        현재 인스턴스를 제자리에서 갱신하므로, 서비스 중 재로드는 reload()를 사용
+        """
         try:
             logger.info("Loading data...")
+            start_time = time.perf_counter()
 
-            # 방문 데이터 로드
-            logger.info("Loading preprocessed visit data...")
-            self.df = pd.read_csv(settings.PREPROCESSED_PATH)
-
-            # 사용자 마스터 데이터 로드
-            logger.info("Loading user data...")
-            self.user_data = pd.read_csv(settings.USER_DATA_PATH)
-
-            # 필요한 컬럼 확인
-            required_columns = {
-                'visit_data': ['userID', 'itemID', 'rating', 'SIDO'],
-                'user_data': ['TRAVELER_ID', 'GENDER', 'AGE_GRP', 'TRAVEL_STATUS_DESTINATION',
-                              'TRAVEL_STATUS_ACCOMPANY', 'TRAVEL_COMPANIONS_NUM']
-            }
+            snapshot = SnapshotStore(settings.SNAPSHOT_DIR)
+            snapshot_version = snapshot.version_for(self.source_paths())
+            arrays = snapshot.load(snapshot_version) if settings.USE_SNAPSHOT else None
 
-            # 여행 동기 컬럼 추가
-            required_columns['user_data'].extend([f'TRAVEL_MOTIVE_{i}' for i in range(1, 4)])
-            # 여행 스타일 컬럼 추가
-            required_columns['user_data'].extend([f'TRAVEL_STYL_{i}' for i in range(1, 9)])
-
-            # 컬럼 존재 확인
-            missing_visit_columns = [col for col in required_columns['visit_data'] if col not in self.df.columns]
-            missing_user_columns = [col for col in required_columns['user_data'] if col not in self.user_data.columns]
+            if arrays is not None:
+                logger.info(f"Loading snapshot {snapshot_version}...")
+                self._report_progress('loading_snapshot')
+                self._load_arrays(arrays)
+                self._df = None
+                self._user_data = None
+                source = 'snapshot'
+            else:
+                self._load_csv()
+                # 목적지(SIDO)별 방문 사용자 목록
+                self._report_progress('building_destination_postings')
+                self._set_destination_postings(self._build_destination_postings())
+                source = 'csv'
+                if settings.USE_SNAPSHOT:
+                    logger.info(f"Writing snapshot {snapshot_version}...")
+                    self._report_progress('writing_snapshot')
+                    snapshot.save(
+                        snapshot_version,
+                        self._snapshot_arrays(),
+                        metadata={'visit_records': len(self.visit_index), 'user_records': self.user_count}
+                    )
 
-            if missing_visit_columns:
-                raise ValueError(f"Missing required columns in visit data: {missing_visit_columns}")
-            if missing_user_columns:
-                raise ValueError(f"Missing required columns in user data: {missing_user_columns}")
+            # 데이터가 바뀌었으므로 캐시된 결과 무효화
+            self.data_version = snapshot_version
+            self.source_version = snapshot_version
+            self.cache.clear()
+            metrics.record_data(self.data_version, self.user_count, len(self.visit_index), source)
 
-            logger.info(f"Loaded {len(self.df)} visit records and {len(self.user_data)} user records")
+            elapsed = time.perf_counter() - start_time
+            logger.info(
+                f"Loaded {len(self.visit_index)} visit records and {self.user_count} user records "
+                f"from {source} in {elapsed:.3f}s (RSS {get_rss_bytes() / (1024 * 1024):.1f} MB)"
+            )
 
         except Exception as e:
             logger.error(f"Error loading resources: {str(e)}")
             raise
 
+    def _report_progress(self, step: str):
+        if self._progress is not None:
+            self._progress(step)
+
+    @property
+    def user_count(self) -> int:
+        return len(self.user_features['user_ids'])
+
+    @property
+    def user_index(self) -> pd.Index:
+        """사용자 ID -> 사용자 배열 행 번호 조회용 인덱스 (사용자 배열이 바뀔 때만 새로 생성)"""
+        if self._user_index is None:
+            self._user_index = pd.Index(self.user_features['user_ids'])
+        return self._user_index
+
+    def _load_csv(self):
+        """CSV 원본을 읽어 인덱스와 사용자 배열 생성"""
+        # 방문 데이터 로드
+        logger.info("Loading preprocessed visit data...")
+        self._report_progress('reading_visit_data')
+        self._df = pd.read_csv(settings.PREPROCESSED_PATH)
+
+        # 사용자 마스터 데이터 로드
+        logger.info("Loading user data...")
+        self._report_progress('reading_user_data')
+        self._user_data = pd.read_csv(settings.USER_DATA_PATH)
+
+        # 필요한 컬럼 확인
+        self._check_columns(self._df, self.VISIT_COLUMNS, 'visit data')
+        self._check_columns(self._user_data, self.USER_COLUMNS, 'user data')
+
+        # 사용자별 방문 인덱스 생성
+        logger.info("Building visit index...")
+        self._report_progress('building_visit_index')
+        self.visit_index = VisitIndex.from_dataframe(self._df)
+
+        # 유사도 계산용 사용자 배열 인코딩
+        logger.info("Encoding user features...")
+        self._report_progress('encoding_user_features')
+        self.user_features = UserSimilarityCalculator.encode_users(self._user_data)
+        self._user_index = None
+
+    @staticmethod
+    def _check_columns(df: pd.DataFrame, columns: List[str], name: str):
+        missing_columns = [col for col in columns if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"Missing required columns in {name}: {missing_columns}")
+
+    def _snapshot_arrays(self) -> Dict[str, np.ndarray]:
+        """스냅샷으로 저장할 배열 (visit.* / user.*)"""
+        arrays = {}
+        for name, array in self.visit_index.to_arrays().items():
+            arrays[f'visit.{name}'] = array
+        for name, array in UserSimilarityCalculator.features_to_arrays(self.user_features).items():
+            arrays[f'user.{name}'] = array
+        for name, array in self.destination_postings.items():
+            arrays[f'postings.{name}'] = array
+        return arrays
+
+    def _load_arrays(self, arrays: Dict[str, np.ndarray]):
+        """스냅샷 배열로 인덱스와 사용자 배열 복원"""
+        groups = defaultdict(dict)
+        for name, array in arrays.items():
+            group, key = name.split('.', 1)
+            groups[group][key] = array
+        self.visit_index = VisitIndex.from_arrays(groups['visit'])
+        self.user_features = UserSimilarityCalculator.features_from_arrays(groups['user'])
+        self._user_index = None
+        self._set_destination_postings(groups['postings'])
+
+    def _build_destination_postings(self) -> Dict[str, np.ndarray]:
+        """
+        SIDO -> 해당 SIDO 방문 기록이 있는 사용자 행 번호(오름차순) CSR 배열 생성
+        행 번호는 user_data(사용자 마스터) 기준
+        """
+        index = self.visit_index
+
+        # 방문 인덱스의 사용자 코드 -> 사용자 마스터 행 번호 (없으면 -1)
+        visit_user_rows = self.user_index.get_indexer(index.user_ids)
+        visit_rows = np.repeat(visit_user_rows, np.diff(index.offsets))
+
+        # (SIDO, 행 번호) 쌍 중복 제거 후 SIDO별로 모음
+        valid = (visit_rows >= 0) & (index.sido_codes >= 0)
+        n_rows = max(self.user_count, 1)
+        pairs = np.unique(index.sido_codes[valid] * n_rows + visit_rows[valid])
+        sido_codes, rows = np.divmod(pairs, n_rows)
+        offsets = np.zeros(len(index.sido_names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sido_codes, minlength=len(index.sido_names)), out=offsets[1:])
+        return {'offsets': offsets, 'rows': rows}
+
+    def _set_destination_postings(self, postings: Dict[str, np.ndarray]):
+        """CSR 배열에서 SIDO별 사용자 행 번호 목록(배열 뷰) 구성"""
+        self.destination_postings = postings
+        offsets = postings['offsets']
+        self.destination_user_rows = {
+            str(sido): postings['rows'][offsets[code]:offsets[code + 1]]
+            for code, sido in enumerate(self.visit_index.sido_names)
+        }
+        metrics.set_known_destinations(self.destination_user_rows)
+
+    def _merge_destination_postings(
+            self,
+            postings: Dict[str, np.ndarray],
+            visit_user_ids: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        visit_user_ids 사용자들의 방문 기록에서 (SIDO, 사용자 행 번호) 쌍을 모아 기존 SIDO 포스팅 리스트(postings)에 병합
+        새 쌍은 추가된 방문의 사용자와 새로 추가된 사용자 것만 모으지만, 병합 결과는 기존 쌍 전체를 복사한
+        새 배열이므로 비용은 전체 포스팅 크기에 비례
+        방문 인덱스와 사용자 행 번호는 이미 추가분이 병합된 현재 인스턴스 기준
+        """
+        visit_index = self.visit_index
+        n_rows = max(self.user_count, 1)
+
+        # 기존 쌍 (SIDO 순, SIDO 내 행 번호 순으로 정렬되어 있음)
+        previous_sidos = np.repeat(np.arange(len(postings['offsets']) - 1), np.diff(postings['offsets']))
+        previous_keys = previous_sidos * n_rows + postings['rows']
+
+        # 추가된 쌍: 해당 사용자들의 방문 구간 전체
+        starts, ends = visit_index.get_user_ranges(visit_user_ids)
+        lengths = ends - starts
+        positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+        user_rows = self.user_index.get_indexer(visit_user_ids)
+        rows = np.repeat(user_rows, lengths)
+        sido_codes = visit_index.sido_codes[positions]
+        valid = (rows >= 0) & (sido_codes >= 0)
+        keys = np.unique(sido_codes[valid] * n_rows + rows[valid])
+        positions = np.searchsorted(previous_keys, keys)
+        exists = positions < len(previous_keys)
+        exists[exists] = previous_keys[positions[exists]] == keys[exists]
+
+        merged = np.insert(previous_keys, positions[~exists], keys[~exists])
+        merged_sidos, merged_rows = np.divmod(merged, n_rows)
+        offsets = np.zeros(len(visit_index.sido_names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(merged_sidos, minlength=len(visit_index.sido_names)), out=offsets[1:])
+        return {'offsets': offsets, 'rows': merged_rows}
+
+    @classmethod
+    def ingest(
+            cls,
+            visits: Optional[pd.DataFrame] = None,
+            travellers: Optional[pd.DataFrame] = None,
+            persist: bool = True,
+            background_snapshot: bool = True
+    ) -> Dict:
+        """
+        추가 데이터를 현재 싱글톤에 반영
+        merge_delta로 병합한 새 인스턴스를 만든 뒤 reload()처럼 싱글톤을 한 번에 교체
+        교체 전에 시작된 요청은 기존 인스턴스(이전 데이터 버전)로 끝까지 처리되며, 재로드와 동시에 실행되지 않음
+        """
+        with cls._reload_lock:
+            merged, stats = cls.get_instance().merge_delta(visits, travellers, persist, background_snapshot)
+            cls._instance = merged
+            return stats
+
+    @classmethod
+    def ingest_files(
+            cls,
+            visit_path: Optional[str] = None,
+            travel_path: Optional[str] = None,
+            traveller_path: Optional[str] = None,
+            persist: bool = True,
+            background_snapshot: bool = True
+    ) -> Dict:
+        """원본 형식의 추가분 파일을 현재 싱글톤에 반영 (ingest와 같은 방식으로 교체)"""
+        with cls._reload_lock:
+            current = cls.get_instance()
+            visits, travellers = current.read_delta_files(visit_path, travel_path, traveller_path)
+            merged, stats = current.merge_delta(visits, travellers, persist, background_snapshot)
+            cls._instance = merged
+            return stats
+
+    def read_delta_files(
+            self,
+            visit_path: Optional[str] = None,
+            travel_path: Optional[str] = None,
+            traveller_path: Optional[str] = None
+    ) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+        """
+        원본 형식의 추가분 파일 읽기 (방문 추가분, 사용자 마스터 추가분)
+        방문지 추가분은 같은 배치의 여행/여행자 파일과 함께 전처리 (VisitPreprocessor.transform_delta)
+        """
+        visits = None
+        if visit_path:
+            if not (travel_path and traveller_path):
+                raise ValueError("Visit deltas need the travel and traveller files of the same batch")
+            visits = VisitPreprocessor().transform_delta(
+                visit_path, travel_path, traveller_path,
+                known_items=self.visit_index.item_names.tolist()
+            )
+        travellers = pd.read_csv(traveller_path) if traveller_path else None
+        return visits, travellers
+
+    def merge_delta(
+            self,
+            visits: Optional[pd.DataFrame] = None,
+            travellers: Optional[pd.DataFrame] = None,
+            persist: bool = True,
+            background_snapshot: bool = True
+    ) -> Tuple['RecommendationService', Dict]:
+        """
+        추가 데이터를 병합한 새 인스턴스와 병합 통계 반환 (현재 인스턴스는 변경하지 않음)
+        - visits: 전처리된 방문 데이터 추가분 (userID, itemID, rating, SIDO 필수,
+          나머지 전처리 컬럼이 있으면 원본 CSV에 함께 기록)
+        - travellers: 사용자 마스터 추가분 (이미 있는 TRAVELER_ID는 건너뜀)
+        persist이면 추가분을 원본 CSV 뒤에 붙이고, 새 원본 버전의 스냅샷을 저장
+        (background_snapshot이면 백그라운드 스레드에서 저장)
+        CSV 재처리와 기존 사용자 재인코딩은 하지 않지만, 병합된 배열은 새로 만들어지므로
+        (방문 인덱스, 사용자 배열, 포스팅 리스트 복사) 비용은 전체 데이터 크기에 비례
+        """
+        start_time = time.perf_counter()
+        visits = visits if visits is not None else pd.DataFrame(columns=self.VISIT_COLUMNS)
+        travellers = travellers if travellers is not None else pd.DataFrame(columns=self.USER_COLUMNS)
+        self._check_columns(visits, self.VISIT_COLUMNS, 'visit data')
+        self._check_columns(travellers, self.USER_COLUMNS, 'user data')
+        # 원본 CSV에는 전처리 컬럼 전체를 기록하고, 메모리 병합에는 필요한 컬럼만 사용
+        visit_rows = visits
+        visits = visits[self.VISIT_COLUMNS]
+
+        # 이미 있는 사용자와 추가분 내 중복은 건너뜀
+        known = self.user_index.get_indexer(travellers['TRAVELER_ID'].astype(str)) >= 0
+        duplicated = travellers['TRAVELER_ID'].duplicated().to_numpy()
+        skipped_travellers = int((known | duplicated).sum())
+        travellers = travellers[~(known | duplicated)]
+
+        merged = copy.copy(self)
+        merged.cache = RecommendationCache(
+            max_size=settings.CACHE_MAX_SIZE,
+            ttl_seconds=settings.CACHE_TTL_SECONDS
+        )
+        if len(travellers):
+            new_features = UserSimilarityCalculator.encode_users(travellers)
+            merged.user_features = UserSimilarityCalculator.append_users(self.user_features, new_features)
+            merged._user_index = self.user_index.append(pd.Index(new_features['user_ids']))
+        if len(visits):
+            merged.visit_index = self.visit_index.append(visits)
+
+        # 추가된 방문의 사용자와 새 사용자의 (SIDO, 행 번호) 쌍만 기존 포스팅 리스트에 병합
+        changed_users = pd.unique(np.concatenate([
+            visits['userID'].to_numpy(dtype=str),
+            travellers['TRAVELER_ID'].to_numpy(dtype=str)
+        ]))
+        merged._set_destination_postings(merged._merge_destination_postings(self.destination_postings, changed_users))
+
+        if persist:
+            self._append_csv(settings.PREPROCESSED_PATH, visit_rows)
+            self._append_csv(settings.USER_DATA_PATH, travellers)
+            merged._df = None
+            merged._user_data = None
+            merged.source_version = SnapshotStore(settings.SNAPSHOT_DIR).version_for(self.source_paths())
+            merged.data_version = merged.source_version
+            if settings.USE_SNAPSHOT:
+                self._save_snapshot_async(merged.data_version, merged._snapshot_arrays(), background_snapshot)
+        else:
+            # 원본 파일은 그대로이므로 source_version은 유지 (원본 변경 감시가 병합분을 버리지 않도록)
+            if self._df is not None:
+                merged._df = pd.concat([self._df, visit_rows], ignore_index=True)
+            if self._user_data is not None:
+                merged._user_data = pd.concat([self._user_data, travellers], ignore_index=True)
+            merged._ingest_count = self._ingest_count + 1
+            merged.data_version = f'{self.source_version}+{merged._ingest_count}'
+
+        metrics.record_data(merged.data_version, merged.user_count, len(merged.visit_index), 'ingest')
+        stats = {
+            'visits': len(visits),
+            'travellers': len(travellers),
+            'skipped_travellers': skipped_travellers,
+            'visit_records': len(merged.visit_index),
+            'user_records': merged.user_count,
+            'data_version': merged.data_version,
+            'seconds': time.perf_counter() - start_time
+        }
+        logger.info(f"Ingested delta: {stats}")
+        return merged, stats
+
+    @staticmethod
+    def _append_csv(path: str, df: pd.DataFrame):
+        """원본 CSV 뒤에 행 추가 (컬럼 순서는 파일 헤더 기준)"""
+        if len(df) == 0:
+            return
+        columns = pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns
+        with open(path, 'rb+') as f:
+            # 마지막 줄이 개행으로 끝나지 않으면 추가
+            f.seek(0, 2)
+            if f.tell() > 0:
+                f.seek(-1, 2)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+        df.reindex(columns=columns).to_csv(path, mode='a', header=False, index=False)
+
+    @staticmethod
+    def _save_snapshot_async(version: str, arrays: Dict[str, np.ndarray], background: bool):
+        """병합된 배열을 새 버전 스냅샷으로 저장 (다음 시작/재로드 시 CSV 재처리 없이 사용)"""
+        def save():
+            try:
+                SnapshotStore(settings.SNAPSHOT_DIR).save(version, arrays)
+                logger.info(f"Saved snapshot {version} after ingest")
+            except Exception as e:
+                logger.error(f"Error saving snapshot {version}: {str(e)}")
+
+        if background:
+            threading.Thread(target=save, name='snapshot-save', daemon=True).start()
+        else:
+            save()
+
     def find_similar_users(
+            self,
+            request: TravelRequest,
+            n_similar: int = 10,
+            prune_by_destination: Optional[bool] = None
+    ) -> List[Tuple[str, float, Dict]]:
+        """
+        유사한 사용자 찾기
+        prune_by_destination이 참이면 목적지 방문 기록이 있는 사용자만 계산
+        (None이면 settings.PRUNE_BY_DESTINATION 사용)
+        """
+        return self.find_similar_users_batch([request], n_similar, prune_by_destination)[0]
+
+    def find_similar_users_batch(
+            self,
+            requests: List[TravelRequest],
+            n_similar: int = 10,
+            prune_by_destination: Optional[bool] = None,
+            chunk_size: Optional[int] = None
+    ) -> List[List[Tuple[str, float, Dict]]]:
+        """
+        여러 요청의 유사 사용자를 (요청 x 사용자) 행렬 연산으로 한 번에 찾기
+        결과는 요청 순서대로 find_similar_users와 동일
+        chunk_size(한 번에 계산할 요청 수)가 None이면 계산 대상 사용자 수와 settings.BATCH_MEMORY_BYTES로 정함
+        """
+        if prune_by_destination is None:
+            prune_by_destination = settings.PRUNE_BY_DESTINATION
+
+        # 계산 대상 사용자 집합별로 요청 묶기
+        groups = defaultdict(list)
+        for i, request in enumerate(requests):
+            groups[request.destination if prune_by_destination else None].append(i)
+
+        results = [None] * len(requests)
+        for destination, request_indices in groups.items():
+            features = self.user_features
+            if prune_by_destination:
+                candidate_rows = self.destination_user_rows.get(
+                    destination,
+                    np.empty(0, dtype=np.int64)
+                )
+                features = UserSimilarityCalculator.select_users(features, candidate_rows)
+            user_ids = features['user_ids']
+
+            # 행렬 크기를 제한하기 위해 요청을 나누어 계산
+            group_chunk_size = chunk_size or self._similarity_chunk_size(len(user_ids))
+            for start in range(0, len(request_indices), group_chunk_size):
+                chunk = request_indices[start:start + group_chunk_size]
+                chunk_destinations = [requests[i].destination for i in chunk]
+                stage_start = time.perf_counter()
+                scores = UserSimilarityCalculator.calculate_similarity_matrix(
+                    [requests[i].dict() for i in chunk],
+                    features
+                )
+                metrics.observe_stage('scoring', chunk_destinations, time.perf_counter() - stage_start)
+                metrics.count_by_destination(
+                    metrics.CANDIDATE_USERS, chunk_destinations, [len(user_ids)] * len(chunk)
+                )
+
+                stage_start = time.perf_counter()
+                for row, request_index in enumerate(chunk):
+                    final_scores = scores['final'][row]
+
+                    # 상위 n_similar명만 부분 선택
+                    top_indices = self._select_top_k(final_scores, n_similar)
+
+                    # 상세 점수는 선택된 사용자에 대해서만 생성
+                    similarities = []
+                    for i in top_indices:
+                        detailed_scores = {key: round(float(values[row, i]), 3) for key, values in scores.items()}
+                        similarities.append((
+                            user_ids[i],
+                            float(final_scores[i]),
+                            detailed_scores
+                        ))
+                    results[request_index] = similarities
+                metrics.observe_stage('top_k', chunk_destinations, time.perf_counter() - stage_start)
+
+        return results
+
+    @classmethod
+    def _similarity_chunk_size(cls, n_users: int) -> int:
+        """유사도 행렬이 settings.BATCH_MEMORY_BYTES 안에 들어가는 요청 수 (최소 1)"""
+        return max(1, settings.BATCH_MEMORY_BYTES // (max(n_users, 1) * cls.SIMILARITY_BYTES_PER_CELL))
+
+    @staticmethod
+    def _select_top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        점수 상위 k개의 인덱스를 내림차순으로 반환
+        전체 정렬 대신 부분 선택을 사용하며, 동점은 앞선 인덱스를 우선 (안정 정렬과 동일)
+        """
+        n = len(scores)
+        if k <= 0 or n == 0:
+            return np.empty(0, dtype=np.int64)
+        if k >= n:
+            return np.argsort(-scores, kind='stable')
+
+        # k번째로 큰 값 이상인 후보만 정렬
+        threshold = np.partition(scores, n - k)[n - k]
+        candidates = np.flatnonzero(scores >= threshold)
+        order = np.lexsort((candidates, -scores[candidates]))
+        return candidates[order[:k]]
+
+    def _find_similar_users_scalar(
             self,
             request: TravelRequest,
             n_similar: int = 10
     ) -> List[Tuple[str, float, Dict]]:
-        """유사한 사용자 찾기"""
+        """유사한 사용자 찾기 (사용자별 스칼라 계산, 검증용 기준 구현)"""
         similarities = []
 
         request_dict = request.dict()
@@ -91,48 +598,100 @@ class RecommendationService:
             n_recommendations: int = 5
     ) -> List[Dict]:
         """장소 추천 생성"""
-        place_scores = defaultdict(float)
-        place_counts = defaultdict(int)
-        place_max_similarity = defaultdict(float)
-        place_similarity_scores = defaultdict(lambda: None)
-
-        for user_id, similarity, detailed_scores in similar_users:
-            user_visits = self.df[self.df['userID'] == user_id]
-
-            for _, visit in user_visits.iterrows():
-                place_id = visit['itemID']
-
-                # 목적지가 일치하는 경우만 추천
-                if visit['SIDO'] != destination:
-                    continue
-
-                rating = visit['rating']
-                place_scores[place_id] += rating * similarity
-                place_counts[place_id] += 1
-
-                if similarity > place_max_similarity[place_id]:
-                    place_max_similarity[place_id] = similarity
-                    place_similarity_scores[place_id] = detailed_scores
-
-        # 추천 목록 생성
-        recommendations = []
-        for place_id in place_scores:
-            if place_counts[place_id] > 0:
-                avg_score = place_scores[place_id] / place_counts[place_id]
-
-                recommendations.append({
-                    'item_id': place_id,
-                    'sido': destination,
-                    'predicted_rating': float(avg_score),
-                    'confidence_score': float(avg_score * place_max_similarity[place_id]),
-                    'similarity_scores': SimilarityScores(
-                        **place_similarity_scores[place_id]
-                    )
-                })
+        return self.get_place_recommendations_batch([similar_users], [destination], n_recommendations)[0]
+
+    def get_place_recommendations_batch(
+            self,
+            similar_users_list: List[List[Tuple[str, float, Dict]]],
+            destinations: List[str],
+            n_recommendations: int = 5
+    ) -> List[List[Dict]]:
+        """
+        여러 요청의 장소 추천을 방문 인덱스 한 번의 패스로 생성
+        결과는 요청 순서대로 get_place_recommendations와 동일
+        """
+        index = self.visit_index
+        results = [[] for _ in similar_users_list]
+        stage_start = time.perf_counter()
+
+        # 모든 요청의 유사 사용자 방문 구간을 하나의 스트림으로 모음 (요청 -> 사용자 -> 방문 순)
+        range_user_ids = []
+        range_requests = []
+        range_users = []
+        range_similarities = []
+        for request_index, similar_users in enumerate(similar_users_list):
+            for user_index, (user_id, similarity, _) in enumerate(similar_users):
+                range_user_ids.append(user_id)
+                range_requests.append(request_index)
+                range_users.append(user_index)
+                range_similarities.append(similarity)
+        if not range_user_ids:
+            return results
+
+        starts, ends = index.get_user_ranges(range_user_ids)
+        lengths = ends - starts
+        range_offsets = np.cumsum(lengths) - lengths
+        positions = np.repeat(starts - range_offsets, lengths) + np.arange(lengths.sum())
+        visit_requests = np.repeat(np.array(range_requests, dtype=np.int64), lengths)
+        visit_users = np.repeat(np.array(range_users, dtype=np.int64), lengths)
+        visit_similarities = np.repeat(np.array(range_similarities, dtype=np.float64), lengths)
+
+        # 요청별 목적지와 일치하는 방문만 사용
+        destination_codes = np.array(
+            [index.sido_index.get(destination, -2) for destination in destinations],
+            dtype=np.int64
+        )
+        in_destination = index.sido_codes[positions] == destination_codes[visit_requests]
+        positions = positions[in_destination]
+        visit_requests = visit_requests[in_destination]
+        visit_users = visit_users[in_destination]
+        visit_similarities = visit_similarities[in_destination]
+        metrics.count_by_destination(
+            metrics.VISITS_AGGREGATED, destinations, np.bincount(visit_requests, minlength=len(destinations))
+        )
+        if len(positions) == 0:
+            metrics.observe_stage('aggregation', destinations, time.perf_counter() - stage_start)
+            return results
+
+        # (요청, 장소) 단위로 유사도 가중 평점 집계
+        keys = visit_requests * index.n_items + index.item_codes[positions]
+        place_keys, first_seen, groups = np.unique(keys, return_index=True, return_inverse=True)
+        groups = groups.reshape(-1)
+        place_scores = np.bincount(groups, weights=index.ratings[positions] * visit_similarities)
+        place_counts = np.bincount(groups)
+        place_max_similarity = np.zeros(len(place_keys))
+        np.maximum.at(place_max_similarity, groups, visit_similarities)
+
+        # 장소별 최고 유사도를 처음 기록한 사용자의 상세 점수 사용
+        best_visits = np.flatnonzero(visit_similarities == place_max_similarity[groups])
+        best_groups, first_best = np.unique(groups[best_visits], return_index=True)
+        place_best_user = np.zeros(len(place_keys), dtype=np.int64)
+        place_best_user[best_groups] = visit_users[best_visits[first_best]]
 
-        # 점수순 정렬
-        recommendations.sort(key=lambda x: x['confidence_score'], reverse=True)
-        return recommendations[:n_recommendations]
+        avg_scores = place_scores / place_counts
+        confidence_scores = avg_scores * place_max_similarity
+
+        # 요청별로 처음 등장한 순서를 유지한 채 점수순 정렬 (안정 정렬) 후 상위 n개 장소만 결과 생성
+        # 상세 점수는 유사 사용자별 float 튜플 하나를 공유 (SIMILARITY_SCORE_FIELDS 순서, 응답 직렬화 때 객체로 변환)
+        score_tuples = [
+            [tuple(detailed_scores[field] for field in SIMILARITY_SCORE_FIELDS) for _, _, detailed_scores in users]
+            for users in similar_users_list
+        ]
+        group_requests = place_keys // index.n_items
+        order = np.lexsort((first_seen, -confidence_scores, group_requests))
+        request_starts = np.searchsorted(group_requests[order], np.arange(len(similar_users_list)))
+        rank = np.arange(len(order)) - request_starts[group_requests[order]]
+        for group in order[rank < n_recommendations].tolist():
+            request_index, place_id = divmod(int(place_keys[group]), index.n_items)
+            results[request_index].append({
+                'item_id': str(index.item_names[place_id]),
+                'sido': destinations[request_index],
+                'predicted_rating': float(avg_scores[group]),
+                'confidence_score': float(confidence_scores[group]),
+                'similarity_scores': score_tuples[request_index][place_best_user[group]]
+            })
+        metrics.observe_stage('aggregation', destinations, time.perf_counter() - stage_start)
+        return results
 
     def get_recommendations(
             self,
@@ -140,21 +699,58 @@ class RecommendationService:
             n_recommendations: int = 5
     ) -> Dict:
         """추천 생성 메인 함수"""
+        return self.get_recommendations_batch([request], n_recommendations)[0]
+
+    def get_recommendations_batch(
+            self,
+            requests: List[TravelRequest],
+            n_recommendations: int = 5
+    ) -> List[Dict]:
+        """여러 요청의 추천을 한 번에 생성 (요청 순서대로 get_recommendations와 동일한 결과)"""
         try:
-            # 유사 사용자 찾기
-            similar_users = self.find_similar_users(request)
-
-            # 장소 추천 생성
-            recommendations = self.get_place_recommendations(
-                similar_users,
-                request.destination,
-                n_recommendations
-            )
+            results = [None] * len(requests)
+            cache_keys = []
+            pending = []
+
+            # 캐시 조회
+            for i, request in enumerate(requests):
+                cache_key = RecommendationCache.make_key(
+                    request,
+                    n_recommendations=n_recommendations,
+                    prune_by_destination=settings.PRUNE_BY_DESTINATION,
+                    data_version=self.data_version
+                )
+                cache_keys.append(cache_key)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    results[i] = dict(cached)
+                else:
+                    pending.append(i)
+            metrics.count_cache_lookups(len(requests) - len(pending), len(pending))
+
+            if pending:
+                pending_requests = [requests[i] for i in pending]
+
+                # 유사 사용자 찾기
+                similar_users_list = self.find_similar_users_batch(pending_requests)
+
+                # 장소 추천 생성
+                recommendations_list = self.get_place_recommendations_batch(
+                    similar_users_list,
+                    [request.destination for request in pending_requests],
+                    n_recommendations
+                )
+
+                for i, similar_users, recommendations in zip(pending, similar_users_list, recommendations_list):
+                    result = {
+                        "recommendations": recommendations,
+                        "similar_users_count": len(similar_users),
+                        "data_version": self.data_version
+                    }
+                    self.cache.set(cache_keys[i], result)
+                    results[i] = dict(result)
 
-            return {
-                "recommendations": recommendations,
-                "similar_users_count": len(similar_users)
-            }
+            return results
 
         except Exception as e:
             logger.error(f"Error generating recommendations: {str(e)}")
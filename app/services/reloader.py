@@ -0,0 +1,117 @@
+from typing import Dict, Optional
+from datetime import datetime
+import functools
+import logging
+import threading
+
+from .recommender import RecommendationService
+from .executor import RecommendationExecutor, recommendation_executor
+
+logger = logging.getLogger(__name__)
+
+
+class DataReloader:
+    """
+    백그라운드 데이터 재로드 관리
+    - trigger(): 관리자 요청으로 재로드 시작 (이미 진행 중이면 무시)
+    - trigger_ingest(): 추가분 파일 병합 시작 (재로드와 동시에 실행되지 않음)
+    - start_watching(): 원본 파일 변경을 주기적으로 확인하여 자동 재로드
+    """
+
+    def __init__(self, executor: RecommendationExecutor):
+        self.executor = executor
+        self.status = 'idle'
+        self.last_error: Optional[str] = None
+        self.last_reload_at: Optional[str] = None
+        self.last_ingest: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def trigger(self) -> bool:
+        """재로드를 백그라운드 스레드에서 시작 (이미 진행 중이면 False)"""
+        return self._start(self._reload, 'data-reload')
+
+    def trigger_ingest(
+            self,
+            visit_path: Optional[str] = None,
+            travel_path: Optional[str] = None,
+            traveller_path: Optional[str] = None
+    ) -> bool:
+        """추가분 병합을 백그라운드 스레드에서 시작 (재로드/병합이 진행 중이면 False)"""
+        return self._start(
+            functools.partial(self._ingest, visit_path, travel_path, traveller_path),
+            'data-ingest'
+        )
+
+    def _start(self, target, name: str) -> bool:
+        with self._lock:
+            if self.status == 'running':
+                return False
+            self.status = 'running'
+            self._thread = threading.Thread(target=target, name=name, daemon=True)
+            self._thread.start()
+            return True
+
+    def _reload(self):
+        try:
+            logger.info("Reloading recommendation data in background...")
+            self.executor.reload_data()
+            self.last_error = None
+            self.last_reload_at = datetime.now().isoformat()
+            self.status = 'idle'
+            logger.info(f"Reload completed (data version {self.executor.data_version})")
+        except Exception as e:
+            # 실패하면 기존 데이터로 계속 서비스
+            self.last_error = str(e)
+            self.status = 'failed'
+            logger.error(f"Error reloading data: {str(e)}")
+
+    def _ingest(self, visit_path: Optional[str], travel_path: Optional[str], traveller_path: Optional[str]):
+        try:
+            logger.info("Ingesting data delta in background...")
+            stats = self.executor.ingest_files(visit_path, travel_path, traveller_path)
+            self.last_error = None
+            self.last_ingest = {**stats, 'completed_at': datetime.now().isoformat()}
+            self.status = 'idle'
+        except Exception as e:
+            # 실패하면 기존 데이터로 계속 서비스
+            self.last_error = str(e)
+            self.status = 'failed'
+            logger.error(f"Error ingesting data delta: {str(e)}")
+
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                if self.status != 'running' and \
+                        RecommendationService.current_source_version() != self.executor.source_version:
+                    logger.info("Source data changed, triggering reload")
+                    self.trigger()
+            except Exception as e:
+                logger.warning(f"Error checking source data: {str(e)}")
+
+    def start_watching(self, interval: float):
+        """원본 파일 변경 감시 시작"""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name='data-watch', daemon=True)
+        self._watcher.start()
+        logger.info(f"Watching source data for changes every {interval}s")
+
+    def stop(self):
+        self._stop.set()
+        self._watcher = None
+
+    def state(self) -> Dict:
+        return {
+            'status': self.status,
+            'data_version': self.executor.data_version,
+            'last_reload_at': self.last_reload_at,
+            'last_ingest': self.last_ingest,
+            'last_error': self.last_error
+        }
+
+
+data_reloader = DataReloader(recommendation_executor)
\ No newline at end of file
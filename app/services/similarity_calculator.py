@@ -1,6 +1,12 @@
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 바이트별 1비트 개수 (np.bitwise_count가 없는 numpy 버전용)
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
 
 
 class UserSimilarityCalculator:
@@ -15,6 +21,29 @@ class UserSimilarityCalculator:
         "3대 동반 여행(친척 포함)": 3
     }
 
+    # 요소별 가중치
+    WEIGHTS = {
+        'age': 0.15,  # 연령대
+        'people': 0.15,  # 인원수/동반유형
+        'destination': 0.2,  # 목적지
+        'purpose': 0.25,  # 여행 목적
+        'style': 0.25  # 여행 스타일
+    }
+
+    MOTIVE_COLUMNS = [f'TRAVEL_MOTIVE_{i}' for i in range(1, 4)]
+    STYLE_COLUMNS = [f'TRAVEL_STYL_{i}' for i in range(1, 9)]
+
+    # 비트마스크로 표현 가능한 최대 코드 값 (uint64)
+    MAX_MASK_CODE = 63
+
+    @staticmethod
+    def parse_age_group(user_age) -> int:
+        """
+        연령대 값을 정수로 변환 (예: "20대" -> 20)
+        변환할 수 없으면 ValueError/AttributeError 발생
+        """
+        return int(user_age.replace('대', ''))
+
     @staticmethod
     def calculate_age_similarity(request_ages: List[int], user_age: str) -> float:
         """
@@ -23,7 +52,7 @@ class UserSimilarityCalculator:
             request_ages=[20, 30], user_age="40" -> 0.0
         """
         try:
-            user_age_num = int(user_age.replace('대', ''))
+            user_age_num = UserSimilarityCalculator.parse_age_group(user_age)
             if user_age_num in request_ages:
                 return 1.0
             # 인접 연령대는 부분 점수 부여
@@ -130,8 +159,8 @@ class UserSimilarityCalculator:
 
         # 4. 여행 목적 유사도
         user_motives = [
-            user_data.get(f'TRAVEL_MOTIVE_{i}')
-            for i in range(1, 4)
+            user_data.get(col)
+            for col in UserSimilarityCalculator.MOTIVE_COLUMNS
         ]
         similarities['purpose'] = UserSimilarityCalculator.calculate_purpose_similarity(
             request['purpose'],
@@ -140,8 +169,8 @@ class UserSimilarityCalculator:
 
         # 5. 여행 스타일 유사도
         user_styles = [
-            user_data.get(f'TRAVEL_STYL_{i}')
-            for i in range(1, 9)
+            user_data.get(col)
+            for col in UserSimilarityCalculator.STYLE_COLUMNS
         ]
         similarities['style'] = UserSimilarityCalculator.calculate_travel_style_similarity(
             request['environment'],
@@ -150,13 +179,7 @@ class UserSimilarityCalculator:
         )
 
         # 가중치 적용
-        weights = {
-            'age': 0.15,  # 연령대
-            'people': 0.15,  # 인원수/동반유형
-            'destination': 0.2,  # 목적지
-            'purpose': 0.25,  # 여행 목적
-            'style': 0.25  # 여행 스타일
-        }
+        weights = UserSimilarityCalculator.WEIGHTS
 
         final_similarity = sum(
             similarities[key] * weights[key]
@@ -170,4 +193,259 @@ class UserSimilarityCalculator:
         }
         detailed_scores['final'] = round(final_similarity, 3)
 
-        return final_similarity, detailed_scores
\ No newline at end of file
+        return final_similarity, detailed_scores
+
+    @staticmethod
+    def codes_to_mask(codes: List[int]) -> int:
+        """
+        코드 목록을 비트마스크로 변환 (코드 c -> 비트 c)
+        마스크 범위를 벗어난 코드는 제외 (사용자 마스크에서도 제외되므로 일치하지 않는 코드로 처리)
+        """
+        mask = 0
+        for code in codes:
+            if 0 <= code <= UserSimilarityCalculator.MAX_MASK_CODE:
+                mask |= 1 << code
+        return mask
+
+    @staticmethod
+    def _popcount(masks: np.ndarray) -> np.ndarray:
+        """비트마스크 배열의 1비트 개수"""
+        if hasattr(np, 'bitwise_count'):
+            return np.bitwise_count(masks).astype(np.int64)
+        as_bytes = np.ascontiguousarray(masks).reshape(-1, 1).view(np.uint8)
+        return _BYTE_POPCOUNT[as_bytes].sum(axis=1).astype(np.int64).reshape(masks.shape)
+
+    @staticmethod
+    def _encode_code_columns(user_data: pd.DataFrame, columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        코드 컬럼(여행 동기/스타일)을 사용자별 비트마스크와 유효 코드 개수로 변환
+        결측값은 제외
+        마스크 범위를 벗어난 코드는 경고를 남기고 마스크에서만 제외 (개수에는 포함)
+        범위 밖 요청 코드도 마스크에서 제외되므로, 범위 안의 요청 코드에 대해서는 스칼라 계산과 동일
+        """
+        max_code = UserSimilarityCalculator.MAX_MASK_CODE
+        values = user_data[columns].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        codes = np.where(valid, values, 0).astype(np.int64)
+
+        out_of_range = valid & ((codes < 0) | (codes > max_code))
+        if out_of_range.any():
+            logger.warning(
+                f"Ignoring codes outside 0..{max_code} in {columns} for "
+                f"{int(out_of_range.any(axis=1).sum())} users: {sorted(set(codes[out_of_range].tolist()))}"
+            )
+            codes = np.where(out_of_range, 0, codes)
+
+        bits = np.where(
+            valid & ~out_of_range,
+            np.left_shift(np.uint64(1), codes.astype(np.uint64)),
+            np.uint64(0)
+        )
+        masks = np.bitwise_or.reduce(bits, axis=1)
+        return masks, valid.sum(axis=1)
+
+    @staticmethod
+    def encode_users(user_data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        사용자 마스터 데이터를 유사도 계산용 배열로 한 번만 인코딩
+        calculate_user_similarity와 동일한 규칙으로 값을 해석
+        """
+        def parse_age(value):
+            try:
+                return UserSimilarityCalculator.parse_age_group(value)
+            except:
+                return -1
+
+        # 연령대 (해석 불가 시 -1)
+        ages = np.array([parse_age(v) for v in user_data['AGE_GRP']], dtype=np.int64)
+
+        # 동반 유형별 인원수
+        people = np.array(
+            [
+                UserSimilarityCalculator.ACCOMPANY_TYPE_MAPPING.get(v, 1)
+                for v in user_data['TRAVEL_STATUS_ACCOMPANY']
+            ],
+            dtype=np.int64
+        )
+
+        # 목적지 코드
+        destination_codes, destination_values = pd.factorize(user_data['TRAVEL_STATUS_DESTINATION'])
+        destination_index = {value: code for code, value in enumerate(destination_values)}
+
+        # 여행 동기/스타일 비트마스크
+        motive_masks, motive_counts = UserSimilarityCalculator._encode_code_columns(
+            user_data, UserSimilarityCalculator.MOTIVE_COLUMNS
+        )
+        style_masks, style_counts = UserSimilarityCalculator._encode_code_columns(
+            user_data, UserSimilarityCalculator.STYLE_COLUMNS
+        )
+
+        return {
+            'user_ids': user_data['TRAVELER_ID'].to_numpy(dtype=str),
+            'age': ages,
+            'age_valid': ages >= 0,
+            'people': people,
+            'destination': destination_codes.astype(np.int64),
+            'destination_index': destination_index,
+            'motive_mask': motive_masks,
+            'motive_counts': motive_counts,
+            'style_mask': style_masks,
+            'style_counts': style_counts,
+        }
+
+    @staticmethod
+    def append_users(encoded: Dict, new_encoded: Dict) -> Dict:
+        """
+        인코딩된 사용자 배열 뒤에 새로 인코딩한 사용자 추가 (기존 배열은 변경하지 않음)
+        새 목적지는 기존 사전 뒤에 코드를 붙이므로, 원본을 이어 붙여 encode_users한 결과와 동일
+        """
+        destination_index = dict(encoded['destination_index'])
+        # 새 배열의 목적지 코드 -> 합친 사전의 코드 (마지막 원소는 결측값 -1용)
+        remap = np.full(len(new_encoded['destination_index']) + 1, -1, dtype=np.int64)
+        for code, value in enumerate(new_encoded['destination_index']):
+            remap[code] = destination_index.setdefault(value, len(destination_index))
+
+        appended = {}
+        for key, value in encoded.items():
+            if not isinstance(value, np.ndarray):
+                continue
+            new_value = remap[new_encoded[key]] if key == 'destination' else new_encoded[key]
+            appended[key] = np.concatenate([value, new_value])
+        appended['destination_index'] = destination_index
+        return appended
+
+    @staticmethod
+    def features_to_arrays(encoded: Dict) -> Dict[str, np.ndarray]:
+        """스냅샷 저장용 배열 (목적지 사전은 코드 순서의 값 배열로 변환)"""
+        arrays = {key: value for key, value in encoded.items() if isinstance(value, np.ndarray)}
+        arrays['destination_values'] = np.asarray(list(encoded['destination_index']), dtype=str)
+        return arrays
+
+    @staticmethod
+    def features_from_arrays(arrays: Dict[str, np.ndarray]) -> Dict:
+        """features_to_arrays로 저장한 배열(mmap 포함)로 인코딩 복원"""
+        encoded = {key: value for key, value in arrays.items() if key != 'destination_values'}
+        encoded['destination_index'] = {
+            str(value): code for code, value in enumerate(arrays['destination_values'])
+        }
+        return encoded
+
+    @staticmethod
+    def select_users(encoded: Dict[str, np.ndarray], rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """인코딩된 사용자 배열 중 일부 행만 선택"""
+        return {
+            key: value[rows] if isinstance(value, np.ndarray) else value
+            for key, value in encoded.items()
+        }
+
+    @staticmethod
+    def encode_requests(requests: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        여러 요청을 배열로 인코딩 (요청당 한 번)
+        목록형 값(purpose/visit/environment)은 비트마스크로, 연령대는 -1로 채운 2차원 배열로 변환
+        """
+        n_requests = len(requests)
+        max_ages = max((len(request['age']) for request in requests), default=0)
+        ages = np.full((n_requests, max_ages), -1, dtype=np.int64)
+        age_valid = np.zeros((n_requests, max_ages), dtype=bool)
+        for i, request in enumerate(requests):
+            ages[i, :len(request['age'])] = request['age']
+            age_valid[i, :len(request['age'])] = True
+
+        def masks(key):
+            return np.array(
+                [UserSimilarityCalculator.codes_to_mask(request[key]) for request in requests],
+                dtype=np.uint64
+            )
+
+        return {
+            'age': ages,
+            'age_valid': age_valid,
+            'people': np.array([request['people'] for request in requests], dtype=np.int64),
+            'destination': [request['destination'] for request in requests],
+            'purpose_mask': masks('purpose'),
+            'purpose_len': np.array([len(request['purpose']) for request in requests], dtype=np.int64),
+            'visit_mask': masks('visit'),
+            'visit_len': np.array([len(request['visit']) for request in requests], dtype=np.int64),
+            'environment_mask': np.array(
+                [UserSimilarityCalculator.codes_to_mask([request['environment']]) for request in requests],
+                dtype=np.uint64
+            ),
+        }
+
+    @staticmethod
+    def calculate_batch_similarity(request: Dict, encoded: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        전체 사용자에 대한 유사도를 배열 연산으로 한 번에 계산
+        calculate_user_similarity와 동일한 점수를 반환 (반올림 전)
+        """
+        similarities = UserSimilarityCalculator.calculate_similarity_matrix([request], encoded)
+        return {key: values[0] for key, values in similarities.items()}
+
+    @staticmethod
+    def calculate_similarity_matrix(requests: List[Dict], encoded: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        (요청 수 x 사용자 수) 유사도 행렬 계산
+        각 행은 해당 요청에 대한 calculate_batch_similarity 결과와 같음
+        """
+        n_requests = len(requests)
+        n_users = len(encoded['age'])
+        encoded_requests = UserSimilarityCalculator.encode_requests(requests)
+        similarities = {}
+
+        # 1. 연령대 유사도 (사용자 연령대 값 종류별로 계산 후 펼침)
+        age_values, age_inverse = np.unique(encoded['age'], return_inverse=True)
+        exact = np.zeros((n_requests, len(age_values)), dtype=bool)
+        adjacent = np.zeros((n_requests, len(age_values)), dtype=bool)
+        for j in range(encoded_requests['age'].shape[1]):
+            request_ages = encoded_requests['age'][:, j:j + 1]
+            request_valid = encoded_requests['age_valid'][:, j:j + 1]
+            exact |= (age_values[None, :] == request_ages) & request_valid
+            adjacent |= (np.abs(age_values[None, :] - request_ages) == 10) & request_valid
+        age_table = np.where(exact, 1.0, np.where(adjacent, 0.5, 0.0))
+        age_table[:, age_values < 0] = 0.0
+        similarities['age'] = age_table[:, age_inverse.reshape(-1)]
+
+        # 2. 인원수/동반유형 유사도 (인원수 값 종류별로 계산 후 펼침)
+        people_values, people_inverse = np.unique(encoded['people'], return_inverse=True)
+        diff = np.abs(encoded_requests['people'][:, None] - people_values[None, :])
+        people_table = np.maximum(0, 1 - (diff * 0.25))
+        similarities['people'] = people_table[:, people_inverse.reshape(-1)]
+
+        # 3. 목적지 유사도
+        destination_codes = np.array(
+            [encoded['destination_index'].get(dest, -2) for dest in encoded_requests['destination']],
+            dtype=np.int64
+        )
+        similarities['destination'] = np.where(
+            encoded['destination'][None, :] == destination_codes[:, None], 1.0, 0.0
+        )
+
+        # 4. 여행 목적 유사도
+        motive_counts = encoded['motive_counts'][None, :]
+        common = UserSimilarityCalculator._popcount(
+            encoded['motive_mask'][None, :] & encoded_requests['purpose_mask'][:, None]
+        )
+        total = np.maximum(encoded_requests['purpose_len'][:, None], motive_counts)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            purpose_scores = common / total
+        similarities['purpose'] = np.where(motive_counts > 0, purpose_scores, 0.0)
+
+        # 5. 여행 스타일 유사도
+        style_masks = encoded['style_mask'][None, :]
+        env_scores = np.where((style_masks & encoded_requests['environment_mask'][:, None]) != 0, 1.0, 0.0)
+        visit_len = encoded_requests['visit_len'][:, None]
+        common_visits = UserSimilarityCalculator._popcount(style_masks & encoded_requests['visit_mask'][:, None])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            visit_scores = np.where(visit_len > 0, common_visits / visit_len, 0.0)
+        similarities['style'] = np.where(
+            encoded['style_counts'][None, :] > 0, 0.6 * env_scores + 0.4 * visit_scores, 0.0
+        )
+
+        # 가중치 적용 (스칼라 계산과 같은 순서로 합산)
+        final_similarity = np.zeros((n_requests, n_users))
+        for key, weight in UserSimilarityCalculator.WEIGHTS.items():
+            final_similarity = final_similarity + similarities[key] * weight
+        similarities['final'] = final_similarity
+
+        return similarities
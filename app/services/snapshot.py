@@ -0,0 +1,106 @@
+from typing import Dict, List, Optional
+import hashlib
+import json
+import logging
+import os
+import shutil
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """
+    인코딩된 데이터 배열의 바이너리 스냅샷 저장소
+    원본 파일 지문(크기, 수정 시각)으로 버전을 정하고, 버전별 디렉토리에 배열을 .npy로 저장
+    문자열 배열은 고정 길이 유니코드로 저장하여 mmap으로 읽을 수 있음
+    """
+
+    # 스냅샷 형식이 바뀌면 올려서 기존 스냅샷을 무효화
+    FORMAT_VERSION = 2
+    MANIFEST_FILE = 'manifest.json'
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @staticmethod
+    def fingerprint(paths: List[str]) -> Dict[str, Dict]:
+        """원본 파일별 크기와 수정 시각"""
+        fingerprint = {}
+        for path in paths:
+            stat = os.stat(path)
+            fingerprint[os.path.abspath(path)] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns
+            }
+        return fingerprint
+
+    def version_for(self, paths: List[str]) -> str:
+        """원본 파일 지문과 형식 버전으로 스냅샷 버전 계산"""
+        payload = json.dumps(
+            {'format': self.FORMAT_VERSION, 'sources': self.fingerprint(paths)},
+            sort_keys=True
+        )
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+    def path_for(self, version: str) -> str:
+        return os.path.join(self.root, version)
+
+    def load(self, version: str, mmap_mode: Optional[str] = 'r') -> Optional[Dict[str, np.ndarray]]:
+        """스냅샷 로드 (없거나 손상되었으면 None)"""
+        directory = self.path_for(version)
+        manifest_path = os.path.join(directory, self.MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return None
+
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            return {
+                name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode)
+                for name in manifest['arrays']
+            }
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable snapshot {directory}: {str(e)}")
+            return None
+
+    def save(self, version: str, arrays: Dict[str, np.ndarray], metadata: Optional[Dict] = None) -> str:
+        """
+        스냅샷 저장
+        임시 디렉토리에 쓴 뒤 이름을 바꿔 반영하고, 이전 버전은 삭제
+        """
+        os.makedirs(self.root, exist_ok=True)
+        directory = self.path_for(version)
+        temp_directory = os.path.join(self.root, f'.{version}.tmp-{os.getpid()}')
+        shutil.rmtree(temp_directory, ignore_errors=True)
+        os.makedirs(temp_directory)
+
+        for name, array in arrays.items():
+            array = np.asarray(array)
+            if array.dtype == object:
+                array = array.astype(str)
+            np.save(os.path.join(temp_directory, f'{name}.npy'), array, allow_pickle=False)
+
+        manifest = {
+            'format': self.FORMAT_VERSION,
+            'version': version,
+            'arrays': sorted(arrays),
+            **(metadata or {})
+        }
+        with open(os.path.join(temp_directory, self.MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        try:
+            os.rename(temp_directory, directory)
+        except OSError:
+            # 다른 프로세스가 같은 버전을 먼저 만든 경우
+            shutil.rmtree(temp_directory, ignore_errors=True)
+
+        self.remove_stale(keep=version)
+        return directory
+
+    def remove_stale(self, keep: str):
+        """현재 버전 외의 스냅샷 삭제"""
+        for name in os.listdir(self.root):
+            if name != keep and not name.startswith('.'):
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
@@ -0,0 +1,184 @@
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+
+class VisitIndex:
+    """
+    사용자별 방문 기록 인덱스 (CSR 형식)
+    방문 기록을 사용자 단위로 연속 배열에 모으고 offsets로 구간을 가리킴
+    사용자 ID 조회도 정렬된 배열의 이진 탐색으로 처리하므로
+    모든 상태가 배열이며, 스냅샷을 mmap으로 열면 워커 간에 그대로 공유됨
+    """
+
+    def __init__(
+            self,
+            user_ids: np.ndarray,
+            offsets: np.ndarray,
+            item_codes: np.ndarray,
+            ratings: np.ndarray,
+            sido_codes: np.ndarray,
+            item_names: np.ndarray,
+            sido_names: np.ndarray,
+            sorted_user_ids: np.ndarray = None,
+            sorted_user_codes: np.ndarray = None
+    ):
+        self.user_ids = user_ids
+        self.offsets = offsets
+        self.item_codes = item_codes
+        self.ratings = ratings
+        self.sido_codes = sido_codes
+        self.item_names = item_names
+        self.sido_names = sido_names
+        if sorted_user_codes is None:
+            sorted_user_codes = np.argsort(user_ids, kind='stable')
+            sorted_user_ids = user_ids[sorted_user_codes]
+        self.sorted_user_ids = sorted_user_ids
+        self.sorted_user_codes = sorted_user_codes
+        self.sido_index = {str(sido): code for code, sido in enumerate(sido_names)}
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'VisitIndex':
+        """방문 데이터(userID, itemID, rating, SIDO)로 인덱스 생성"""
+        user_codes, user_ids = pd.factorize(df['userID'])
+        item_codes, item_names = pd.factorize(df['itemID'])
+        sido_codes, sido_names = pd.factorize(df['SIDO'])
+
+        # 사용자 순으로 정렬 (사용자 내 방문 순서는 원본 순서 유지)
+        order = np.argsort(user_codes, kind='stable')
+        counts = np.bincount(user_codes[order], minlength=len(user_ids))
+        offsets = np.zeros(len(user_ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        return cls(
+            user_ids=np.asarray(user_ids, dtype=str),
+            offsets=offsets,
+            item_codes=item_codes[order].astype(np.int64),
+            ratings=df['rating'].to_numpy(dtype=np.float64)[order],
+            sido_codes=sido_codes[order].astype(np.int64),
+            item_names=np.asarray(item_names, dtype=str),
+            sido_names=np.asarray(sido_names, dtype=str)
+        )
+
+    @staticmethod
+    def _extend_codes(names: np.ndarray, values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        값 -> 코드 변환 (기존 이름 배열 기준, 결측값은 -1)
+        처음 보는 값은 등장 순서대로 기존 코드 뒤에 추가
+        """
+        codes = pd.Index(names).get_indexer(values) if len(names) else np.full(len(values), -1)
+        codes = codes.astype(np.int64)
+        missing = (codes < 0) & values.notna().to_numpy()
+        new_codes, new_names = pd.factorize(values[missing])
+        codes[missing] = len(names) + new_codes
+        return codes, np.concatenate([names, np.asarray(new_names, dtype=str)])
+
+    def append(self, df: pd.DataFrame) -> 'VisitIndex':
+        """
+        방문 데이터(userID, itemID, rating, SIDO)를 추가한 새 인덱스 반환 (기존 인덱스는 변경하지 않음)
+        기존 데이터 뒤에 df를 이어 붙여 from_dataframe으로 만든 인덱스와 동일
+        df는 한 번만 인코딩하고, 기존 방문 기록은 사용자 구간 단위로 위치만 옮겨 복사
+        """
+        user_codes, user_ids = self._extend_codes(self.user_ids, df['userID'])
+        item_codes, item_names = self._extend_codes(self.item_names, df['itemID'])
+        sido_codes, sido_names = self._extend_codes(self.sido_names, df['SIDO'])
+        ratings = df['rating'].to_numpy(dtype=np.float64)
+
+        n_users = len(user_ids)
+        n_previous_users = self.n_users
+        previous_counts = np.zeros(n_users, dtype=np.int64)
+        previous_counts[:n_previous_users] = np.diff(self.offsets)
+        delta_counts = np.bincount(user_codes, minlength=n_users)
+        offsets = np.zeros(n_users + 1, dtype=np.int64)
+        np.cumsum(previous_counts + delta_counts, out=offsets[1:])
+
+        # 기존 방문: 사용자 구간 시작 위치 변화만큼 이동
+        previous_users = np.repeat(np.arange(n_previous_users), previous_counts[:n_previous_users])
+        previous_positions = np.arange(len(self)) + (offsets[previous_users] - self.offsets[previous_users])
+
+        # 추가 방문: 사용자 구간에서 기존 방문 뒤 (사용자 내 순서는 df 순서 유지)
+        order = np.argsort(user_codes, kind='stable')
+        delta_users = user_codes[order]
+        delta_starts = np.cumsum(delta_counts) - delta_counts
+        delta_positions = (
+            offsets[delta_users] + previous_counts[delta_users]
+            + np.arange(len(order)) - delta_starts[delta_users]
+        )
+
+        def merge(previous: np.ndarray, delta: np.ndarray, dtype) -> np.ndarray:
+            merged = np.empty(offsets[-1], dtype=dtype)
+            merged[previous_positions] = previous
+            merged[delta_positions] = delta[order]
+            return merged
+
+        # 새 사용자를 정렬된 ID 배열에 끼워 넣음
+        new_user_ids = user_ids[n_previous_users:]
+        new_order = np.argsort(new_user_ids, kind='stable')
+        sorted_user_ids = self.sorted_user_ids.astype(user_ids.dtype)
+        insert_at = np.searchsorted(sorted_user_ids, new_user_ids[new_order], side='right')
+
+        return VisitIndex(
+            user_ids=user_ids,
+            offsets=offsets,
+            item_codes=merge(self.item_codes, item_codes, np.int64),
+            ratings=merge(self.ratings, ratings, np.float64),
+            sido_codes=merge(self.sido_codes, sido_codes, np.int64),
+            item_names=item_names,
+            sido_names=sido_names,
+            sorted_user_ids=np.insert(sorted_user_ids, insert_at, new_user_ids[new_order]),
+            sorted_user_codes=np.insert(self.sorted_user_codes, insert_at, n_previous_users + new_order)
+        )
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """스냅샷 저장용 배열"""
+        return {
+            'user_ids': self.user_ids,
+            'offsets': self.offsets,
+            'item_codes': self.item_codes,
+            'ratings': self.ratings,
+            'sido_codes': self.sido_codes,
+            'item_names': self.item_names,
+            'sido_names': self.sido_names,
+            'sorted_user_ids': self.sorted_user_ids,
+            'sorted_user_codes': self.sorted_user_codes
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'VisitIndex':
+        """to_arrays로 저장한 배열(mmap 포함)로 인덱스 복원"""
+        return cls(**arrays)
+
+    @property
+    def n_items(self) -> int:
+        return len(self.item_names)
+
+    @property
+    def n_users(self) -> int:
+        return len(self.user_ids)
+
+    def __len__(self) -> int:
+        return len(self.item_codes)
+
+    def lookup_users(self, user_ids: List[str]) -> np.ndarray:
+        """사용자 ID 목록 -> 사용자 코드 배열 (없으면 -1)"""
+        if len(user_ids) == 0 or len(self.sorted_user_ids) == 0:
+            return np.full(len(user_ids), -1, dtype=np.int64)
+        queries = np.asarray(user_ids, dtype=str)
+        positions = np.searchsorted(self.sorted_user_ids, queries)
+        positions = np.minimum(positions, len(self.sorted_user_ids) - 1)
+        found = self.sorted_user_ids[positions] == queries
+        return np.where(found, self.sorted_user_codes[positions], -1).astype(np.int64)
+
+    def get_user_ranges(self, user_ids: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """사용자별 방문 기록 구간 [start, end) 배열 반환 (없는 사용자는 빈 구간)"""
+        codes = self.lookup_users(user_ids)
+        found = codes >= 0
+        safe_codes = np.where(found, codes, 0)
+        starts = np.where(found, self.offsets[safe_codes], 0)
+        ends = np.where(found, self.offsets[safe_codes + 1], 0)
+        return starts, ends
+
+    def get_user_range(self, user_id: str) -> Tuple[int, int]:
+        """사용자의 방문 기록 구간 [start, end) 반환 (없으면 빈 구간)"""
+        starts, ends = self.get_user_ranges([user_id])
+        return int(starts[0]), int(ends[0])
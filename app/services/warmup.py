@@ -0,0 +1,126 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+import logging
+import threading
+import time
+
+from ..core.config import settings
+from .recommender import RecommendationService
+from .executor import RecommendationExecutor, recommendation_executor
+from .reloader import DataReloader, data_reloader
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceWarmup:
+    """
+    서버 시작 시 데이터 로드를 백그라운드 스레드에서 수행 (uvicorn 시작을 막지 않음)
+    - 추천 서비스 로드 (process 모드는 워커 풀 생성과 워커별 로드) -> 실행기 시작 -> 원본 파일 감시 시작
+    - state(): 진행 단계, 단계별 소요 시간, 행 수, 경과 시간 (/ready 응답)
+    준비되기 전의 추천 요청은 API에서 바로 503으로 거절
+    로드에 실패하면 failed 상태가 되어 /live도 503을 반환 (오케스트레이터가 워커를 재시작하도록)
+    """
+
+    def __init__(self, executor: RecommendationExecutor, reloader: DataReloader):
+        self.executor = executor
+        self.reloader = reloader
+        self.status = 'pending'
+        self.step: Optional[str] = None
+        self.completed_steps: List[Dict] = []
+        self.error: Optional[str] = None
+        self.started_at: Optional[str] = None
+        self.ready_at: Optional[str] = None
+        self._start_time: Optional[float] = None
+        self._step_start_time: Optional[float] = None
+        self._ready_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def failed(self) -> bool:
+        return self.status == 'failed'
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """준비될 때까지 대기 (timeout 안에 준비되면 True)"""
+        return self._ready.wait(timeout)
+
+    def start(self, background: bool = True):
+        """
+        데이터 로드 시작
+        background가 거짓이면 현재 스레드에서 끝까지 로드하고, 실패하면 예외를 그대로 전파 (서버 시작 실패)
+        """
+        with self._lock:
+            if self._thread is not None or self.status != 'pending':
+                return
+            self.status = 'loading'
+            self.started_at = datetime.now().isoformat()
+            self._start_time = time.perf_counter()
+            if background:
+                self._thread = threading.Thread(target=self._run, name='service-warmup', daemon=True)
+                self._thread.start()
+                return
+        self._run(raise_errors=True)
+
+    def _progress(self, step: Optional[str]):
+        """로드 단계 전환 기록 (step이 None이면 현재 단계 종료)"""
+        now = time.perf_counter()
+        if self.step is not None:
+            self.completed_steps.append({'step': self.step, 'seconds': round(now - self._step_start_time, 3)})
+        self.step = step
+        self._step_start_time = now
+        if step is not None:
+            logger.info(f"Warm-up step: {step}")
+
+    def _run(self, raise_errors: bool = False):
+        try:
+            logger.info("Warming up recommendation service...")
+            # 추천 서비스 초기화 (process 모드는 각 워커 프로세스에서 로드)
+            if self.executor.mode != 'process':
+                self._progress('fingerprinting_sources')
+                RecommendationService.get_instance(progress=self._progress)
+            self._progress('starting_executor')
+            self.executor.start()
+            # 원본 파일 변경 감시 (데이터 버전이 정해진 뒤에 시작)
+            if settings.RELOAD_WATCH_INTERVAL > 0:
+                self.reloader.start_watching(settings.RELOAD_WATCH_INTERVAL)
+
+            self._progress(None)
+            self._ready_seconds = time.perf_counter() - self._start_time
+            self.ready_at = datetime.now().isoformat()
+            self.status = 'ready'
+            self._ready.set()
+            logger.info(f"Recommendation service ready in {self._ready_seconds:.3f}s")
+        except Exception as e:
+            self.error = str(e)
+            self.status = 'failed'
+            logger.error(f"Error warming up recommendation service: {str(e)}")
+            if raise_errors:
+                raise
+
+    def state(self) -> Dict:
+        if self._ready_seconds is not None:
+            elapsed = self._ready_seconds
+        elif self._start_time is not None:
+            elapsed = time.perf_counter() - self._start_time
+        else:
+            elapsed = None
+        return {
+            'ready': self.ready,
+            'status': self.status,
+            'step': self.step,
+            'completed_steps': list(self.completed_steps),
+            'elapsed_seconds': round(elapsed, 3) if elapsed is not None else None,
+            'started_at': self.started_at,
+            'ready_at': self.ready_at,
+            'data_version': self.executor.data_version if self.ready else None,
+            **(self.executor.loaded_rows() if self.ready else {'visit_records': None, 'user_records': None}),
+            'error': self.error
+        }
+
+
+service_warmup = ServiceWarmup(recommendation_executor, data_reloader)
@@ -2,7 +2,12 @@ from fastapi import FastAPI
 from app import settings
 from app import router
 from app import setup_logging
+from app.core import RequestIdMiddleware
 from app import RecommendationService
+from app import recommendation_executor
+from app import data_reloader
+from app import service_warmup
+from fastapi.responses import JSONResponse
 from datetime import datetime
 
 # 로깅 설정
@@ -14,16 +19,51 @@ app = FastAPI(
     description=settings.PROJECT_DESCRIPTION,
     version=settings.VERSION
 )
+# 요청 ID (X-Request-ID) 설정, 로그와 프로파일 파일에 사용
+app.add_middleware(RequestIdMiddleware)
 
 # 기본 헬스 체크 엔드포인트
 @app.get("/health")
 async def health_check():
-    """헬스 체크 엔드포인트"""
-    return {
-        "status": "healthy",
+    """헬스 체크 엔드포인트 (데이터 로드에 실패했으면 503)"""
+    content = {
+        "status": "unhealthy" if service_warmup.failed else "healthy",
+        "ready": service_warmup.ready,
         "version": settings.VERSION,
+        "data_version": recommendation_executor.data_version,
+        "execution_mode": recommendation_executor.mode,
+        "pending_requests": recommendation_executor.pending,
+        "cache": (
+            RecommendationService.get_instance().cache.stats()
+            if RecommendationService.has_instance() else None
+        ),
         "timestamp": datetime.now().isoformat()
     }
+    if service_warmup.failed:
+        return JSONResponse(status_code=503, content={**content, "error": service_warmup.error})
+    return content
+
+@app.get("/live")
+async def liveness_check():
+    """
+    생존 확인 (로드 중에도 바로 응답)
+    데이터 로드에 실패하면 복구되지 않으므로 503을 반환하여 오케스트레이터가 워커를 재시작하도록 함
+    """
+    if service_warmup.failed:
+        return JSONResponse(status_code=503, content={"status": "failed", "error": service_warmup.error})
+    return {"status": "alive"}
+
+@app.get("/ready")
+async def readiness_check():
+    """준비 상태 (데이터 로드 진행 단계, 행 수, 경과 시간), 준비 전에는 503"""
+    state = service_warmup.state()
+    if state["ready"]:
+        return state
+    return JSONResponse(
+        status_code=503,
+        content=state,
+        headers={"Retry-After": str(settings.WARMUP_RETRY_AFTER_SECONDS)}
+    )
 
 # API 라우터 등록 (프리픽스 없이)
 app.include_router(router)
@@ -32,10 +72,12 @@ app.include_router(router)
 async def startup_event():
     """서버 시작 시 실행될 이벤트"""
     logger.info("Starting recommendation server...")
-    # 추천 서비스 초기화
-    RecommendationService.get_instance()
+    # 데이터 로드, 실행기 시작, 원본 파일 감시를 백그라운드에서 진행 (준비 상태는 /ready)
+    service_warmup.start(background=settings.WARMUP_IN_BACKGROUND)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """서버 종료 시 실행될 이벤트"""
-    logger.info("Shutting down recommendation server...")
\ No newline at end of file
+    logger.info("Shutting down recommendation server...")
+    data_reloader.stop()
+    recommendation_executor.shutdown()
\ No newline at end of file
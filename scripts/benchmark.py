@@ -0,0 +1,221 @@
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+# 프로젝트 루트 경로와 scripts 디렉토리 추가 (synthetic_data는 scripts/ 안의 모듈, 실행 방식과 관계없이 import)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.append(ROOT_DIR)
+sys.path.append(SCRIPT_DIR)
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.responses import FastJSONResponse, MsgpackResponse, encode_recommendations, msgpack
+from app.core.config import settings
+from app.core.memory import get_rss_bytes
+from app.models.schemas import TravelRequest, SimilarityScores, SIMILARITY_SCORE_FIELDS
+from app.services.item_similarity import ItemSimilarityBuilder, save_similarity_store
+from app.services.recommender import RecommendationService
+from app.services.similarity_calculator import UserSimilarityCalculator
+from synthetic_data import SyntheticDataGenerator
+
+
+def load_model_service_class():
+    """루트의 app.py(ModelService) 로드 (app 패키지와 이름이 겹치므로 파일 경로로 로드)"""
+    spec = importlib.util.spec_from_file_location('model_api', os.path.join(ROOT_DIR, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.ModelService
+
+
+def time_calls(func: Callable, args_list: List, repeat: int = 1) -> Dict:
+    """인자 목록마다 func 실행 시간 측정 (repeat 중 최소값), 밀리초 단위 통계"""
+    elapsed = []
+    for args in args_list:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(*args)
+            best = min(best, time.perf_counter() - start)
+        elapsed.append(best * 1000)
+    elapsed = np.array(elapsed)
+    return {
+        'calls': len(elapsed),
+        'mean_ms': float(elapsed.mean()),
+        'p50_ms': float(np.percentile(elapsed, 50)),
+        'p95_ms': float(np.percentile(elapsed, 95)),
+        'max_ms': float(elapsed.max())
+    }
+
+
+def benchmark_serialization(results: List[Dict], repeat: int) -> Dict:
+    """
+    추천 결과 한 건의 응답 직렬화 비용
+    - pydantic_json: 기존 경로 (장소마다 SimilarityScores 모델 생성 -> jsonable_encoder -> JSONResponse)
+    - fast_json: 점수 튜플을 dict로 변환 -> orjson (FastJSONResponse)
+    - msgpack: 같은 내용을 msgpack으로 (설치된 경우)
+    """
+    timestamp = datetime.now().isoformat()
+
+    def pydantic_json(result):
+        recommendations = [
+            {**item, 'similarity_scores': SimilarityScores(**dict(zip(SIMILARITY_SCORE_FIELDS, item['similarity_scores'])))}
+            for item in result['recommendations']
+        ]
+        content = {**result, 'recommendations': recommendations, 'timestamp': timestamp}
+        return JSONResponse(content=jsonable_encoder(content)).body
+
+    def fast_content(result):
+        return {**result, 'recommendations': encode_recommendations(result['recommendations']), 'timestamp': timestamp}
+
+    args_list = [(result,) for result in results]
+    stats = {
+        'pydantic_json': time_calls(pydantic_json, args_list, repeat=repeat),
+        'fast_json': time_calls(lambda result: FastJSONResponse(fast_content(result)).body, args_list, repeat=repeat),
+        'json_bytes': float(np.mean([len(FastJSONResponse(fast_content(result)).body) for result in results]))
+    }
+    if msgpack is not None:
+        stats['msgpack'] = time_calls(lambda result: MsgpackResponse(fast_content(result)).body, args_list, repeat=repeat)
+        stats['msgpack_bytes'] = float(np.mean([len(MsgpackResponse(fast_content(result)).body) for result in results]))
+    return stats
+
+
+def benchmark_scale(generator: SyntheticDataGenerator, model_service_class, scale: float, args) -> Dict:
+    """scale 배 합성 데이터로 각 경로의 실행 시간 측정"""
+    result = {'scale': scale}
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        paths = generator.write(directory, scale)
+        result['generate_seconds'] = time.perf_counter() - start
+
+        # 합성 데이터를 가리키도록 설정 변경 후 서비스 생성 (스냅샷 사용 안 함)
+        settings.PREPROCESSED_PATH = paths['visit_data']
+        settings.USER_DATA_PATH = paths['user_data']
+        settings.USE_SNAPSHOT = False
+        start = time.perf_counter()
+        service = RecommendationService()
+        result['load_seconds'] = time.perf_counter() - start
+        result['users'] = service.user_count
+        result['visits'] = len(service.visit_index)
+        result['items'] = service.visit_index.n_items
+
+        destinations = [sido for sido, rows in service.destination_user_rows.items() if len(rows) > 0]
+        requests = [TravelRequest(**data) for data in generator.requests(args.requests, destinations)]
+
+        # 요청 x 사용자 한 쌍의 스칼라 유사도
+        users = service.user_data.sample(n=args.requests, replace=True, random_state=args.seed).to_dict('records')
+        result['calculate_user_similarity'] = time_calls(
+            UserSimilarityCalculator.calculate_user_similarity,
+            [(request.dict(), user) for request, user in zip(requests, users)],
+            repeat=args.repeat
+        )
+
+        result['find_similar_users'] = time_calls(
+            service.find_similar_users,
+            [(request,) for request in requests],
+            repeat=args.repeat
+        )
+
+        similar_users = [service.find_similar_users(request) for request in requests]
+        result['get_place_recommendations'] = time_calls(
+            service.get_place_recommendations,
+            [(users, request.destination) for users, request in zip(similar_users, requests)],
+            repeat=args.repeat
+        )
+
+        # 응답 직렬화 (기존 Pydantic 경로 대비)
+        service.cache.clear()
+        result['serialization'] = benchmark_serialization(service.get_recommendations_batch(requests), args.repeat)
+
+        # ModelService: 합성 방문 데이터 + 무작위 행렬 분해 파라미터 + 합성 데이터로 만든 아이템 유사도
+        # (유사도가 없으면 rerank_with_diversity가 유사도 행 조회를 건너뛰므로 서비스와 같은 조건으로 측정)
+        model_service = model_service_class()
+        model_service.load_data(paths['visit_data'])
+        start = time.perf_counter()
+        builder = ItemSimilarityBuilder(top_k=args.similarity_top_k, n_jobs=args.jobs)
+        store_dir = save_similarity_store(
+            os.path.join(directory, 'item_similarities'),
+            builder.build(model_service.df_original[['userID', 'itemID', 'rating']]),
+            builder.metadata()
+        )
+        result['similarity_build_seconds'] = time.perf_counter() - start
+        model_service.load_similarities(store_dir)
+        result['similarity_neighbours'] = builder.stats['neighbours']
+        model_service.factors = generator.factors(
+            np.array(list(model_service.user_index)),
+            model_service.item_ids.to_numpy()
+        )
+        model_service._align_item_inner_ids()
+        user_ids = generator.rng.choice(np.array(list(model_service.user_index)), args.requests)
+        result['model_get_recommendations'] = time_calls(
+            model_service.get_recommendations,
+            [(user_id,) for user_id in user_ids],
+            repeat=args.repeat
+        )
+        result['rss_mb'] = get_rss_bytes() / (1024 * 1024)
+
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추천 핵심 경로 벤치마크 (합성 데이터, 네트워크 없이 실행)")
+    parser.add_argument('--scales', type=float, nargs='+', default=[10, 100, 1000], help="데이터 배율 (예: 1 10 100)")
+    parser.add_argument('--requests', type=int, default=20, help="경로별 측정 호출 수")
+    parser.add_argument('--repeat', type=int, default=3, help="호출별 반복 횟수 (최소값 사용)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--similarity-top-k', type=int, default=50, help="아이템 유사도 이웃 수 (build_item_similarities.py 기본값)")
+    parser.add_argument('--jobs', type=int, default=None, help="아이템 유사도 계산 프로세스 수 (기본: CPU 수)")
+    parser.add_argument('--output', type=str, default=None,
+                        help="결과 JSON 경로 (기본: test_results/<timestamp>/benchmark_results.json)")
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator.from_files(seed=args.seed)
+    model_service_class = load_model_service_class()
+
+    results = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'settings': {'requests': args.requests, 'repeat': args.repeat, 'seed': args.seed},
+        'scales': []
+    }
+    for scale in args.scales:
+        print(f"Benchmarking scale {scale}x...", file=sys.stderr)
+        results['scales'].append(benchmark_scale(generator, model_service_class, scale, args))
+
+    output = args.output
+    if output is None:
+        output = os.path.join(
+            ROOT_DIR, 'test_results', datetime.now().strftime('%Y%m%d_%H%M%S'), 'benchmark_results.json'
+        )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
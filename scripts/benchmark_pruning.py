@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import sys
+import time
+import random
+from typing import Dict, List
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.schemas import TravelRequest
+from app.services.recommender import RecommendationService
+
+
+def build_requests(service: RecommendationService, n_requests: int, seed: int) -> List[TravelRequest]:
+    """방문 기록이 있는 SIDO를 목적지로 하는 무작위 요청 생성"""
+    rng = random.Random(seed)
+    destinations = [sido for sido, rows in service.destination_user_rows.items() if len(rows) > 0]
+    requests = []
+    for _ in range(n_requests):
+        requests.append(TravelRequest(
+            startAt="2024-01-01",
+            endAt="2024-01-03",
+            people=rng.randint(1, 5),
+            destination=rng.choice(destinations),
+            age=rng.sample([20, 30, 40, 50, 60], rng.randint(1, 2)),
+            theme=[1],
+            purpose=rng.sample(range(1, 11), rng.randint(1, 3)),
+            visit=rng.sample(range(1, 9), rng.randint(1, 3)),
+            environment=rng.randint(1, 8)
+        ))
+    return requests
+
+
+def run_once(service: RecommendationService, request: TravelRequest, prune: bool, repeat: int) -> Dict:
+    """한 요청에 대한 유사 사용자 검색 + 장소 추천 시간 측정"""
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        similar_users = service.find_similar_users(request, prune_by_destination=prune)
+        recommendations = service.get_place_recommendations(similar_users, request.destination)
+        elapsed.append(time.perf_counter() - start)
+    return {
+        'seconds': min(elapsed),
+        'similar_users': [user_id for user_id, _, _ in similar_users],
+        'items': [rec['item_id'] for rec in recommendations]
+    }
+
+
+def overlap(a: List, b: List) -> float:
+    """두 목록의 자카드 유사도 (둘 다 비어 있으면 1.0)"""
+    union = set(a) | set(b)
+    if not union:
+        return 1.0
+    return len(set(a) & set(b)) / len(union)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="목적지 기반 후보 축소 벤치마크")
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=str, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    service = RecommendationService.get_instance()
+    requests = build_requests(service, args.requests, args.seed)
+
+    results = []
+    for request in requests:
+        full = run_once(service, request, prune=False, repeat=args.repeat)
+        pruned = run_once(service, request, prune=True, repeat=args.repeat)
+        results.append({
+            'destination': request.destination,
+            'candidates': len(service.destination_user_rows[request.destination]),
+            'full_seconds': full['seconds'],
+            'pruned_seconds': pruned['seconds'],
+            'full_items': len(full['items']),
+            'pruned_items': len(pruned['items']),
+            'user_overlap': overlap(full['similar_users'], pruned['similar_users']),
+            'item_overlap': overlap(full['items'], pruned['items'])
+        })
+
+    n = len(results)
+    summary = {
+        'total_users': service.user_count,
+        'requests': n,
+        'avg_candidates': sum(r['candidates'] for r in results) / n,
+        'avg_full_ms': 1000 * sum(r['full_seconds'] for r in results) / n,
+        'avg_pruned_ms': 1000 * sum(r['pruned_seconds'] for r in results) / n,
+        'avg_full_items': sum(r['full_items'] for r in results) / n,
+        'avg_pruned_items': sum(r['pruned_items'] for r in results) / n,
+        'avg_user_overlap': sum(r['user_overlap'] for r in results) / n,
+        'avg_item_overlap': sum(r['item_overlap'] for r in results) / n
+    }
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'results': results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import json
+import os
+import pickle
+import sys
+
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.item_similarity import ItemSimilarityBuilder, save_similarity_store, to_similarity_dict
+
+
+def main():
+    parser = argparse.ArgumentParser(description="아이템 간 유사도 계산 (상위 k개 이웃)")
+    parser.add_argument('--input', type=str, default=settings.PREPROCESSED_PATH, help="방문 데이터 CSV (dfE.csv)")
+    parser.add_argument('--output', type=str, default=settings.SIMILARITY_STORE_DIR, help="CSR 배열 저장 디렉토리 (기본 경로이면 app.py가 다음 시작 때 pickle 대신 읽음)")
+    parser.add_argument('--pickle', type=str, default=None,
+                        help=f"기존 dict 형식으로도 저장할 경로 (예: {settings.SIMILARITIES_PATH})")
+    parser.add_argument('--top-k', type=int, default=50)
+    parser.add_argument('--min-support', type=int, default=1, help="함께 평가한 최소 사용자 수")
+    parser.add_argument('--centered', action='store_true', help="사용자 평균을 뺀 조정 코사인 사용")
+    parser.add_argument('--block-size', type=int, default=256, help="워커 작업당 아이템 행 수")
+    parser.add_argument('--jobs', type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input, usecols=['userID', 'itemID', 'rating'])
+    builder = ItemSimilarityBuilder(
+        top_k=args.top_k,
+        min_support=args.min_support,
+        centered=args.centered,
+        block_size=args.block_size,
+        n_jobs=args.jobs
+    )
+    arrays = builder.build(df)
+    metadata = {'source': os.path.abspath(args.input), **builder.metadata()}
+    save_similarity_store(args.output, arrays, metadata)
+
+    if args.pickle:
+        with open(args.pickle, 'wb') as f:
+            pickle.dump(to_similarity_dict(arrays), f)
+
+    print(json.dumps(metadata, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import argparse
+import json
+import os
+import sys
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.preprocessing import VisitPreprocessor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="원본 Training CSV -> 전처리된 방문 테이블 (dfE.csv)")
+    parser.add_argument('--visits', type=str, default=settings.VISIT_DATA_PATH)
+    parser.add_argument('--travels', type=str, default=settings.TRAVEL_DATA_PATH)
+    parser.add_argument('--travellers', type=str, default=settings.USER_DATA_PATH)
+    parser.add_argument('--output', type=str, default=settings.PREPROCESSED_PATH)
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="한 번에 읽는 행 수")
+    args = parser.parse_args()
+
+    preprocessor = VisitPreprocessor(chunk_size=args.chunk_size)
+    stats = preprocessor.run(args.visits, args.travels, args.travellers, args.output)
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -36,7 +36,8 @@ def create_required_directories():
         settings.LOG_DIR,
         os.path.dirname(settings.PREPROCESSED_PATH),
         os.path.dirname(settings.MODEL_PATH),
-        os.path.dirname(settings.SIMILARITIES_PATH)
+        os.path.dirname(settings.SIMILARITIES_PATH),
+        settings.SNAPSHOT_DIR
     ]
 
     for directory in directories:
@@ -44,6 +45,20 @@ def create_required_directories():
         logger.info(f"Ensured directory exists: {directory}")
 
 
+def prepare_shared_data():
+    """멀티 워커 모드: 워커 시작 전에 스냅샷을 한 번 생성하여 모든 워커가 mmap으로 공유"""
+    from app.services.recommender import RecommendationService
+
+    logger.info(f"Preparing shared data snapshot for {settings.WORKERS} workers...")
+    RecommendationService.prepare_snapshot()
+    # 관리자 재로드/병합 요청은 한 워커에만 전달되므로 나머지 워커는 원본 변경 감시로 맞춤
+    if settings.RELOAD_WATCH_INTERVAL <= 0:
+        logger.warning(
+            "RELOAD_WATCH_INTERVAL is 0: /admin/reload and /admin/ingest only update the worker "
+            "that receives the request; set RELOAD_WATCH_INTERVAL so the other workers follow"
+        )
+
+
 def start_server():
     """서버 시작"""
     try:
@@ -55,11 +70,16 @@ def start_server():
         # 필수 파일 확인
         check_required_files()
 
+        # 멀티 워커 공유 데이터 준비
+        if settings.WORKERS > 1:
+            prepare_shared_data()
+
         # 서버 실행
         uvicorn.run(
             "main:app",
             host=settings.HOST,
             port=settings.PORT,
+            workers=settings.WORKERS,
             reload=False,
             log_level=settings.LOG_LEVEL.lower(),
             access_log=True
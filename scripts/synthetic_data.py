@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+
+
+class SyntheticDataGenerator:
+    """
+    실제 데이터(사용자 마스터, dfE.csv)의 분포를 따르는 합성 데이터 생성
+    - 사용자 마스터: 컬럼별 실제 값 분포(결측 비율 포함)에서 추출
+    - 방문 데이터: 사용자당 방문 수, 장소 인기도(순위-빈도 곡선), 장소별 SIDO, 평점 분포를 실제 데이터에서 추출
+    scale 배로 사용자 수와 장소 수를 늘리고, 방문 수는 사용자 수에 비례
+    """
+
+    def __init__(self, user_data: pd.DataFrame, visit_data: pd.DataFrame, seed: int = 0):
+        self.user_data = user_data
+        self.visit_data = visit_data
+        self.rng = np.random.default_rng(seed)
+
+        # 방문 기록이 있는 사용자 비율과 사용자당 방문 수
+        self.visitor_ratio = visit_data['userID'].nunique() / max(len(user_data), 1)
+        self.visits_per_user = visit_data.groupby('userID').size().to_numpy()
+
+        # 장소 인기도 (내림차순 방문 수)와 장소별 SIDO
+        item_counts = visit_data['itemID'].value_counts()
+        self.item_popularity = item_counts.to_numpy(dtype=np.float64)
+        self.item_sidos = visit_data.drop_duplicates('itemID').set_index('itemID')['SIDO'].reindex(item_counts.index)
+        self.user_columns = [column for column in visit_data.columns if column not in ('userID', 'itemID', 'rating', 'SIDO')]
+
+    @classmethod
+    def from_files(cls, user_path: str = None, visit_path: str = None, seed: int = 0) -> 'SyntheticDataGenerator':
+        return cls(
+            pd.read_csv(user_path or settings.USER_DATA_PATH),
+            pd.read_csv(visit_path or settings.PREPROCESSED_PATH),
+            seed=seed
+        )
+
+    def _sample(self, values: pd.Series, size: int) -> np.ndarray:
+        """실제 값(결측 포함)에서 복원 추출"""
+        return values.to_numpy()[self.rng.integers(0, len(values), size)]
+
+    def travellers(self, scale: float) -> pd.DataFrame:
+        """사용자 마스터 스키마의 합성 사용자 (ID: s0000000 형식)"""
+        n_users = max(int(round(len(self.user_data) * scale)), 1)
+        data = {
+            column: self._sample(self.user_data[column], n_users)
+            for column in self.user_data.columns if column != 'TRAVELER_ID'
+        }
+        data['TRAVELER_ID'] = np.char.add('s', np.char.zfill(np.arange(n_users).astype(str), 7))
+        return pd.DataFrame(data)[list(self.user_data.columns)]
+
+    def visits(self, travellers: pd.DataFrame, scale: float) -> pd.DataFrame:
+        """dfE.csv 스키마의 합성 방문 데이터 (장소 ID: place_000000 형식)"""
+        n_visitors = max(int(round(len(travellers) * self.visitor_ratio)), 1)
+        visitors = self.rng.choice(travellers['TRAVELER_ID'].to_numpy(), size=n_visitors, replace=False)
+        counts = self.visits_per_user[self.rng.integers(0, len(self.visits_per_user), n_visitors)]
+        user_ids = np.repeat(visitors, counts)
+
+        # 장소 수를 scale 배로 늘리되 순위-빈도 곡선 유지 (순위 r -> 실제 순위 r / scale의 방문 수)
+        n_items = max(int(round(len(self.item_popularity) * scale)), 1)
+        real_ranks = np.minimum((np.arange(n_items) / scale).astype(np.int64), len(self.item_popularity) - 1)
+        weights = self.item_popularity[real_ranks]
+        item_codes = self.rng.choice(n_items, size=len(user_ids), p=weights / weights.sum())
+        item_sidos = self.item_sidos.to_numpy()[real_ranks]
+
+        visits = pd.DataFrame({
+            'userID': user_ids,
+            'itemID': np.char.add('place_', np.char.zfill(item_codes.astype(str), 6)),
+            'rating': self._sample(self.visit_data['rating'], len(user_ids)),
+            'SIDO': item_sidos[item_codes]
+        })
+
+        # 사용자 단위 컬럼은 실제 사용자 한 명의 값을 통째로 사용
+        user_rows = self.visit_data.drop_duplicates('userID')[self.user_columns].reset_index(drop=True)
+        profiles = user_rows.iloc[self.rng.integers(0, len(user_rows), n_visitors)].reset_index(drop=True)
+        profiles = profiles.iloc[np.repeat(np.arange(n_visitors), counts)].reset_index(drop=True)
+        return pd.concat([visits, profiles], axis=1)[list(self.visit_data.columns)]
+
+    def factors(self, user_ids: np.ndarray, item_ids: np.ndarray, n_factors: int = 100) -> Dict:
+        """ModelService용 행렬 분해 파라미터 (Surprise SVD 기본 초기화와 같은 분포)"""
+        ratings = self.visit_data['rating']
+        return {
+            'pu': self.rng.normal(0, 0.1, (len(user_ids), n_factors)),
+            'qi': self.rng.normal(0, 0.1, (len(item_ids), n_factors)),
+            'bu': self.rng.normal(0, 0.1, len(user_ids)),
+            'bi': self.rng.normal(0, 0.1, len(item_ids)),
+            'global_mean': float(ratings.mean()),
+            'biased': True,
+            'rating_scale': (1, 5),
+            'user_inner_ids': {user_id: i for i, user_id in enumerate(user_ids)},
+            'item_inner_ids': {item_id: i for i, item_id in enumerate(item_ids)}
+        }
+
+    def requests(self, n_requests: int, destinations: List[str] = None) -> List[Dict]:
+        """무작위 TravelRequest 데이터 (목적지는 방문 기록이 있는 SIDO)"""
+        if destinations is None:
+            destinations = sorted(self.visit_data['SIDO'].dropna().unique())
+        requests = []
+        for _ in range(n_requests):
+            requests.append({
+                'startAt': '2024-01-01',
+                'endAt': '2024-01-03',
+                'people': int(self.rng.integers(1, 6)),
+                'destination': str(self.rng.choice(destinations)),
+                'age': [int(age) for age in self.rng.choice([20, 30, 40, 50, 60], self.rng.integers(1, 3), replace=False)],
+                'theme': [1],
+                'purpose': [int(code) for code in self.rng.choice(np.arange(1, 11), self.rng.integers(1, 4), replace=False)],
+                'visit': [int(code) for code in self.rng.choice(np.arange(1, 9), self.rng.integers(1, 4), replace=False)],
+                'environment': int(self.rng.integers(1, 9))
+            })
+        return requests
+
+    def write(self, directory: str, scale: float) -> Dict[str, str]:
+        """scale 배 합성 데이터를 CSV로 저장"""
+        os.makedirs(directory, exist_ok=True)
+        travellers = self.travellers(scale)
+        visits = self.visits(travellers, scale)
+        paths = {
+            'user_data': os.path.join(directory, 'tn_traveller_master.csv'),
+            'visit_data': os.path.join(directory, 'dfE.csv')
+        }
+        travellers.to_csv(paths['user_data'], index=False)
+        visits.to_csv(paths['visit_data'], index=False)
+        return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="실제 분포를 따르는 합성 데이터 생성")
+    parser.add_argument('--scale', type=float, default=10)
+    parser.add_argument('--output-dir', type=str, required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator.from_files(seed=args.seed)
+    paths = generator.write(args.output_dir, args.scale)
+    print(json.dumps(paths, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
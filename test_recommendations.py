@@ -1,8 +1,14 @@
 import requests
+import argparse
+import asyncio
 import json
+import random
+import time
+from collections import Counter
 from datetime import datetime, timedelta
 import logging
-from typing import Dict
+from typing import Dict, List, Optional
+import numpy as np
 import pandas as pd
 import os
 
@@ -80,12 +86,13 @@ class RecommendationTester:
             self.logger.error(f"Error getting recommendations: {e}")
             raise
 
-    def run_test_cases(self):
-        """테스트 케이스 실행"""
+    @staticmethod
+    def build_test_cases() -> List[Dict]:
+        """테스트 케이스 (이름, 요청 데이터)"""
         start_date = datetime.now()
         end_date = start_date + timedelta(days=2)
 
-        test_cases = [
+        return [
             {
                 "name": "가족여행객",
                 "request": {
@@ -133,6 +140,10 @@ class RecommendationTester:
             }
         ]
 
+    def run_test_cases(self):
+        """테스트 케이스 실행"""
+        test_cases = self.build_test_cases()
+
         # 테스트 시작 시간 기록
         test_summary = {
             'start_time': datetime.now().isoformat(),
@@ -185,6 +196,166 @@ class RecommendationTester:
         # 결과 요약 출력
         self.print_summary(test_summary)
 
+    @staticmethod
+    def random_request(rng: random.Random) -> Dict:
+        """무작위 TravelRequest 데이터"""
+        start_date = datetime.now() + timedelta(days=rng.randint(0, 60))
+        end_date = start_date + timedelta(days=rng.randint(0, 4))
+        return {
+            "startAt": start_date.strftime('%Y-%m-%d'),
+            "endAt": end_date.strftime('%Y-%m-%d'),
+            "people": rng.randint(1, 6),
+            "destination": rng.choice(["서울", "경기", "인천", "강원", "부산", "제주"]),
+            "disabilities": None,
+            "age": rng.sample([20, 30, 40, 50, 60], rng.randint(1, 2)),
+            "theme": rng.sample(range(1, 6), rng.randint(1, 2)),
+            "purpose": rng.sample(range(1, 11), rng.randint(1, 3)),
+            "visit": rng.sample(range(1, 9), rng.randint(1, 3)),
+            "environment": rng.randint(1, 8)
+        }
+
+    async def _load_worker(
+            self,
+            client,
+            deadline: float,
+            random_ratio: float,
+            rng: random.Random,
+            latencies: List[float],
+            statuses: Counter,
+            max_requests: Optional[int]
+    ):
+        """마감 시간까지 요청을 하나씩 보내는 가상 사용자 (응답을 받으면 바로 다음 요청)"""
+        test_cases = self.build_test_cases()
+        while time.perf_counter() < deadline and (max_requests is None or len(latencies) < max_requests):
+            if rng.random() < random_ratio:
+                request_data = self.random_request(rng)
+            else:
+                request_data = rng.choice(test_cases)['request']
+
+            start = time.perf_counter()
+            try:
+                response = await client.post("/recommend", json=request_data)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+
+    async def _wait_until_ready(self, client, timeout: float = 300.0):
+        """서버 데이터 로드가 끝날 때까지 /ready 확인 (준비 시간이 부하 결과에 섞이지 않도록)"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            try:
+                response = await client.get("/ready")
+                # /ready가 없는 서버는 준비된 것으로 간주
+                if response.status_code in (200, 404):
+                    return
+            except Exception as e:
+                self.logger.debug(f"Waiting for server: {e}")
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Server not ready after {timeout}s")
+            await asyncio.sleep(0.5)
+
+    async def run_load_test_async(
+            self,
+            concurrency: int = 10,
+            duration: float = 30.0,
+            random_ratio: float = 0.5,
+            max_requests: Optional[int] = None,
+            app=None,
+            seed: int = 0
+    ) -> Dict:
+        """
+        비동기 부하 테스트
+        concurrency명의 가상 사용자가 duration초 동안 /recommend를 반복 호출
+        요청은 random_ratio 비율로 무작위 요청, 나머지는 테스트 케이스에서 선택
+        app을 넘기면 네트워크 없이 ASGI transport로 앱을 직접 호출 (앱 시작/종료 이벤트 포함)
+        """
+        import httpx
+
+        if app is not None:
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://testserver"
+        else:
+            transport = None
+            base_url = self.base_url
+
+        latencies: List[float] = []
+        statuses = Counter()
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=60.0) as client:
+            if app is not None:
+                lifespan = app.router.lifespan_context(app)
+                await lifespan.__aenter__()
+            try:
+                await self._wait_until_ready(client)
+                self.logger.info(
+                    f"Load test: concurrency={concurrency}, duration={duration}s, "
+                    f"random_ratio={random_ratio}, target={'in-process' if app is not None else base_url}"
+                )
+                start = time.perf_counter()
+                deadline = start + duration
+                await asyncio.gather(*[
+                    self._load_worker(
+                        client, deadline, random_ratio, random.Random(seed + i),
+                        latencies, statuses, max_requests
+                    )
+                    for i in range(concurrency)
+                ])
+                elapsed = time.perf_counter() - start
+            finally:
+                if app is not None:
+                    await lifespan.__aexit__(None, None, None)
+
+        return self.summarize_load_test(latencies, statuses, elapsed, {
+            'concurrency': concurrency,
+            'duration': duration,
+            'random_ratio': random_ratio,
+            'max_requests': max_requests,
+            'target': 'in-process' if app is not None else base_url
+        })
+
+    @staticmethod
+    def summarize_load_test(latencies: List[float], statuses: Counter, elapsed: float, config: Dict) -> Dict:
+        """처리량, 지연 시간 분위수, 오류율 집계"""
+        total = len(latencies)
+        errors = sum(count for status, count in statuses.items() if not status.startswith('2'))
+        summary = {
+            'config': config,
+            'total_requests': total,
+            'elapsed_seconds': elapsed,
+            'throughput_rps': total / elapsed if elapsed > 0 else 0.0,
+            'error_rate': errors / total if total else 0.0,
+            'status_counts': dict(statuses)
+        }
+        if total:
+            latencies_ms = np.array(latencies) * 1000
+            summary['latency_ms'] = {
+                'min': float(latencies_ms.min()),
+                'mean': float(latencies_ms.mean()),
+                'p50': float(np.percentile(latencies_ms, 50)),
+                'p95': float(np.percentile(latencies_ms, 95)),
+                'p99': float(np.percentile(latencies_ms, 99)),
+                'max': float(latencies_ms.max())
+            }
+        return summary
+
+    def run_load_test(self, **kwargs) -> Dict:
+        """부하 테스트 실행 후 결과 저장 및 요약 출력"""
+        summary = asyncio.run(self.run_load_test_async(**kwargs))
+        self.save_results(summary, 'load_test')
+
+        self.logger.info("\n=== Load Test Summary ===")
+        self.logger.info(f"- Requests: {summary['total_requests']} in {summary['elapsed_seconds']:.1f}s")
+        self.logger.info(f"- Throughput: {summary['throughput_rps']:.1f} req/s")
+        self.logger.info(f"- Error rate: {summary['error_rate']:.2%} {summary['status_counts']}")
+        if 'latency_ms' in summary:
+            latency = summary['latency_ms']
+            self.logger.info(
+                f"- Latency p50/p95/p99: {latency['p50']:.1f} / {latency['p95']:.1f} / {latency['p99']:.1f} ms"
+            )
+        return summary
+
     def analyze_results(self, result: Dict) -> Dict:
         """결과 분석"""
         analysis = {
@@ -241,16 +412,40 @@ class RecommendationTester:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="추천 API 테스트")
+    parser.add_argument('--base-url', type=str, default="http://localhost:8000")
+    parser.add_argument('--load', action='store_true', help="테스트 케이스 대신 부하 테스트 실행")
+    parser.add_argument('--in-process', action='store_true', help="서버 없이 main.app을 ASGI transport로 직접 호출")
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=30.0, help="부하 테스트 시간(초)")
+    parser.add_argument('--random-ratio', type=float, default=0.5, help="무작위 요청 비율 (나머지는 테스트 케이스)")
+    parser.add_argument('--max-requests', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
     # 테스터 초기화
-    tester = RecommendationTester()
+    tester = RecommendationTester(args.base_url)
 
     try:
-        # 테스트 실행
-        tester.run_test_cases()
+        if args.load:
+            app = None
+            if args.in_process:
+                from main import app
+            tester.run_load_test(
+                concurrency=args.concurrency,
+                duration=args.duration,
+                random_ratio=args.random_ratio,
+                max_requests=args.max_requests,
+                app=app,
+                seed=args.seed
+            )
+        else:
+            # 테스트 실행
+            tester.run_test_cases()
 
     except Exception as e:
         logging.error(f"Test execution failed: {e}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
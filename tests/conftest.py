@@ -0,0 +1,58 @@
+import importlib.util
+import os
+import sys
+import tempfile
+
+import pytest
+
+# 프로젝트 루트 경로 추가
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# 테스트 중 생성되는 스냅샷/로그는 임시 디렉터리에 저장 (설정을 읽기 전에 지정)
+_TEMP_DIR = tempfile.mkdtemp(prefix='travel-recommendation-tests-')
+os.environ['SNAPSHOT_DIR'] = os.path.join(_TEMP_DIR, 'snapshots')
+os.environ['LOG_DIR'] = os.path.join(_TEMP_DIR, 'logs')
+
+from app.models.schemas import TravelRequest
+from app.services.recommender import RecommendationService
+
+# 목적지/연령대/목적/스타일 조합을 달리한 요청 (데이터에 없는 목적지와 범위 밖 코드 포함)
+SAMPLE_REQUESTS = [
+    {'people': 3, 'destination': '서울', 'age': [30, 40], 'purpose': [1, 2, 3], 'visit': [1, 2], 'environment': 3},
+    {'people': 1, 'destination': '부산', 'age': [20], 'purpose': [2, 4], 'visit': [2, 3, 4], 'environment': 2},
+    {'people': 4, 'destination': '경기', 'age': [20, 20], 'purpose': [3, 5], 'visit': [3, 4, 5], 'environment': 4},
+    {'people': 2, 'destination': '인천', 'age': [50, 60], 'purpose': [10], 'visit': [], 'environment': 7},
+    {'people': 6, 'destination': '경기', 'age': [], 'purpose': [1, 1, 99], 'visit': [8, 70], 'environment': 1},
+]
+
+
+def make_request(**fields) -> TravelRequest:
+    """점수 계산에 쓰이지 않는 필드는 기본값으로 채운 TravelRequest"""
+    values = {
+        'startAt': '2024-11-01',
+        'endAt': '2024-11-03',
+        'disabilities': None,
+        'theme': [1],
+    }
+    values.update(fields)
+    return TravelRequest(**values)
+
+
+def load_model_api():
+    """app.py(ModelService API) 모듈 로드 (app 패키지와 이름이 겹치므로 파일 경로로 로드)"""
+    spec = importlib.util.spec_from_file_location('model_api', os.path.join(ROOT_DIR, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def service() -> RecommendationService:
+    """저장소 데이터(data/)를 읽은 추천 서비스 (테스트 세션당 한 번 로드)"""
+    return RecommendationService()
+
+
+@pytest.fixture
+def sample_requests():
+    return [make_request(**fields) for fields in SAMPLE_REQUESTS]
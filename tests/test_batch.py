@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from app.core.config import settings
+from app.services.recommender import RecommendationService
+from conftest import SAMPLE_REQUESTS, make_request
+
+
+def _random_requests(n, seed=0):
+    """목적지/인원/코드 조합이 다양한 요청 (test_recommendations.py의 무작위 요청과 같은 범위)"""
+    rng = random.Random(seed)
+    requests = [make_request(**fields) for fields in SAMPLE_REQUESTS]
+    while len(requests) < n:
+        requests.append(make_request(
+            people=rng.randint(1, 6),
+            destination=rng.choice(['서울', '경기', '인천', '부산', '강원']),
+            age=rng.sample([20, 30, 40, 50, 60], rng.randint(1, 2)),
+            purpose=rng.sample(range(1, 11), rng.randint(1, 3)),
+            visit=rng.sample(range(1, 9), rng.randint(1, 3)),
+            environment=rng.randint(1, 8)
+        ))
+    return requests
+
+
+@pytest.fixture
+def small_batch_memory(monkeypatch):
+    """요청 3개 분량의 행렬만 들어가도록 메모리 한도를 낮춤"""
+    def apply(n_users):
+        monkeypatch.setattr(
+            settings, 'BATCH_MEMORY_BYTES', 3 * n_users * RecommendationService.SIMILARITY_BYTES_PER_CELL
+        )
+    return apply
+
+
+def test_chunk_size_follows_memory_budget(monkeypatch):
+    per_cell = RecommendationService.SIMILARITY_BYTES_PER_CELL
+    monkeypatch.setattr(settings, 'BATCH_MEMORY_BYTES', 100 * 1000 * per_cell)
+    assert RecommendationService._similarity_chunk_size(1000) == 100
+    assert RecommendationService._similarity_chunk_size(10_000) == 10
+    assert RecommendationService._similarity_chunk_size(10_000_000) == 1
+    assert RecommendationService._similarity_chunk_size(0) == 100 * 1000
+
+
+@pytest.mark.parametrize('prune_by_destination', [False, True])
+def test_batch_matches_single_requests(service, small_batch_memory, prune_by_destination):
+    """메모리 한도로 나누어 계산해도 배치 결과가 요청별 단건 결과와 동일"""
+    requests = _random_requests(40)
+    small_batch_memory(len(service.user_features['user_ids']))
+
+    batch = service.find_similar_users_batch(requests, n_similar=20, prune_by_destination=prune_by_destination)
+    for request, similar_users in zip(requests, batch):
+        assert similar_users == service.find_similar_users(
+            request, n_similar=20, prune_by_destination=prune_by_destination
+        )
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, None])
+def test_explicit_chunk_size_matches_single_requests(service, chunk_size):
+    requests = _random_requests(15, seed=1)
+    batch = service.find_similar_users_batch(requests, n_similar=10, chunk_size=chunk_size)
+    assert batch == [service.find_similar_users(request, n_similar=10) for request in requests]
+
+
+def test_recommendations_batch_matches_single_requests(service):
+    """배치 추천 결과가 요청별 get_recommendations 결과와 동일"""
+    requests = _random_requests(20, seed=2)
+    service.cache.clear()
+    batch = service.get_recommendations_batch(requests, n_recommendations=5)
+    service.cache.clear()
+    singles = [service.get_recommendations(request, n_recommendations=5) for request in requests]
+    assert batch == singles
@@ -0,0 +1,55 @@
+import time
+
+from app.services.cache import RecommendationCache
+from conftest import make_request
+
+BASE = {'people': 3, 'destination': '서울', 'age': [30, 40], 'purpose': [1, 2, 3], 'visit': [1, 2], 'environment': 3}
+
+
+def _key(**overrides):
+    return RecommendationCache.make_key(make_request(**{**BASE, **overrides}), n_recommendations=5)
+
+
+def test_key_ignores_order_and_unscored_fields():
+    """순서, 연령대 중복, 점수에 쓰이지 않는 필드는 키에 영향 없음"""
+    key = _key()
+    assert _key(age=[40, 30, 30]) == key
+    assert _key(purpose=[3, 1, 2], visit=[2, 1]) == key
+    assert _key(startAt='2025-01-01', endAt='2025-01-09', theme=[4, 5], disabilities=['wheelchair']) == key
+
+
+def test_key_keeps_scored_differences():
+    """점수에 영향을 주는 값(목적/스타일 길이 포함)과 옵션은 다른 키"""
+    key = _key()
+    assert _key(purpose=[1, 2, 3, 3]) != key
+    assert _key(visit=[1, 2, 2]) != key
+    for field, value in [('people', 4), ('destination', '경기'), ('age', [30]), ('environment', 4)]:
+        assert _key(**{field: value}) != key
+    request = make_request(**BASE)
+    assert RecommendationCache.make_key(request, n_recommendations=10) != key
+    assert RecommendationCache.make_key(request, n_recommendations=5, data_version=2) != key
+
+
+def test_requests_with_same_key_score_identically(service):
+    """같은 키의 요청은 실제로 같은 유사 사용자와 점수를 얻음"""
+    first = make_request(**BASE)
+    second = make_request(**{**BASE, 'age': [40, 30, 40], 'purpose': [2, 3, 1], 'visit': [2, 1], 'theme': [5]})
+    assert RecommendationCache.make_key(first) == RecommendationCache.make_key(second)
+    assert service.find_similar_users(first, n_similar=50) == service.find_similar_users(second, n_similar=50)
+
+
+def test_lru_eviction_and_ttl():
+    cache = RecommendationCache(max_size=2, ttl_seconds=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    # 가장 오래 사용하지 않은 b가 제거됨
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.evictions == 1
+
+    expiring = RecommendationCache(max_size=2, ttl_seconds=0.01)
+    expiring.set('a', 1)
+    time.sleep(0.02)
+    assert expiring.get('a') is None
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.services.recommender import RecommendationService
+from conftest import SAMPLE_REQUESTS, make_request
+
+
+@pytest.fixture
+def split_sources(tmp_path, monkeypatch):
+    """저장소 데이터를 앞부분(원본 CSV)과 뒷부분(추가분 두 개)으로 나눔 (원본 CSV는 임시 디렉터리에 기록)"""
+    visits = pd.read_csv(settings.PREPROCESSED_PATH)
+    travellers = pd.read_csv(settings.USER_DATA_PATH)
+    visit_cuts = [len(visits) * 8 // 10, len(visits) * 9 // 10]
+    traveller_cuts = [len(travellers) * 8 // 10, len(travellers) * 9 // 10]
+
+    visit_path = tmp_path / 'dfE.csv'
+    traveller_path = tmp_path / 'tn_traveller_master_E.csv'
+    visits.iloc[:visit_cuts[0]].to_csv(visit_path, index=False)
+    travellers.iloc[:traveller_cuts[0]].to_csv(traveller_path, index=False)
+    monkeypatch.setattr(settings, 'PREPROCESSED_PATH', str(visit_path))
+    monkeypatch.setattr(settings, 'USER_DATA_PATH', str(traveller_path))
+    monkeypatch.setattr(settings, 'USE_SNAPSHOT', False)
+
+    deltas = [
+        (visits.iloc[visit_cuts[0]:visit_cuts[1]], travellers.iloc[traveller_cuts[0]:traveller_cuts[1]]),
+        (visits.iloc[visit_cuts[1]:], travellers.iloc[traveller_cuts[1]:]),
+    ]
+    return deltas, visits, travellers
+
+
+def _assert_same_data(merged: RecommendationService, rebuilt: RecommendationService):
+    """병합한 인스턴스와 전체 재구성한 인스턴스의 배열/추천 결과가 동일"""
+    merged_arrays = merged._snapshot_arrays()
+    rebuilt_arrays = rebuilt._snapshot_arrays()
+    assert merged_arrays.keys() == rebuilt_arrays.keys()
+    for name in rebuilt_arrays:
+        np.testing.assert_array_equal(merged_arrays[name], rebuilt_arrays[name], err_msg=name)
+
+    # 응답의 data_version은 병합 방식(persist 여부)에 따라 다르므로 제외하고 비교
+    for fields in SAMPLE_REQUESTS:
+        request = make_request(**fields)
+        merged_response = dict(merged.get_recommendations(request), data_version=None)
+        assert merged_response == dict(rebuilt.get_recommendations(request), data_version=None)
+
+
+def test_persisted_ingest_matches_rebuild_from_appended_sources(split_sources):
+    deltas, visits, travellers = split_sources
+    service = RecommendationService()
+    for delta_visits, delta_travellers in deltas:
+        service, _ = service.merge_delta(delta_visits, delta_travellers, persist=True, background_snapshot=False)
+
+    # 원본 CSV 뒤에 추가분이 기록되어, 다시 읽으면 전체 데이터와 동일
+    pd.testing.assert_frame_equal(pd.read_csv(settings.PREPROCESSED_PATH), visits)
+    pd.testing.assert_frame_equal(pd.read_csv(settings.USER_DATA_PATH), travellers)
+    rebuilt = RecommendationService()
+    assert service.data_version == rebuilt.data_version
+    _assert_same_data(service, rebuilt)
+
+
+def test_in_memory_ingest_matches_rebuild(split_sources, tmp_path, monkeypatch):
+    deltas, visits, travellers = split_sources
+    base = RecommendationService()
+    merged = base
+    for delta_visits, delta_travellers in deltas:
+        merged, stats = merged.merge_delta(delta_visits, delta_travellers, persist=False)
+    assert stats['visit_records'] == len(visits)
+    assert stats['user_records'] == travellers['TRAVELER_ID'].nunique()
+
+    # 원본과 기존 인스턴스는 변경되지 않음
+    assert merged.source_version == base.source_version
+    assert len(base.visit_index) == len(pd.read_csv(settings.PREPROCESSED_PATH))
+
+    visits.to_csv(tmp_path / 'full_dfE.csv', index=False)
+    travellers.to_csv(tmp_path / 'full_traveller_master_E.csv', index=False)
+    monkeypatch.setattr(settings, 'PREPROCESSED_PATH', str(tmp_path / 'full_dfE.csv'))
+    monkeypatch.setattr(settings, 'USER_DATA_PATH', str(tmp_path / 'full_traveller_master_E.csv'))
+    _assert_same_data(merged, RecommendationService())
@@ -0,0 +1,46 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+
+from app.core.config import settings
+from app.services.item_similarity import ItemSimilarityBuilder, save_similarity_store, to_similarity_dict
+from conftest import load_model_api
+
+
+@pytest.fixture(scope='module')
+def similarity_arrays():
+    df = pd.read_csv(settings.PREPROCESSED_PATH, usecols=['userID', 'itemID', 'rating'])
+    return ItemSimilarityBuilder(top_k=20, n_jobs=1).build(df)
+
+
+def test_server_loads_builder_output_by_default(tmp_path, monkeypatch, similarity_arrays):
+    """빌더 기본 출력(SIMILARITY_STORE_DIR)이 생성되어 있으면 app.py가 pickle 대신 읽음"""
+    store_dir = str(tmp_path / 'item_similarities')
+    monkeypatch.setattr(settings, 'SIMILARITY_STORE_DIR', store_dir)
+    model_api = load_model_api()
+    assert model_api.default_similarities_path() == settings.SIMILARITIES_PATH
+
+    save_similarity_store(store_dir, similarity_arrays)
+    assert model_api.default_similarities_path() == store_dir
+
+
+def test_store_and_pickle_give_the_same_matrix(tmp_path, similarity_arrays):
+    """CSR 저장소와 같은 내용의 dict pickle이 같은 유사도 행렬로 로드됨"""
+    store_dir = save_similarity_store(str(tmp_path / 'store'), similarity_arrays)
+    pickle_path = str(tmp_path / 'similarities.pkl')
+    with open(pickle_path, 'wb') as f:
+        pickle.dump(to_similarity_dict(similarity_arrays), f)
+
+    model_api = load_model_api()
+    matrices = []
+    for path in (store_dir, pickle_path):
+        service = model_api.ModelService()
+        service.load_data(settings.PREPROCESSED_PATH)
+        service.load_similarities(path)
+        matrix = service.similarity_matrix
+        matrices.append(matrix.toarray() if sparse.issparse(matrix) else np.asarray(matrix))
+    assert matrices[0].any()
+    np.testing.assert_array_equal(matrices[0], matrices[1])
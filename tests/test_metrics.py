@@ -0,0 +1,56 @@
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from app.core import metrics
+from app.services.executor import RecommendationExecutor
+from conftest import SAMPLE_REQUESTS, make_request
+
+
+def _sample(name, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_record_data_keeps_only_current_version():
+    metrics.record_data('version-a', 10, 100, 'csv')
+    metrics.record_data('version-b', 11, 120, 'ingest')
+
+    assert _sample('recommendation_data_version_info', data_version='version-b') == 1
+    assert REGISTRY.get_sample_value('recommendation_data_version_info', {'data_version': 'version-a'}) is None
+    assert _sample('recommendation_loaded_rows', table='visits') == 120
+
+
+def test_worker_events_are_replayed_in_api_process(monkeypatch):
+    """워커에서 모은 지표 호출은 기록되지 않고, replay하면 같은 값으로 기록"""
+    metrics.set_known_destinations(['서울'])
+    before = _sample('recommendation_stage_seconds_count', stage='scoring', destination='서울')
+    candidates_before = _sample('recommendation_candidate_users_total', destination='서울')
+
+    monkeypatch.setattr(metrics, '_worker_events', [])
+    metrics.observe_stage('scoring', ['서울', '서울'], 0.01)
+    metrics.count_by_destination(metrics.CANDIDATE_USERS, ['서울'], [7])
+    events = metrics.drain_worker_events()
+    assert _sample('recommendation_stage_seconds_count', stage='scoring', destination='서울') == before
+
+    monkeypatch.setattr(metrics, '_worker_events', None)
+    metrics.replay(events)
+    assert _sample('recommendation_stage_seconds_count', stage='scoring', destination='서울') == before + 2
+    assert _sample('recommendation_candidate_users_total', destination='서울') == candidates_before + 7
+
+
+def test_process_mode_records_worker_metrics_in_api_process():
+    request = make_request(**SAMPLE_REQUESTS[0])
+    executor = RecommendationExecutor(mode='process', max_workers=1)
+    executor.start()
+    try:
+        destination = metrics.destination_label(request.destination)
+        before = _sample('recommendation_stage_seconds_count', stage='scoring', destination=destination)
+        misses_before = _sample('recommendation_cache_lookups_total', result='miss')
+
+        asyncio.run(executor.run('get_recommendations_batch', [request]))
+
+        assert _sample('recommendation_stage_seconds_count', stage='scoring', destination=destination) == before + 1
+        assert _sample('recommendation_cache_lookups_total', result='miss') == misses_before + 1
+        assert _sample('recommendation_data_version_info', data_version=executor.data_version) == 1
+    finally:
+        executor.shutdown()
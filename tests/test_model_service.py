@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from conftest import ROOT_DIR, load_model_api
+
+MODEL_PATH = os.path.join(ROOT_DIR, 'data', 'model', 'model.pkl')
+
+
+@pytest.fixture(scope='module')
+def model_service():
+    service = load_model_api().ModelService()
+    service.load_model(MODEL_PATH)
+    service.load_data(settings.PREPROCESSED_PATH)
+    return service
+
+
+def test_model_has_unpacked_factors(model_service):
+    assert model_service.factors is not None
+
+
+def test_predict_items_matches_predict(model_service):
+    """
+    predict_items가 model.predict(user, item).est와 동일 (없는 사용자/장소의 기본값, 평점 범위 제한 포함)
+    행렬곱과 np.dot의 합산 순서 차이로 마지막 비트만 다를 수 있음
+    """
+    df = model_service.df_original
+    items = list(df['itemID'].unique()) + ['unknown-item']
+    users = list(df['userID'].unique()[::40]) + ['unknown-user']
+
+    for user_id in users:
+        expected = np.array([model_service.model.predict(user_id, item).est for item in items])
+        np.testing.assert_allclose(model_service.predict_items(user_id, items), expected, rtol=0, atol=1e-12)
+
+
+def test_data_version_follows_file_contents(tmp_path):
+    """데이터 버전은 파일 내용 기준 (복사해 수정 시각이 달라져도 같고, 내용이 바뀌면 달라짐)"""
+    model_api = load_model_api()
+
+    def data_version(data_path):
+        service = model_api.ModelService()
+        service.source_fingerprints['data'] = service._fingerprint(data_path)
+        return service.data_version
+
+    copied_path = tmp_path / 'dfE.csv'
+    copied_path.write_bytes(open(settings.PREPROCESSED_PATH, 'rb').read())
+    os.utime(copied_path, (0, 0))
+    assert data_version(str(copied_path)) == data_version(settings.PREPROCESSED_PATH)
+
+    with open(copied_path, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    assert data_version(str(copied_path)) != data_version(settings.PREPROCESSED_PATH)
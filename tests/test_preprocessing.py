@@ -0,0 +1,16 @@
+import pandas as pd
+
+from app.core.config import settings
+from app.services.preprocessing import VisitPreprocessor
+
+
+def test_pipeline_reproduces_committed_dfE(tmp_path):
+    """원본 Training CSV에서 만든 결과가 저장소의 dfE.csv와 동일"""
+    output_path = str(tmp_path / 'dfE.csv')
+    stats = VisitPreprocessor().run(
+        settings.VISIT_DATA_PATH, settings.TRAVEL_DATA_PATH, settings.USER_DATA_PATH, output_path
+    )
+
+    expected = pd.read_csv(settings.PREPROCESSED_PATH)
+    assert stats['rows'] == len(expected)
+    pd.testing.assert_frame_equal(pd.read_csv(output_path), expected)
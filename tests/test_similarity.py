@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from app.services.similarity_calculator import UserSimilarityCalculator
+
+
+def _edge_case_users() -> pd.DataFrame:
+    """결측값, 해석할 수 없는 연령대, 매핑에 없는 동반 유형을 포함한 사용자 마스터"""
+    nan = np.nan
+    rows = [
+        ('u0', '20대', '나홀로 여행', '서울', [1, 2, nan], [1, 2, 3, 4, 5, 6, 7, 8]),
+        ('u1', '30대', '3대 동반 여행(친척 포함)', '경기', [3, nan, nan], [2, nan, nan, nan, nan, nan, nan, nan]),
+        ('u2', '알 수 없음', '기타', nan, [nan, nan, nan], [nan] * 8),
+        ('u3', '60대', '2인 여행(가족 외)', '인천', [10, 10, 2], [7, 7, 1, nan, nan, nan, nan, 3]),
+        ('u4', nan, nan, '서울', [5, 4, 3], [4, 4, 4, 4, 4, 4, 4, 4]),
+    ]
+    records = []
+    for user_id, age, accompany, destination, motives, styles in rows:
+        record = {
+            'TRAVELER_ID': user_id,
+            'AGE_GRP': age,
+            'TRAVEL_STATUS_ACCOMPANY': accompany,
+            'TRAVEL_STATUS_DESTINATION': destination,
+        }
+        record.update(zip(UserSimilarityCalculator.MOTIVE_COLUMNS, motives))
+        record.update(zip(UserSimilarityCalculator.STYLE_COLUMNS, styles))
+        records.append(record)
+    return pd.DataFrame(records)
+
+
+def test_batch_similarity_matches_scalar_on_edge_cases(sample_requests):
+    """배열 연산 점수가 사용자별 calculate_user_similarity와 비트 단위로 동일"""
+    users = _edge_case_users()
+    encoded = UserSimilarityCalculator.encode_users(users)
+
+    for request in sample_requests:
+        request_dict = request.dict()
+        scores = UserSimilarityCalculator.calculate_batch_similarity(request_dict, encoded)
+        for i, (_, user) in enumerate(users.iterrows()):
+            final, detailed = UserSimilarityCalculator.calculate_user_similarity(request_dict, user.to_dict())
+            assert scores['final'][i] == final
+            assert {key: round(float(values[i]), 3) for key, values in scores.items()} == detailed
+
+
+def test_find_similar_users_matches_scalar(service, sample_requests):
+    """전체 사용자 순위와 점수가 스칼라 기준 구현과 동일 (동점은 사용자 마스터 순서)"""
+    n_users = len(service.user_data)
+    for request in sample_requests:
+        vectorized = service.find_similar_users(request, n_similar=n_users)
+        scalar = service._find_similar_users_scalar(request, n_similar=n_users)
+
+        assert [user_id for user_id, _, _ in vectorized] == [user_id for user_id, _, _ in scalar]
+        assert [score for _, score, _ in vectorized] == [score for _, score, _ in scalar]
+        assert [detailed for _, _, detailed in vectorized] == [detailed for _, _, detailed in scalar]
+
+
+def test_out_of_range_codes_are_logged_and_masked(sample_requests, caplog):
+    """마스크 범위 밖 코드가 있어도 로드가 중단되지 않고, 범위 안 요청 코드에 대해 스칼라 계산과 동일"""
+    users = _edge_case_users()
+    users.loc[0, 'TRAVEL_MOTIVE_3'] = 100
+    users.loc[1, 'TRAVEL_STYL_2'] = -3
+    users.loc[4, 'TRAVEL_STYL_8'] = UserSimilarityCalculator.MAX_MASK_CODE + 1
+
+    with caplog.at_level('WARNING'):
+        encoded = UserSimilarityCalculator.encode_users(users)
+    assert 'Ignoring codes outside' in caplog.text
+    assert encoded['motive_counts'][0] == 3
+    assert encoded['style_counts'][1] == 2
+
+    for request in sample_requests:
+        request_dict = request.dict()
+        scores = UserSimilarityCalculator.calculate_batch_similarity(request_dict, encoded)
+        for i, (_, user) in enumerate(users.iterrows()):
+            final, _ = UserSimilarityCalculator.calculate_user_similarity(request_dict, user.to_dict())
+            assert scores['final'][i] == final
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from app.services.recommender import RecommendationService
+
+
+@pytest.mark.parametrize('k', [0, 1, 5, 37, 199, 200, 500])
+def test_select_top_k_matches_stable_sort(k):
+    """부분 선택 결과가 안정 정렬의 앞 k개와 동일 (동점은 앞선 인덱스 우선)"""
+    rng = np.random.default_rng(k)
+    # 동점이 많도록 값 종류를 제한
+    scores = rng.integers(0, 8, size=200) / 4.0
+
+    expected = np.argsort(-scores, kind='stable')[:k]
+    np.testing.assert_array_equal(RecommendationService._select_top_k(scores, k), expected)
+
+
+def test_select_top_k_empty():
+    assert len(RecommendationService._select_top_k(np.empty(0), 10)) == 0
+
+
+@pytest.mark.parametrize('n_similar', [1, 10, 100])
+def test_find_similar_users_keeps_row_order_for_ties(service, sample_requests, n_similar):
+    """상위 n_similar명이 스칼라 기준 구현(전체 안정 정렬)의 앞부분과 동일"""
+    for request in sample_requests:
+        top = service.find_similar_users(request, n_similar=n_similar)
+        scalar = service._find_similar_users_scalar(request, n_similar=n_similar)
+        assert [(user_id, score) for user_id, score, _ in top] == [(user_id, score) for user_id, score, _ in scalar]
@@ -0,0 +1,71 @@
+from collections import defaultdict
+
+import pytest
+
+from app.models.schemas import SIMILARITY_SCORE_FIELDS
+from app.services.visit_index import VisitIndex
+
+
+def _baseline_place_recommendations(df, similar_users, destination, n_recommendations):
+    """CSR 인덱스 도입 전 get_place_recommendations (방문 데이터를 사용자별로 필터링해 집계)"""
+    place_scores = defaultdict(float)
+    place_counts = defaultdict(int)
+    place_max_similarity = defaultdict(float)
+    place_similarity_scores = defaultdict(lambda: None)
+
+    for user_id, similarity, detailed_scores in similar_users:
+        user_visits = df[df['userID'] == user_id]
+        for _, visit in user_visits.iterrows():
+            place_id = visit['itemID']
+            if visit['SIDO'] != destination:
+                continue
+            place_scores[place_id] += visit['rating'] * similarity
+            place_counts[place_id] += 1
+            if similarity > place_max_similarity[place_id]:
+                place_max_similarity[place_id] = similarity
+                place_similarity_scores[place_id] = detailed_scores
+
+    recommendations = []
+    for place_id in place_scores:
+        avg_score = place_scores[place_id] / place_counts[place_id]
+        recommendations.append({
+            'item_id': place_id,
+            'sido': destination,
+            'predicted_rating': float(avg_score),
+            'confidence_score': float(avg_score * place_max_similarity[place_id]),
+            'similarity_scores': place_similarity_scores[place_id]
+        })
+    recommendations.sort(key=lambda x: x['confidence_score'], reverse=True)
+    return recommendations[:n_recommendations]
+
+
+def _normalize(recommendations):
+    """비교용 변환 (상세 점수 튜플은 필드 이름의 dict로)"""
+    return [
+        {**recommendation, 'similarity_scores': dict(zip(SIMILARITY_SCORE_FIELDS, recommendation['similarity_scores']))}
+        for recommendation in recommendations
+    ]
+
+
+def test_visit_index_ranges_match_dataframe(service):
+    """사용자별 구간이 원본 순서 그대로의 방문 기록과 일치"""
+    index = VisitIndex.from_dataframe(service.df)
+    for user_id, visits in service.df.groupby('userID', sort=False):
+        start, end = index.get_user_range(user_id)
+        assert list(index.item_names[index.item_codes[start:end]]) == visits['itemID'].tolist()
+        assert index.ratings[start:end].tolist() == visits['rating'].tolist()
+    assert index.get_user_range('unknown-user') == (0, 0)
+
+
+@pytest.mark.parametrize('n_recommendations', [5, 1000])
+def test_place_recommendations_match_baseline(service, sample_requests, n_recommendations):
+    """CSR 집계 결과(순서, 평점, 신뢰도, 상세 점수)가 기존 DataFrame 집계와 동일"""
+    checked = 0
+    for request in sample_requests:
+        similar_users = [user for user in service.find_similar_users(request, n_similar=100) if user[1] > 0]
+        for destination in {request.destination, '서울', '제주'}:
+            expected = _baseline_place_recommendations(service.df, similar_users, destination, n_recommendations)
+            actual = service.get_place_recommendations(similar_users, destination, n_recommendations)
+            assert _normalize(actual) == expected
+            checked += len(expected)
+    assert checked > 0